@@ -33,9 +33,12 @@ from .const import (
     CONF_HEATING_CIRCUIT,
     CONF_HEATPUMP,
     CONF_PHOTOVOLTAIC,
+    CONF_PIPELINE_WINDOW,
+    CONF_POLL_TIERS,
     CONF_SOLAR,
     CONF_SOLARFOCUS_SYSTEM,
     CONTROLLER_NAME,
+    DEFAULT_PIPELINE_WINDOW,
     DOMAIN,
     MANUFACTURER,
     build_unique_id,
@@ -47,6 +50,7 @@ from .coordinator import (
     SolarfocusConfigEntry,
     SolarfocusDataUpdateCoordinator,
     async_delete_component_issues,
+    async_remove_snapshot,
 )
 
 PLATFORMS: list[Platform] = [
@@ -82,19 +86,37 @@ async def async_setup_entry(hass: HomeAssistant, entry: SolarfocusConfigEntry) -
         api_version=ApiVersions(entry.data[CONF_API_VERSION]),
     )
     coordinator = SolarfocusDataUpdateCoordinator(hass, entry, api)
+    # Registered before the first refresh opens the connection, so that a setup
+    # that fails after it closes it again rather than leaving it to the retry.
+    entry.async_on_unload(coordinator.async_close)
+    # Run before the connection is closed - the unload hooks run last first -
+    # so the entry that is set up again starts from the values this one read.
+    entry.async_on_unload(coordinator.async_save_snapshot)
+
+    restored = await coordinator.async_restore_snapshot()
+    if restored:
+        # What the registers read before the restart is shown right away,
+        # marked as restored, and the first poll runs behind it: a controller
+        # that is slow to answer at boot no longer holds the dashboard up, nor
+        # sends the entry into retrying its setup. One that does not answer at
+        # all makes the entities unavailable, the way a failed poll always has.
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first poll"
+        )
+    else:
+        await coordinator.async_refresh()
 
-    await coordinator.async_refresh()
-
-    if not coordinator.last_update_success:
+    if not restored and not coordinator.last_update_success:
         # Reading every configured component once tells us whether the entry can
         # be set up at all; Home Assistant retries the setup afterwards.
         #
         # The two ways that fails are worth telling apart, because they send the
         # user to different places: nothing at the address to talk to at all, or
         # a controller that answered the connection and then none of the
-        # registers. Whether the library is still connected is what says which.
+        # registers. Whether the coordinator is still connected is what says
+        # which.
         address = f"{entry.data[CONF_HOST]}:{entry.data[CONF_PORT]}"
-        if not api.is_connected:
+        if not coordinator.is_connected:
             raise ConfigEntryNotReady(
                 translation_domain=DOMAIN,
                 translation_key="cannot_connect",
@@ -122,6 +144,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: SolarfocusConfigEntry) -
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Every entity that is shown has said what it reads by now, so the polls
+    # from here on can leave out what none of them does.
+    coordinator.async_read_only_what_is_shown()
+
     _async_inherit_the_hub_area(hass, entry, hub, known)
     _async_remove_gone_components(hass, entry)
 
@@ -252,7 +278,6 @@ async def _async_align_solar_unique_ids(
     old, new = ("so_", "so1_") if count > 1 else ("so1_", "so_")
     prefix = f"{entry.entry_id}_"
     registry = er.async_get(hass)
-    taken = {registered.unique_id for registered in registry.entities.values()}
 
     @callback
     def _renamed(registered: er.RegistryEntry) -> dict[str, str] | None:
@@ -260,7 +285,11 @@ async def _async_align_solar_unique_ids(
             return None
 
         renamed = prefix + new + registered.unique_id[len(prefix + old) :]
-        if renamed in taken:
+        # Asked of the index the registry keeps of the ids it refuses to hand
+        # out twice, rather than of a set of every unique id of every entity of
+        # the instance - which a setup used to build first, thousands of them
+        # on a large installation, to rename a dozen of its own.
+        if registry.async_get_entity_id(registered.domain, DOMAIN, renamed):
             # Both sets exist, which takes a migration that stopped halfway.
             # The one under the key in use is the one being written to.
             return None
@@ -600,6 +629,15 @@ async def async_unload_entry(hass: HomeAssistant, entry: SolarfocusConfigEntry)
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: SolarfocusConfigEntry) -> None:
+    """Remove what an entry keeps outside of it, once the entry itself is gone.
+
+    The snapshot of its registers, which an unload saves and a removal would
+    otherwise leave in the storage directory for good.
+    """
+    await async_remove_snapshot(hass, entry)
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: SolarfocusConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
@@ -790,6 +828,29 @@ async def async_migrate_entry(
             config_entry, options=new_options, version=11
         )
 
+    if config_entry.version == 11:
+        # Components can be polled less often than every interval since version
+        # 12. None is moved off the fast tier by the upgrade, which is the one
+        # that reads a component on every poll, as every entry before it did.
+        new_options = {**config_entry.options}
+        new_options.setdefault(CONF_POLL_TIERS, {})
+
+        hass.config_entries.async_update_entry(
+            config_entry, options=new_options, version=12
+        )
+
+    if config_entry.version == 12:
+        # Reads can be pipelined since version 13. Not by an upgrade, though:
+        # a controller that does not take it answers nothing, or drops the
+        # connection, and the integration only finds out by trying - on an
+        # entry that has worked for years, the user would not have asked.
+        new_options = {**config_entry.options}
+        new_options.setdefault(CONF_PIPELINE_WINDOW, DEFAULT_PIPELINE_WINDOW)
+
+        hass.config_entries.async_update_entry(
+            config_entry, options=new_options, version=13
+        )
+
     _LOGGER.info("Migration to version %s successful", config_entry.version)
     _LOGGER.debug(
         "Config Entries data: %s, options: %s", config_entry.data, config_entry.options
@@ -40,6 +40,7 @@ from .const import (
     PHOTOVOLTAIC_COMPONENT,
     PHOTOVOLTAIC_COMPONENT_PREFIX,
     component_count,
+    entry_capabilities,
 )
 from .coordinator import SolarfocusConfigEntry, SolarfocusDataUpdateCoordinator
 from .entity import (
@@ -47,7 +48,6 @@ from .entity import (
     SolarfocusEntityDescription,
     create_description,
     every_system_but,
-    filterVersionAndSystem,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -64,10 +64,11 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Solarfocus config entry."""
     coordinator = config_entry.runtime_data
+    capabilities = entry_capabilities(config_entry)
     entities = []
 
     for i in range(config_entry.options[CONF_HEATING_CIRCUIT]):
-        for description in HEATING_CIRCUIT_BINARY_SENSOR_TYPES:
+        for description in capabilities.supported(HEATING_CIRCUIT_BINARY_SENSOR_TYPES):
             _description = create_description(
                 HEATING_CIRCUIT_COMPONENT,
                 HEATING_CIRCUIT_COMPONENT_PREFIX,
@@ -79,7 +80,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     for i in range(config_entry.options[CONF_BUFFER]):
-        for description in BUFFER_BINARY_SENSOR_TYPES:
+        for description in capabilities.supported(BUFFER_BINARY_SENSOR_TYPES):
             _description = create_description(
                 BUFFER_COMPONENT,
                 BUFFER_COMPONENT_PREFIX,
@@ -91,7 +92,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     if config_entry.options[CONF_HEATPUMP]:
-        for description in HEATPUMP_BINARY_SENSOR_TYPES:
+        for description in capabilities.supported(HEATPUMP_BINARY_SENSOR_TYPES):
             _description = create_description(
                 HEAT_PUMP_COMPONENT,
                 HEAT_PUMP_COMPONENT_PREFIX,
@@ -103,7 +104,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     if config_entry.options[CONF_BIOMASS_BOILER]:
-        for description in BIOMASS_BOILER_BINARY_SENSOR_TYPES:
+        for description in capabilities.supported(BIOMASS_BOILER_BINARY_SENSOR_TYPES):
             _description = create_description(
                 BIOMASS_BOILER_COMPONENT,
                 BIOMASS_BOILER_COMPONENT_PREFIX,
@@ -115,7 +116,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     if config_entry.options[CONF_PHOTOVOLTAIC]:
-        for description in PHOTOVOLTAIC_BINARY_SENSOR_TYPES:
+        for description in capabilities.supported(PHOTOVOLTAIC_BINARY_SENSOR_TYPES):
             _description = create_description(
                 PHOTOVOLTAIC_COMPONENT,
                 PHOTOVOLTAIC_COMPONENT_PREFIX,
@@ -127,7 +128,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     for i in range(config_entry.options[CONF_FRESH_WATER_MODULE]):
-        for description in FRESH_WATER_MODULE_BINARY_SENSOR_TYPES:
+        for description in capabilities.supported(FRESH_WATER_MODULE_BINARY_SENSOR_TYPES):
             _description = create_description(
                 FRESH_WATER_MODULE_COMPONENT,
                 FRESH_WATER_MODULE_COMPONENT_PREFIX,
@@ -139,7 +140,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     for i in range(component_count(config_entry, CONF_CIRCULATION)):
-        for description in CIRCULATION_BINARY_SENSOR_TYPES:
+        for description in capabilities.supported(CIRCULATION_BINARY_SENSOR_TYPES):
             _description = create_description(
                 CIRCULATION_COMPONENT,
                 CIRCULATION_COMPONENT_PREFIX,
@@ -151,7 +152,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     for i in range(component_count(config_entry, CONF_DIFFERENTIAL_MODULE)):
-        for description in DIFFERENTIAL_MODULE_BINARY_SENSOR_TYPES:
+        for description in capabilities.supported(DIFFERENTIAL_MODULE_BINARY_SENSOR_TYPES):
             _description = create_description(
                 DIFFERENTIAL_MODULE_COMPONENT,
                 DIFFERENTIAL_MODULE_COMPONENT_PREFIX,
@@ -162,7 +163,7 @@ async def async_setup_entry(
             entity = SolarfocusBinarySensorEntity(coordinator, _description)
             entities.append(entity)
 
-    async_add_entities(filterVersionAndSystem(config_entry, entities))
+    async_add_entities(entities)
 
 
 @dataclass(frozen=True, kw_only=True)
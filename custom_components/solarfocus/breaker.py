@@ -0,0 +1,90 @@
+"""Leaving a component that keeps failing alone, apart from the odd probe.
+
+A component whose registers the controller does not answer fails on every
+poll, and that is not free: a request nobody answers costs the whole timeout
+before the poll moves on, and every component read after it waits for that -
+one dead range is seconds added to every refresh of everything else.
+
+So each component has a breaker. It trips once the component has failed
+`FAILURE_THRESHOLD` polls in a row that were not outages of the whole system,
+and from then on the component is read only as a probe, on a poll that comes
+round later every time the probe fails: after `FIRST_BACKOFF` polls, then
+twice that, and so on up to `MAX_BACKOFF`. The first probe that reads it closes
+the breaker, and it is read as its tier says again.
+
+Counted in polls rather than seconds, like the tiers: a probe is one more
+component on a poll that is running anyway, never a request of its own.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+# How many polls in a row a component has to fail for its breaker to trip.
+FAILURE_THRESHOLD = 3
+
+# How many polls after the one that tripped the breaker the first probe goes
+# out, and the most that can pass between two probes: at the default interval
+# of 10 seconds, a component that comes back is read again within 11 minutes.
+FIRST_BACKOFF = 2
+MAX_BACKOFF = 64
+
+
+@dataclass(slots=True)
+class _Breaker:
+    """How one component has been failing."""
+
+    failures: int = 0
+    # Polls between two probes, 0 while the breaker is closed.
+    backoff: int = 0
+    # The poll the next probe goes out on.
+    probe_at: int = 0
+
+
+class ComponentBreakers:
+    """The breakers of every component of one entry, by option."""
+
+    def __init__(self) -> None:
+        """Start out with every breaker closed."""
+        self._breakers: dict[str, _Breaker] = {}
+
+    def is_open(self, option: str) -> bool:
+        """Return True while a component is only read as a probe."""
+        breaker = self._breakers.get(option)
+        return breaker is not None and breaker.backoff > 0
+
+    def skips(self, option: str, poll: int) -> bool:
+        """Return True if a component is not to be read on this poll at all."""
+        breaker = self._breakers.get(option)
+        return breaker is not None and breaker.backoff > 0 and poll < breaker.probe_at
+
+    def record(self, option: str, poll: int, failed: bool) -> None:
+        """Count the outcome of reading a component on a poll."""
+        if not failed:
+            self._breakers.pop(option, None)
+            return
+
+        breaker = self._breakers.setdefault(option, _Breaker())
+        breaker.failures += 1
+        if breaker.backoff:
+            breaker.backoff = min(breaker.backoff * 2, MAX_BACKOFF)
+        elif breaker.failures >= FAILURE_THRESHOLD:
+            breaker.backoff = FIRST_BACKOFF
+        else:
+            return
+        breaker.probe_at = poll + breaker.backoff
+
+    def backoff(self, option: str) -> int:
+        """Return how many polls pass between two probes of a component."""
+        breaker = self._breakers.get(option)
+        return 0 if breaker is None else breaker.backoff
+
+    def as_dict(self, poll: int) -> dict[str, Any]:
+        """Return every component that is failing, and when it is read next."""
+        return {
+            option: {
+                "failures": breaker.failures,
+                "open": breaker.backoff > 0,
+                "next_probe_in_polls": max(breaker.probe_at - poll, 0),
+            }
+            for option, breaker in sorted(self._breakers.items())
+        }
@@ -8,14 +8,14 @@ from homeassistant.components.button import ButtonEntity, ButtonEntityDescriptio
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import BOILER_COMPONENT, BOILER_COMPONENT_PREFIX, CONF_BOILER
-from .coordinator import SolarfocusConfigEntry, SolarfocusDataUpdateCoordinator
-from .entity import (
-    SolarfocusEntity,
-    SolarfocusEntityDescription,
-    create_description,
-    filterVersionAndSystem,
+from .const import (
+    BOILER_COMPONENT,
+    BOILER_COMPONENT_PREFIX,
+    CONF_BOILER,
+    entry_capabilities,
 )
+from .coordinator import SolarfocusConfigEntry, SolarfocusDataUpdateCoordinator
+from .entity import SolarfocusEntity, SolarfocusEntityDescription, create_description
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,10 +38,11 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Solarfocus config entry."""
     coordinator = config_entry.runtime_data
+    capabilities = entry_capabilities(config_entry)
     entities = []
 
     for i in range(config_entry.options[CONF_BOILER]):
-        for description in BOILER_BUTTON_TYPES:
+        for description in capabilities.supported(BOILER_BUTTON_TYPES):
             _description = create_description(
                 BOILER_COMPONENT,
                 BOILER_COMPONENT_PREFIX,
@@ -52,7 +53,7 @@ async def async_setup_entry(
             entity = SolarfocusButtonEntity(coordinator, _description)
             entities.append(entity)
 
-    async_add_entities(filterVersionAndSystem(config_entry, entities))
+    async_add_entities(entities)
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -81,7 +82,8 @@ class SolarfocusButtonEntity(SolarfocusEntity, ButtonEntity):
     async def async_press(self) -> None:
         """Update the current value."""
         button = self.entity_description.item
-        return self._set_native_value(button, PRESSED)
+        # A press starts a charge or a circulation pump, which the state shows
+        await self._async_set_native_value(button, PRESSED, side_effects=True)
 
 
 BOILER_BUTTON_TYPES = [
@@ -195,11 +195,24 @@ class SolarfocusClimateEntity(SolarfocusEntity, RestoreEntity, ClimateEntity):
         ):
             self._active_mode = HVACMode(active_mode)
 
+    @property
+    @override
+    def register_items(self) -> tuple[str, ...]:
+        """Return the values of the heating circuit the thermostat is made of."""
+        return (
+            "supply_temperature",
+            "target_supply_temperature",
+            "cooling",
+            "state",
+            "mode",
+        )
+
     @property
     def cooling_supported(self) -> bool:
         """Return whether the circuit can be switched to "Heizen + Kühlen"."""
         return cast(
-            bool, self.coordinator.api.api_version.greater_or_equal(MIN_COOLING_API_VERSION)
+            bool,
+            self.coordinator.api.api_version.greater_or_equal(MIN_COOLING_API_VERSION),
         )
 
     @property
@@ -337,7 +350,7 @@ class SolarfocusClimateEntity(SolarfocusEntity, RestoreEntity, ClimateEntity):
         _LOGGER.info("Set HVAC Mode: %s", hvac_mode)
 
         if hvac_mode == HVACMode.OFF:
-            self._write_heating_circuit(
+            await self._async_write_heating_circuit(
                 target_supply_temperature=0,
                 cooling=COOLING_OFF,
                 operating_mode=OPERATING_MODE_OFF,
@@ -348,7 +361,7 @@ class SolarfocusClimateEntity(SolarfocusEntity, RestoreEntity, ClimateEntity):
             self._log_dew_point_warning()
 
         self._active_mode = hvac_mode
-        self._write_heating_circuit(
+        await self._async_write_heating_circuit(
             target_supply_temperature=self._remembered_target_temperature(hvac_mode),
             cooling=COOLING_ON if hvac_mode == HVACMode.COOL else COOLING_OFF,
             operating_mode=self._operating_mode(),
@@ -365,7 +378,7 @@ class SolarfocusClimateEntity(SolarfocusEntity, RestoreEntity, ClimateEntity):
             return OPERATING_MODE_CONTINUOUS
         return int(mode)
 
-    def _write_heating_circuit(
+    async def _async_write_heating_circuit(
         self, target_supply_temperature: float, cooling: int, operating_mode: int
     ) -> None:
         """Write the registers section 6.2 requires to be written together.
@@ -373,13 +386,21 @@ class SolarfocusClimateEntity(SolarfocusEntity, RestoreEntity, ClimateEntity):
         Writing only some of them can leave the controller in an undefined state.
         Register 32608 does not exist below api version 22.090; a circuit that old
         cannot cool anyway, so heating and off are written without it.
-        """
-        self._set_native_value("target_supply_temperature", target_supply_temperature)
-        self._set_native_value("cooling", cooling)
-        self._set_native_value("mode", operating_mode)
 
+        All of them in one go: 32602 and 32603 share a request, 32600 and 32608
+        have one each - the registers in between are not the integration's to
+        write - and the circuit is read back once after the last of them.
+        """
+        values: dict[str, Any] = {
+            "target_supply_temperature": target_supply_temperature,
+            "cooling": cooling,
+            "mode": operating_mode,
+        }
         if self.cooling_supported:
-            self._set_native_value("heating_mode", HEATING_MODE_HEATING_AND_COOLING)
+            values["heating_mode"] = HEATING_MODE_HEATING_AND_COOLING
+
+        # A mode change switches the circuit between heating, cooling and off
+        await self._async_set_native_values(values, side_effects=True)
 
     def _log_dew_point_warning(self) -> None:
         """Warn that the controller stops watching the dew point, once."""
@@ -400,7 +421,7 @@ class SolarfocusClimateEntity(SolarfocusEntity, RestoreEntity, ClimateEntity):
         """Set new target preset mode."""
         mode = PRESET_TO_SOLARFOCUS_MODE.get(preset_mode)
         _LOGGER.info("Set Preset Mode: %s (mapped mode: %s)", preset_mode, mode)
-        self._set_native_value("mode", mode)
+        await self._async_set_native_value("mode", mode, side_effects=True)
 
     @override
     async def async_set_temperature(self, **kwargs: Any) -> None:
@@ -420,7 +441,7 @@ class SolarfocusClimateEntity(SolarfocusEntity, RestoreEntity, ClimateEntity):
 
         self._active_mode = hvac_mode
         self._target_temperatures[hvac_mode] = float(temperature)
-        self._set_native_value("target_supply_temperature", temperature)
+        await self._async_set_native_value("target_supply_temperature", temperature)
 
     @override
     async def async_turn_on(self) -> None:
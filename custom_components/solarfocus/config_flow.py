@@ -17,6 +17,7 @@ from homeassistant.const import (
     CONF_SCAN_INTERVAL,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.data_entry_flow import section
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import selector
 import homeassistant.helpers.config_validation as cv
@@ -31,13 +32,19 @@ from .const import (
     CONF_HEATING_CIRCUIT,
     CONF_HEATPUMP,
     CONF_PHOTOVOLTAIC,
+    CONF_PIPELINE_WINDOW,
+    CONF_POLL_TIERS,
     CONF_SOLAR,
     CONF_SOLARFOCUS_SYSTEM,
     DEFAULT_HOST,
     DEFAULT_NAME,
+    DEFAULT_PIPELINE_WINDOW,
+    DEFAULT_POLL_TIER,
     DEFAULT_PORT,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    MAX_PIPELINE_WINDOW,
+    POLL_TIER_PERIODS,
     build_unique_id,
 )
 
@@ -89,6 +96,27 @@ _COMPONENT_COUNT_ZERO_FOUR_SELECTOR = vol.All(
 )
 
 
+# How many read requests may be on the wire at once, one being none pipelined.
+_PIPELINE_WINDOW_SELECTOR = vol.All(
+    selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=1, max=MAX_PIPELINE_WINDOW, mode=selector.NumberSelectorMode.BOX
+        ),
+    ),
+    vol.Coerce(int),
+)
+
+# How often one component is read, as a multiple of the polling interval - see
+# `POLL_TIER_PERIODS`. The labels are translated, the stored value is the key.
+_POLL_TIER_SELECTOR = selector.SelectSelector(
+    selector.SelectSelectorConfig(
+        options=list(POLL_TIER_PERIODS),
+        translation_key="poll_tier",
+        mode=selector.SelectSelectorMode.DROPDOWN,
+    )
+)
+
+
 def _heat_source(was: str, now: str) -> dict[str, bool]:
     """Return the component flags a change of system forces, if any.
 
@@ -254,7 +282,7 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Solarfocus."""
 
-    VERSION = 11
+    VERSION = 13
     CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_POLL
 
     data: dict[str, Any]
@@ -346,6 +374,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 CONF_FRESH_WATER_MODULE: user_input[CONF_FRESH_WATER_MODULE],
                 CONF_CIRCULATION: user_input[CONF_CIRCULATION],
                 CONF_DIFFERENTIAL_MODULE: user_input[CONF_DIFFERENTIAL_MODULE],
+                CONF_POLL_TIERS: {},
+                CONF_PIPELINE_WINDOW: DEFAULT_PIPELINE_WINDOW,
             },
         )
 
@@ -470,6 +500,12 @@ class SolarfocusOptionsFlowHandler(config_entries.OptionsFlow):
                 CONF_BIOMASS_BOILER: (
                     False if vampair else user_input[CONF_BIOMASS_BOILER]
                 ),
+                # Only what was moved off the default, see `poll_tier`.
+                CONF_POLL_TIERS: {
+                    option: tier
+                    for option, tier in user_input[CONF_POLL_TIERS].items()
+                    if tier != DEFAULT_POLL_TIER
+                },
             },
         )
 
@@ -484,6 +520,9 @@ class SolarfocusOptionsFlowHandler(config_entries.OptionsFlow):
             vol.Optional(
                 CONF_SCAN_INTERVAL, default=current[CONF_SCAN_INTERVAL]
             ): cv.positive_int,
+            vol.Optional(
+                CONF_PIPELINE_WINDOW, default=current[CONF_PIPELINE_WINDOW]
+            ): _PIPELINE_WINDOW_SELECTOR,
             vol.Optional(
                 CONF_HEATING_CIRCUIT, default=current[CONF_HEATING_CIRCUIT]
             ): _COMPONENT_COUNT_ZERO_EIGHT_SELECTOR,
@@ -518,6 +557,23 @@ class SolarfocusOptionsFlowHandler(config_entries.OptionsFlow):
             vol.Optional(CONF_SOLAR, default=current[CONF_SOLAR])
         ] = _COMPONENT_COUNT_ZERO_FOUR_SELECTOR
 
+        # One tier per component the form above asks about, folded away: most
+        # entries never touch them, and the form is long enough without.
+        tiers: Mapping[str, str] = current.get(CONF_POLL_TIERS, {})
+        schema[vol.Optional(CONF_POLL_TIERS, default=dict(tiers))] = section(
+            vol.Schema(
+                {
+                    vol.Optional(
+                        marker.schema,
+                        default=tiers.get(marker.schema, DEFAULT_POLL_TIER),
+                    ): _POLL_TIER_SELECTOR
+                    for marker in schema
+                    if marker.schema not in (CONF_SCAN_INTERVAL, CONF_PIPELINE_WINDOW)
+                }
+            ),
+            {"collapsed": True},
+        )
+
         return self.async_show_form(
             step_id="init", data_schema=vol.Schema(schema), errors=errors
         )
@@ -0,0 +1,92 @@
+"""One connection to a controller address, however many entries read it.
+
+An eco manager-touch takes a handful of Modbus TCP connections at most, and a
+TCP-to-Modbus gateway in front of one often takes a single one. Every entry
+used to open a connection of its own, so two entries for one address - the
+pair #185 left behind - were two sessions the controller had to keep apart,
+each polling on its own timer and each able to take the other's slot when it
+reconnected.
+
+So the connection belongs to the address instead: the first entry that reads
+an address opens it, every other entry for the same host and port reads over
+the same one, and the last of them to go closes it. Keyed like the unique id
+of an entry, see `build_unique_id`, so the two agree on what one controller is.
+
+Sharing the connection means sharing the turn on it as well: the transactions
+of every entry on an address go through one `TransactionScheduler`, so the
+polls of two entries run one after the other rather than interleaved on the
+socket, and a write of either goes before both.
+
+Only for the integration's own connection. An entry the library has to read
+keeps its own, through a client the library does not let anybody else use.
+"""
+
+from dataclasses import dataclass, field
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, build_unique_id
+from .modbus import ModbusClient
+from .scheduler import TransactionScheduler
+
+DATA_CONNECTIONS: HassKey["ConnectionPool"] = HassKey(f"{DOMAIN}_connections")
+
+
+@dataclass(slots=True)
+class SharedConnection:
+    """The connection to one controller address, and whose turn it is on it."""
+
+    address: str
+    client: ModbusClient
+    scheduler: TransactionScheduler = field(default_factory=TransactionScheduler)
+    # The entries reading over it, by entry id.
+    users: set[str] = field(default_factory=set)
+
+
+class ConnectionPool:
+    """The connections of every entry of the integration, by address."""
+
+    def __init__(self) -> None:
+        """Start out with no connection at all."""
+        self._connections: dict[str, SharedConnection] = {}
+
+    def acquire(self, host: str, port: int, user: str) -> SharedConnection:
+        """Return the connection to host:port for one entry, set up if need be.
+
+        Not opened: whoever polls first does that, as it does after the
+        connection dropped.
+        """
+        address = build_unique_id(host, port)
+        if (connection := self._connections.get(address)) is None:
+            connection = self._connections[address] = SharedConnection(
+                address, ModbusClient(host, port)
+            )
+        connection.users.add(user)
+        return connection
+
+    async def async_release(self, connection: SharedConnection, user: str) -> None:
+        """Let go of a connection for one entry, and close it after the last.
+
+        The connection is released by what it was acquired as rather than by
+        the address of the entry, which a reconfigure changes before the entry
+        is unloaded.
+        """
+        connection.users.discard(user)
+        # Released once more after the last entry let go of it, it may well
+        # have been replaced by a connection of its own since.
+        if connection.users or self._connections.get(connection.address) is not (
+            connection
+        ):
+            return
+
+        del self._connections[connection.address]
+        await connection.client.async_close()
+
+
+@callback
+def async_get_connection_pool(hass: HomeAssistant) -> ConnectionPool:
+    """Return the connection pool of the integration, set up on first use."""
+    if (pool := hass.data.get(DATA_CONNECTIONS)) is None:
+        pool = hass.data[DATA_CONNECTIONS] = ConnectionPool()
+    return pool
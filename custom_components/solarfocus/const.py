@@ -1,8 +1,12 @@
 """Constants for the Solarfocus integration."""
 
-from typing import NamedTuple
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import cache
+from typing import NamedTuple, Protocol
 
 from packaging import version
+from pysolarfocus import ApiVersions, Systems
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_VERSION
@@ -28,6 +32,38 @@ CONF_SOLAR = "solar"
 CONF_FRESH_WATER_MODULE = "fresh_water_module"
 CONF_CIRCULATION = "circulation"
 CONF_DIFFERENTIAL_MODULE = "differential_module"
+CONF_POLL_TIERS = "poll_tiers"
+CONF_PIPELINE_WINDOW = "pipeline_window"
+
+"""State attributes"""
+# Set on every entity while what it shows was restored from before the restart.
+ATTR_RESTORED = "restored"
+
+"""Poll tiers"""
+POLL_TIER_FAST = "fast"
+POLL_TIER_NORMAL = "normal"
+POLL_TIER_SLOW = "slow"
+
+# Every how many polls a component on each tier is read. The polling interval is
+# how often the coordinator asks at all, and the fast tier is read every time -
+# which is what every component was before there were tiers, and what one is
+# that the entry has not put on another. At the default interval of ten
+# seconds the others come to once a minute and once every ten minutes.
+POLL_TIER_PERIODS: dict[str, int] = {
+    POLL_TIER_FAST: 1,
+    POLL_TIER_NORMAL: 6,
+    POLL_TIER_SLOW: 60,
+}
+DEFAULT_POLL_TIER = POLL_TIER_FAST
+
+# How many read requests may be on the wire at once. One is what the protocol
+# promises every controller takes, so it is where every entry starts: more is a
+# user finding out that theirs answers a request it has not finished the last
+# one before, see `ReadPlanner`. The most is what a controller on the local
+# network gains anything from - eight round trips in flight hide a latency of
+# eight times what answering takes.
+DEFAULT_PIPELINE_WINDOW = 1
+MAX_PIPELINE_WINDOW = 8
 
 """Entity naming"""
 HEATING_CIRCUIT_PREFIX = "Heating circuit"
@@ -146,6 +182,82 @@ SINGLE_COMPONENTS = frozenset({CONF_HEATPUMP, CONF_PHOTOVOLTAIC, CONF_BIOMASS_BO
 MULTI_SOLAR_MIN_VERSION = "25.030"
 
 
+@cache
+def api_versions_up_to(api_version: str) -> frozenset[str]:
+    """Return every api version up to this one, this one included.
+
+    Which makes "is this register there on that version" a set lookup rather
+    than two version strings parsed and compared: every version something of
+    the integration arrived in is one the library has, so it is in the set of
+    any version it arrived by.
+    """
+    selected = version.parse(api_version)
+    return frozenset(
+        {
+            api_version,
+            *(
+                known.value
+                for known in ApiVersions
+                if version.parse(known.value) <= selected
+            ),
+        }
+    )
+
+
+class _Gated(Protocol):
+    """An entity description, as far as which entries have it is concerned."""
+
+    @property
+    def min_required_version(self) -> str:
+        """Return the api version the register arrived in."""
+
+    @property
+    def unsupported_systems(self) -> list[Systems] | None:
+        """Return the systems that do not have the register, if any."""
+
+
+@dataclass(frozen=True, slots=True)
+class Capabilities:
+    """What an entry of one system on one api version can have at all.
+
+    Worked out once per pair and shared by every entry and platform that asks,
+    rather than every description's version parsed again for every entity of
+    every entry set up.
+    """
+
+    system: str
+    # Every api version up to the one of the entry, see `api_versions_up_to`.
+    versions: frozenset[str]
+
+    def supports(self, description: _Gated) -> bool:
+        """Return whether an entity description exists on this system and version."""
+        return description.min_required_version in self.versions and (
+            self.system not in (description.unsupported_systems or ())
+        )
+
+    def supported[_GatedT: _Gated](
+        self, descriptions: Iterable[_GatedT]
+    ) -> list[_GatedT]:
+        """Return the entity descriptions that exist on this system and version."""
+        return [
+            description for description in descriptions if self.supports(description)
+        ]
+
+
+@cache
+def capabilities(system: str, api_version: str) -> Capabilities:
+    """Return what a system on an api version can have, the same every time."""
+    return Capabilities(system, api_versions_up_to(api_version))
+
+
+def entry_capabilities(entry: ConfigEntry) -> Capabilities:
+    """Return what the heating system of an entry can have."""
+    return capabilities(
+        entry.data[CONF_SOLARFOCUS_SYSTEM],
+        entry.data.get(CONF_API_VERSION, DEFAULT_API_VERSION),
+    )
+
+
 def solar_count(entry: ConfigEntry) -> int:
     """Return how many solar circuits to build for this entry.
 
@@ -160,9 +272,9 @@ def solar_count(entry: ConfigEntry) -> int:
     raw = entry.options.get(CONF_SOLAR, 0)
     count = (1 if raw else 0) if isinstance(raw, bool) else int(raw or 0)
 
-    if version.parse(
+    if MULTI_SOLAR_MIN_VERSION not in api_versions_up_to(
         entry.data.get(CONF_API_VERSION, DEFAULT_API_VERSION)
-    ) < version.parse(MULTI_SOLAR_MIN_VERSION):
+    ):
         return min(count, 1)
 
     return count
@@ -198,14 +310,25 @@ def component_count(entry: ConfigEntry, option: str) -> int:
     count = (1 if raw else 0) if isinstance(raw, bool) else int(raw or 0)
 
     minimum = COMPONENT_MIN_VERSION.get(option)
-    if minimum is not None and version.parse(
+    if minimum is not None and minimum not in api_versions_up_to(
         entry.data.get(CONF_API_VERSION, DEFAULT_API_VERSION)
-    ) < version.parse(minimum):
+    ):
         return 0
 
     return count
 
 
+def poll_tier(entry: ConfigEntry, option: str) -> str:
+    """Return the tier a component is polled on.
+
+    Only the components a user moved off the fast tier are stored, so a
+    component added to the integration later is read on every poll like the
+    rest until somebody says otherwise.
+    """
+    tiers: dict[str, str] = entry.options[CONF_POLL_TIERS]
+    return tiers.get(option, DEFAULT_POLL_TIER)
+
+
 def build_unique_id(host: str, port: int) -> str:
     """Return the unique id identifying one eco manager-touch.
 
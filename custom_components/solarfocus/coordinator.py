@@ -1,18 +1,38 @@
 """Coordinator for Solarfocus integration."""
 
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from datetime import timedelta
+from functools import partial
 import logging
-from typing import override
+import time
+from typing import Any, override
 
-from pysolarfocus import SolarfocusAPI
+from pysolarfocus import SolarfocusAPI, Systems
+from pysolarfocus.components.base.component import Component
+from pysolarfocus.components.base.data_value import DataValue
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import (
+    CONF_API_VERSION,
+    CONF_HOST,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+)
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import device_registry as dr, issue_registry as ir
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from .breaker import FAILURE_THRESHOLD, ComponentBreakers
+from .connection import async_get_connection_pool
 from .const import (
+    BIOMASS_BOILER_COMPONENT,
+    BOILER_COMPONENT,
+    BUFFER_COMPONENT,
+    CIRCULATION_COMPONENT,
     COMPONENT_DEVICES,
     COMPONENT_PREFIXES,
     CONF_BIOMASS_BOILER,
@@ -24,11 +44,25 @@ from .const import (
     CONF_HEATING_CIRCUIT,
     CONF_HEATPUMP,
     CONF_PHOTOVOLTAIC,
+    CONF_PIPELINE_WINDOW,
     CONF_SOLAR,
+    CONF_SOLARFOCUS_SYSTEM,
+    DIFFERENTIAL_MODULE_COMPONENT,
     DOMAIN,
+    FRESH_WATER_MODULE_COMPONENT,
+    HEAT_PUMP_COMPONENT,
+    HEATING_CIRCUIT_COMPONENT,
+    PHOTOVOLTAIC_COMPONENT,
+    POLL_TIER_PERIODS,
+    SOLAR_COMPONENT,
     component_count,
     component_device_identifiers,
+    poll_tier,
 )
+from .instrumentation import PollInstrumentation
+from .modbus import ModbusClient, ModbusError
+from .planner import ReadPlanner, component_registers, item_registers, plan_writes
+from .scheduler import Priority, TransactionScheduler
 from .service_menu import DisplayedNumber
 
 _LOGGER = logging.getLogger(__name__)
@@ -47,6 +81,113 @@ COMPONENT_UPDATES: tuple[tuple[str, str], ...] = (
     (CONF_DIFFERENTIAL_MODULE, "update_differential_modules"),
 )
 
+# Config option -> the attribute of the library holding the components of it,
+# for reading them without the library's `update_*` calls. A list for the
+# components there can be several of, the component itself for the others.
+COMPONENT_ATTRIBUTES: dict[str, str] = {
+    CONF_HEATING_CIRCUIT: HEATING_CIRCUIT_COMPONENT,
+    CONF_BUFFER: BUFFER_COMPONENT,
+    CONF_BOILER: BOILER_COMPONENT,
+    CONF_HEATPUMP: HEAT_PUMP_COMPONENT,
+    CONF_PHOTOVOLTAIC: PHOTOVOLTAIC_COMPONENT,
+    CONF_BIOMASS_BOILER: BIOMASS_BOILER_COMPONENT,
+    CONF_SOLAR: SOLAR_COMPONENT,
+    CONF_FRESH_WATER_MODULE: FRESH_WATER_MODULE_COMPONENT,
+    CONF_CIRCULATION: CIRCULATION_COMPONENT,
+    CONF_DIFFERENTIAL_MODULE: DIFFERENTIAL_MODULE_COMPONENT,
+}
+
+# How long after writing a setpoint the next write of the same register is held
+# back for. Whatever else is asked of the register meanwhile - a slider being
+# dragged, an automation feeding it every second - ends up as one write of the
+# latest value once this is over.
+WRITE_COOLDOWN = 1.0
+
+# The layout of what `async_save_snapshot` stores, and how long after a poll the
+# values it read are written to disk: often enough that a restart finds values
+# from minutes ago, rarely enough that polling every few seconds does not mean
+# writing the disk every few seconds too.
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 300
+
+# How much of the update interval a poll may take before the components it has
+# not got to are left for the next one. The rest is the controller's own: a
+# controller that slows down under load is not asked for the next poll the
+# moment this one ends.
+POLL_BUDGET = 0.8
+
+
+def reads_natively(api: object) -> bool:
+    """Return whether the components of this api can be read off the event loop.
+
+    That takes a pysolarfocus api whose components still say which register
+    slices they span and parse what was read from them - none of which is
+    public, so a release of the library that moves it is read the way it
+    always was, through its own `update_*` calls in the executor, rather than
+    not at all.
+    """
+    return isinstance(api, SolarfocusAPI) and all(
+        hasattr(Component, name)
+        for name in ("input_slices", "holding_slices", "_parse")
+    )
+
+
+def _library_transactions(component: Any) -> int:
+    """Return how many requests the library sends to read one of its components.
+
+    It reads every register slice of the component in a request of its own,
+    the input slices when the component has an input address and the holding
+    slices when it has a holding one. A component that was never initialised
+    against a connection - or that comes from a release of the library that no
+    longer says how it slices - is charged a request per address instead,
+    which is what it costs at the least.
+    """
+    transactions = 0
+    for present, name in (
+        ("has_input_address", "input_slices"),
+        ("has_holding_address", "holding_slices"),
+    ):
+        if not getattr(component, present, True):
+            continue
+        try:
+            transactions += len(getattr(component, name))
+        except (AttributeError, TypeError):
+            transactions += 1
+    return transactions
+
+
+@dataclass(slots=True)
+class _Reader:
+    """An entity that is shown, and what of its component it shows."""
+
+    option: str
+    component: Any
+    registers: frozenset[DataValue]
+
+
+@dataclass(slots=True)
+class _PendingWrite:
+    """The latest value asked of one register, while writes of it are held back."""
+
+    component: Any
+    item: str
+    debouncer: Debouncer[Any] = field(init=False)
+    value: Any = None
+    pending: bool = False
+    # While a service call waits for the write, which is then the one to hear
+    # that it failed. Otherwise it went out later on the cooldown timer, with
+    # nobody waiting for it.
+    awaited: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class _Changes:
+    """What the last refresh changed, for the entities that show it."""
+
+    registers: frozenset[DataValue]
+    # Components that started or stopped failing on their own
+    options: frozenset[str]
+
 
 # Nothing is handed to the entities through the coordinator: an entity reads
 # the component objects of the library directly, so a refresh has no data of
@@ -66,6 +207,14 @@ class SolarfocusDataUpdateCoordinator(DataUpdateCoordinator[None]):
         self._entry = entry
         self.hass = hass
         self._failed_components: frozenset[str] = frozenset()
+        # What the issue of each component this coordinator raised one for was
+        # last raised with, by option - None until it reported anything at all,
+        # see `_report_failed_components`.
+        self._raised_issues: dict[str, dict[str, str]] | None = None
+        # Whether the devices those issues name may have been renamed since,
+        # and the listener that notices, while there is an issue to rename.
+        self._issue_names_stale = False
+        self._unsub_device_updates: CALLBACK_TYPE | None = None
         # The controller every component device of this entry hangs off, set by
         # `async_setup_entry` once the device is registered. A component device
         # points at it by id rather than by identifier, which Home Assistant
@@ -75,6 +224,70 @@ class SolarfocusDataUpdateCoordinator(DataUpdateCoordinator[None]):
         # one entity of it and multiplied by another. Not a register, so it
         # lives here, where both platforms can reach it.
         self.displayed_number = DisplayedNumber()
+        # The connection the registers are read over from the event loop, which
+        # every entry for the same address shares - see `ConnectionPool` - or
+        # None where the library has to read them itself - see `reads_natively`.
+        self._connection = (
+            async_get_connection_pool(hass).acquire(
+                entry.data[CONF_HOST], entry.data[CONF_PORT], entry.entry_id
+            )
+            if reads_natively(api)
+            else None
+        )
+        self._client = None if self._connection is None else self._connection.client
+        # What reading each component cost on the last polls - see
+        # `PollInstrumentation`.
+        self.read_statistics = PollInstrumentation()
+        self._planner = ReadPlanner(
+            self.read_statistics, entry.options[CONF_PIPELINE_WINDOW]
+        )
+        # Whose turn it is on the connection, the poll's or a write's, of this
+        # entry or of another one sharing it - see `TransactionScheduler`.
+        self._scheduler = (
+            TransactionScheduler()
+            if self._connection is None
+            else self._connection.scheduler
+        )
+        # How many polls there have been, which is what says which tier is due,
+        # and the components the last attempt at reading failed for, which are
+        # due on every poll until one reads them - see `_due_components`.
+        self._polls = 0
+        self._unread: set[str] = set()
+        # The components that keep failing, which are only read as a probe
+        # every so often - see `ComponentBreakers`.
+        self.breakers = ComponentBreakers()
+        # The components a poll ran out of time before reading, in the order
+        # they were due, which the next poll reads first - and how many polls
+        # have run out of time so far.
+        self._carried: list[str] = []
+        self.overruns = 0
+        # The entities that are shown, by the callback that writes them - see
+        # `async_add_reader` - and what they read, worked out once per change
+        # rather than once per poll.
+        self._readers: dict[CALLBACK_TYPE, _Reader] = {}
+        self._readers_complete = False
+        self._shown: dict[str, dict[Any, frozenset[DataValue]]] | None = None
+        # The values each component had when it was last looked at, and what
+        # the last refresh changed of them - None for everything, which is what
+        # a refresh that failed, or the first after one, comes to.
+        self._snapshots: dict[Any, tuple[list[DataValue], list[Any]]] = {}
+        self._changes: _Changes | None = None
+        # The readers of each component, while a poll hands every component to
+        # them as soon as it is read - see `_async_publish` - and None while
+        # the poll does not, being one after which everything is written.
+        self._publishing: dict[Any, list[CALLBACK_TYPE]] | None = None
+        # The setpoints written recently, by register - see `async_write_latest`
+        # - and how many values asked for never went out: replaced by a later
+        # one before they did, or already what the register held.
+        self._pending_writes: dict[DataValue, _PendingWrite] = {}
+        self.dropped_writes = 0
+        # The registers as the last good poll read them, kept over a restart -
+        # see `async_restore_snapshot` - and whether the values the entities
+        # show are still the ones restored from there.
+        self._store = _snapshot_store(hass, entry)
+        self._read_once = False
+        self._restored = False
+        self._snapshot_scheduled = False
 
         super().__init__(
             hass,
@@ -93,6 +306,51 @@ class SolarfocusDataUpdateCoordinator(DataUpdateCoordinator[None]):
         """
         return self._failed_components
 
+    @property
+    def polls(self) -> int:
+        """Return how many polls there have been, which the breakers count in."""
+        return self._polls
+
+    @property
+    def pipeline_window(self) -> int:
+        """Return how many read requests go out before the first is answered.
+
+        What the options say, until the controller turned that down - see
+        `ReadPlanner`.
+        """
+        return self._planner.window
+
+    @property
+    def stale(self) -> bool:
+        """Return True while the values are the ones from before the restart."""
+        return self._restored
+
+    @property
+    def is_connected(self) -> bool:
+        """Return True while the connection the registers are read over is up."""
+        if self._client is not None:
+            return self._client.is_connected
+        return bool(self.api.is_connected)
+
+    async def async_close(self) -> None:
+        """Let go of the connection the registers are read over.
+
+        Which closes it, unless another entry for the same address still reads
+        over it. A setpoint still held back is dropped: the entry going away is
+        the last word on it. The library's own connection is left to it: it has
+        no call to close it, and where it is the one the registers are read
+        over, it is also the one they are written over.
+        """
+        for write in self._pending_writes.values():
+            write.debouncer.async_shutdown()
+        self._pending_writes.clear()
+        self._follow_device_names(False)
+
+        if self._connection is not None:
+            await async_get_connection_pool(self.hass).async_release(
+                self._connection, self._entry.entry_id
+            )
+
     @property
     def _address(self) -> str:
         """Return the address of the heating system, for log messages."""
@@ -100,30 +358,59 @@ class SolarfocusDataUpdateCoordinator(DataUpdateCoordinator[None]):
 
     @override
     async def _async_update_data(self) -> None:
-        """Update data via library."""
+        """Read every configured component of the heating system."""
+        # Until this gets to the end, the entities are told everything changed.
+        # Still the outcome of the last refresh here, which is what says
+        # whether this one brings the entry back.
+        # A restored snapshot is the same thing: nothing on screen was read
+        # by this run of Home Assistant, so every entity is written again.
+        recovering = not self.last_update_success or self._restored
+        self._changes = None
+        self._publishing = None if recovering else self._readers_by_component()
 
-        if not self.api.is_connected and not await self.hass.async_add_executor_job(
-            self.api.connect
-        ):
-            raise UpdateFailed(
-                translation_domain=DOMAIN,
-                translation_key="cannot_connect",
-                translation_placeholders={"address": self._address},
-            )
+        # Behind any write that is waiting, and ahead of none that comes along
+        # while it reads.
+        async with self._scheduler.transaction(Priority.READ):
+            # From when it is the poll's turn: the time a write holds it up
+            # for is the write's.
+            deadline = time.monotonic() + self._poll_budget
+            if not self.is_connected and not await self._async_connect():
+                raise UpdateFailed(
+                    translation_domain=DOMAIN,
+                    translation_key="cannot_connect",
+                    translation_placeholders={"address": self._address},
+                )
 
-        configured = 0
-        failed = []
-        for option, update in COMPONENT_UPDATES:
-            # What the entry reads, not what the options ask for: a component
-            # the selected api version does not have is read by a library call
-            # that returns success without asking the controller anything, so
-            # counting it as configured would mean a system that answers
-            # nothing at all no longer has every component fail.
-            if not component_count(self._entry, option):
-                continue
-            configured += 1
-            if not await self.hass.async_add_executor_job(getattr(self.api, update)):
-                failed.append(option)
+            # What the entry reads, not what the options ask for: a component the
+            # selected api version does not have is read by a library call that
+            # returns success without asking the controller anything, so counting
+            # it as configured would mean a system that answers nothing at all no
+            # longer has every component fail.
+            #
+            # Nor is a component none of whose entities is shown: the registers
+            # behind a disabled entity are not worth a request each poll.
+            shown = self._what_is_shown()
+            configured = [
+                option
+                for option, _ in COMPONENT_UPDATES
+                if component_count(self._entry, option)
+                and (shown is None or option in shown)
+            ]
+            due = self._due_components(configured)
+            self.read_statistics.start_poll()
+            try:
+                failed, unreached = await self._async_read_components(
+                    due, deadline
+                )
+            finally:
+                self.read_statistics.finish_poll()
+                self._publishing = None
+        self._carry_over(unreached)
+        # From here on, a component the poll did not get to is one that was
+        # not due: it keeps whatever its last read said about it.
+        due = [option for option in due if option not in unreached]
+        self._unread.difference_update(due)
+        self._unread.update(failed)
 
         # A connection that drops part way through the poll fails every
         # component read after it, whatever those components would have
@@ -132,9 +419,18 @@ class SolarfocusDataUpdateCoordinator(DataUpdateCoordinator[None]):
         # out an arbitrary tail of the system and raise an issue per component
         # telling the user to switch it off, for what is one dropped
         # connection, re-established on the next refresh.
-        connection_lost = bool(failed) and not self.api.is_connected
-
-        if connection_lost or (failed and len(failed) == configured):
+        connection_lost = bool(failed) and not self.is_connected
+        # A poll that had nothing to read but probes of components that were
+        # failing already has not seen the system go anywhere.
+        only_probes = all(self.breakers.is_open(option) for option in due)
+        # Nor has a poll that ran out of time before it got to the rest. A
+        # component that does not answer takes the whole of a request timeout
+        # to say so, which is more than the budget of a short interval: it
+        # would be every component the poll read, and every entity of the
+        # entry would be greyed out for one component that is not there.
+        if connection_lost or (
+            failed and not unreached and len(failed) == len(due) and not only_probes
+        ):
             # Nothing could be read: the system is gone rather than one of its
             # components being unhappy. Reporting that as a success would leave
             # every entity available and showing its last value.
@@ -162,10 +458,677 @@ class SolarfocusDataUpdateCoordinator(DataUpdateCoordinator[None]):
                 },
             )
 
-        self._report_partial_failure(failed)
+        self._trip_breakers(due, failed)
+
+        # A component that is not due keeps whatever its last read said about
+        # it, failed or not - that is still the latest there is.
+        failing_before = self._failed_components
+        self._report_partial_failure(
+            [
+                option
+                for option in configured
+                if option in failed
+                or (option not in due and option in self._failed_components)
+            ]
+        )
+
+        changed = self._changed_registers(due)
+        if not recovering:
+            self._changes = _Changes(changed, failing_before ^ self._failed_components)
+
+        self._read_once = True
+        self._restored = False
+        # Once per delay: the store puts off a save that is scheduled again
+        # before it is due, which every poll in between would do.
+        if not self._snapshot_scheduled:
+            self._snapshot_scheduled = True
+            self._store.async_delay_save(self._scheduled_snapshot, SNAPSHOT_SAVE_DELAY)
 
         _LOGGER.debug("Data updated successfully")
 
+    async def async_restore_snapshot(self) -> bool:
+        """Put back the registers as the last good poll before the restart read them.
+
+        For `async_setup_entry`, so the entities have something to show before
+        the controller has answered anything. Only a snapshot of the same
+        system, api version and components is taken: any other one names
+        registers this entry does not read, or reads differently.
+
+        Returns whether there was one to restore. The values stay marked as
+        restored - see `stale` - until the first poll reads them again.
+        """
+        data = await self._store.async_load()
+        if (
+            data is None
+            or data.get(CONF_API_VERSION) != self._entry.data[CONF_API_VERSION]
+            or data.get(CONF_SOLARFOCUS_SYSTEM) != self._system
+        ):
+            return False
+
+        stored: dict[str, list[dict[str, Any]]] = data.get("components", {})
+        configured = {
+            option: self._library_components(option)
+            for option in COMPONENT_ATTRIBUTES
+            if component_count(self._entry, option)
+        }
+        if any(
+            len(stored.get(option, [])) < len(components)
+            for option, components in configured.items()
+        ):
+            return False
+
+        for option, components in configured.items():
+            for component, values in zip(components, stored[option], strict=False):
+                for name, value in values.items():
+                    register = getattr(component, name, None)
+                    if isinstance(register, DataValue):
+                        register.value = value
+
+        self._read_once = self._restored = True
+        _LOGGER.debug(
+            "Restored the registers of %s from before the restart", self._address
+        )
+        return True
+
+    async def async_save_snapshot(self) -> None:
+        """Store the registers as they are now, for `async_restore_snapshot`.
+
+        Right away rather than after `SNAPSHOT_SAVE_DELAY`, for an entry that is
+        unloading: the coordinator that sets it up again reads the same store.
+        Nothing is stored before anything was read.
+        """
+        if self._read_once:
+            await self._store.async_save(self._snapshot())
+
+    @property
+    def _system(self) -> str:
+        """Return the heating system of the entry, the way a snapshot stores it."""
+        return str(Systems(self._entry.data[CONF_SOLARFOCUS_SYSTEM]).value)
+
+    def _scheduled_snapshot(self) -> dict[str, Any]:
+        """Return the snapshot for the store to save, once it gets round to it."""
+        self._snapshot_scheduled = False
+        return self._snapshot()
+
+    def _snapshot(self) -> dict[str, Any]:
+        """Return what `async_save_snapshot` stores: the raw value of every register."""
+        return {
+            CONF_API_VERSION: self._entry.data[CONF_API_VERSION],
+            CONF_SOLARFOCUS_SYSTEM: self._system,
+            "components": {
+                option: [
+                    {
+                        name: register.value
+                        for name, register in vars(component).items()
+                        if isinstance(register, DataValue)
+                    }
+                    for component in self._library_components(option)
+                ]
+                for option in COMPONENT_ATTRIBUTES
+            },
+        }
+
+    def _changed_registers(self, options: list[str]) -> frozenset[DataValue]:
+        """Return the registers of these components that changed since last time.
+
+        A component compares as a whole first: most of them did not change at
+        all between two polls, and a list of its values says so in one go.
+        """
+        changed: set[DataValue] = set()
+        for option in options:
+            for component in self._library_components(option):
+                changed.update(self._changed_registers_of(component))
+
+        return frozenset(changed)
+
+    def _changed_registers_of(self, component: Any) -> list[DataValue]:
+        """Return the registers of one component that changed since last time."""
+        if (snapshot := self._snapshots.get(component)) is None:
+            registers = component_registers(component)
+            snapshot = self._snapshots[component] = (registers, [])
+        registers, previous = snapshot
+        values = [register.value for register in registers]
+        if values == previous:
+            return []
+        self._snapshots[component] = (registers, values)
+        return [
+            register
+            for index, register in enumerate(registers)
+            if not previous or previous[index] != values[index]
+        ]
+
+    def _readers_by_component(self) -> dict[Any, list[CALLBACK_TYPE]]:
+        """Return the callbacks of the readers of each component, once per poll.
+
+        Only the readers that say what they show: anything else is written at
+        the end of the poll, as it always was.
+        """
+        readers: dict[Any, list[CALLBACK_TYPE]] = {}
+        for update_callback, _ in self._listeners.values():
+            reader = self._readers.get(update_callback)
+            if reader is not None and reader.registers:
+                readers.setdefault(reader.component, []).append(update_callback)
+        return readers
+
+    @callback
+    def _async_publish(self, component: Any) -> None:
+        """Write the entities of a component the poll has just read.
+
+        Rather than once every other component due has been read as well: the
+        heat pump read first is on screen while the solar circuits behind it
+        are still being asked for. What changed is taken off the snapshot
+        here, so the end of the poll finds nothing changed of this component
+        and does not write the same entities again.
+        """
+        if self._publishing is None:
+            return
+        callbacks = self._publishing.get(component)
+        if not callbacks:
+            return
+        changed = frozenset(self._changed_registers_of(component))
+        if not changed:
+            return
+        for update_callback in callbacks:
+            reader = self._readers.get(update_callback)
+            if reader is not None and not reader.registers.isdisjoint(changed):
+                update_callback()
+
+    @callback
+    @override
+    def async_update_listeners(self) -> None:
+        """Tell the entities what the last refresh changed of what they show.
+
+        Every entity used to write its state on every refresh, changed or not,
+        and most of what a heating system reports does not change from one
+        poll to the next: that was a state write per entity and poll for the
+        state machine to find identical to the one before.
+
+        So an entity is only called for if a register it shows changed, or its
+        component started or stopped failing. Everything is called for after a
+        refresh that did not get that far, and on anything else that calls
+        this: an entity whose registers are not known, and every listener that
+        is not an entity at all.
+        """
+        changes, self._changes = self._changes, None
+        for update_callback, _ in list(self._listeners.values()):
+            reader = self._readers.get(update_callback)
+            if (
+                changes is None
+                or reader is None
+                or not reader.registers
+                or reader.option in changes.options
+                or not reader.registers.isdisjoint(changes.registers)
+            ):
+                update_callback()
+
+    def _due_components(self, configured: list[str]) -> list[str]:
+        """Return the configured components to read on this poll, and count it.
+
+        A component is due every so many polls, as its tier says, and on every
+        poll while it has not been read since it last failed: the first poll
+        reads everything, and a slow component the connection dropped for is
+        not left with nothing to show until its turn comes round again.
+
+        Except one that has failed for so long its breaker tripped, which is
+        due only when its next probe is - see `ComponentBreakers`. And one the
+        last poll ran out of time for is due on this one whatever its tier.
+        """
+        polls = self._polls
+        self._polls += 1
+        return [
+            option
+            for option in configured
+            if not self.breakers.skips(option, polls)
+            and (
+                option in self._unread
+                or option in self._carried
+                or polls % POLL_TIER_PERIODS[poll_tier(self._entry, option)] == 0
+            )
+        ]
+
+    @property
+    def _poll_budget(self) -> float:
+        """Return how many seconds a poll may take, see `POLL_BUDGET`."""
+        interval = self.update_interval
+        if interval is None:
+            interval = timedelta(seconds=self._entry.options[CONF_SCAN_INTERVAL])
+        return interval.total_seconds() * POLL_BUDGET
+
+    def _carry_over(self, unreached: list[str]) -> None:
+        """Leave the components a poll ran out of time for to the next one.
+
+        Which reads them before anything else, so however slow the controller
+        gets, every component is read in turn rather than the ones at the end
+        of the list never at all.
+        """
+        self._carried = unreached
+        if not unreached:
+            return
+
+        self.overruns += 1
+        # Once at the level anybody sees: a controller this slow is slow on
+        # every poll, and the count is in the diagnostics download.
+        _LOGGER.log(
+            logging.WARNING if self.overruns == 1 else logging.DEBUG,
+            "Reading %s took longer than %.1f seconds, %s will be read first on"
+            " the next poll",
+            self._address,
+            self._poll_budget,
+            ", ".join(unreached),
+        )
+
+    def _trip_breakers(self, due: list[str], failed: list[str]) -> None:
+        """Count what this poll read and failed to read towards the breakers.
+
+        Only on a poll that read something: a system that answers nothing at
+        all is an outage, which says nothing about any one component of it.
+        """
+        poll = self._polls - 1
+        for option in due:
+            was_open = self.breakers.is_open(option)
+            self.breakers.record(option, poll, option in failed)
+            if not was_open and self.breakers.is_open(option):
+                _LOGGER.warning(
+                    "%s of %s has not answered %s polls in a row, it is only"
+                    " tried every so often from now on, starting in %s polls",
+                    option,
+                    self._address,
+                    FAILURE_THRESHOLD,
+                    self.breakers.backoff(option),
+                )
+            elif was_open and not self.breakers.is_open(option):
+                _LOGGER.info(
+                    "%s of %s answers again, it is read on every due poll",
+                    option,
+                    self._address,
+                )
+
+    async def _async_connect(self) -> bool:
+        """Connect whichever transport the registers are read over."""
+        if self._client is not None:
+            return await self._client.async_connect()
+        return bool(await self.hass.async_add_executor_job(self.api.connect))
+
+    async def _async_read_components(
+        self, options: list[str], deadline: float | None = None
+    ) -> tuple[list[str], list[str]]:
+        """Read the components configured under these options.
+
+        Returns the ones that failed, and the ones that were not read because
+        `deadline` - on the clock of `time.monotonic` - had passed by the time
+        their turn came. Those carried over from the poll before are read first,
+        and something is read whatever the deadline.
+
+        Off the event loop where the library allows it, every component in one
+        plan of as few requests as they fit in - see `ReadPlanner`. Through the
+        library's own `update_*` calls in the executor where it does not, one
+        call per component, stopping at the first instance that cannot be read.
+
+        Either way a component is failed as a whole, whichever of its instances
+        did not answer: an issue is raised per component rather than per
+        instance.
+        """
+        # In the order they were left in, and the rest after them.
+        first = [option for option in self._carried if option in options]
+        options = first + [option for option in options if option not in first]
+        if self._client is None:
+            updates = dict(COMPONENT_UPDATES)
+            failed: list[str] = []
+            unreached: list[str] = []
+            for sent, option in enumerate(options):
+                start = time.monotonic()
+                if deadline is not None and sent and start >= deadline:
+                    unreached.append(option)
+                    continue
+                read = await self.hass.async_add_executor_job(
+                    getattr(self.api, updates[option])
+                )
+                # One call for every instance, so each is charged its part.
+                instances = self._library_components(option)
+                for component in instances:
+                    self.read_statistics.record_component(
+                        component,
+                        (time.monotonic() - start) / len(instances),
+                        transactions=_library_transactions(component),
+                        error=not read,
+                    )
+                if not read:
+                    failed.append(option)
+                    continue
+                for component in instances:
+                    self._async_publish(component)
+            return failed, unreached
+
+        shown = self._what_is_shown()
+        registers = None if shown is None else {
+            component: values
+            for option in options
+            for component, values in shown.get(option, {}).items()
+        }
+        components = {
+            option: [
+                component
+                for component in self._library_components(option)
+                if registers is None or component in registers
+            ]
+            for option in options
+        }
+        skipped: set[Any] = set()
+        unread = await self._planner.async_read(
+            self._client,
+            [component for instances in components.values() for component in instances],
+            registers,
+            deadline=deadline,
+            first={component for option in first for component in components[option]},
+            unreached=skipped,
+            on_read=self._async_publish,
+        )
+
+        # An instance that failed fails its component, whether or not the
+        # others were got to.
+        failed = [
+            option
+            for option, instances in components.items()
+            if unread.intersection(instances)
+        ]
+        return failed, [
+            option
+            for option, instances in components.items()
+            if option not in failed and skipped.intersection(instances)
+        ]
+
+    async def async_write(
+        self, component: Any, values: Mapping[str, Any], side_effects: bool = False
+    ) -> None:
+        """Write values of one component to the heating system, and read them back.
+
+        Over the integration's own connection where the registers are read
+        over it, so the event loop goes on while the controller answers, and
+        registers next to each other in one request - see `plan_writes`. Where
+        the library reads them itself, it writes them too, the way it always
+        did - one by one in the executor, since its client blocks until the
+        answer is in.
+
+        What was written is read back once, after the last of it, which is what
+        the entities show: the controller may well have kept a value other than
+        the one written. Just those registers, unless the write has
+        `side_effects` on the rest of the component, which is read whole then.
+        The library can only read a component whole, so it always does.
+
+        A poll that is reading when this is called finishes first, and one
+        that is waiting goes after it.
+        """
+        async with self._scheduler.transaction(Priority.WRITE):
+            registers: list[DataValue] = []
+            for item, value in values.items():
+                register = getattr(component, item)
+                register.set_unscaled_value(value)
+                registers.append(register)
+
+            if self._client is None:
+                written = await self.hass.async_add_executor_job(
+                    self._library_write, component, registers
+                )
+            else:
+                written = await self._async_write_registers(
+                    self._client, component, registers, side_effects
+                )
+
+        if not written:
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="cannot_write",
+                translation_placeholders={
+                    "item": ", ".join(values),
+                    "address": self._address,
+                },
+            )
+
+    async def async_write_latest(self, component: Any, item: str, value: Any) -> None:
+        """Write a value only the latest of matters, like a setpoint.
+
+        The first write of a register goes out right away. Any asked for
+        within `WRITE_COOLDOWN` after it is held back, and only the last of
+        those is written once the cooldown is over - a value replaced before it
+        went out is one the controller never needed to see. Nor is one the
+        register already holds written at all. Either counts towards
+        `dropped_writes`.
+
+        The entities showing the register are written once the value is, so
+        one held back shows up when it goes out rather than when it was asked.
+        """
+        register = getattr(component, item)
+        if (write := self._pending_writes.get(register)) is None:
+            write = self._pending_writes[register] = _PendingWrite(component, item)
+            write.debouncer = Debouncer(
+                self.hass,
+                _LOGGER,
+                cooldown=WRITE_COOLDOWN,
+                immediate=True,
+                function=partial(self._async_write_pending, write),
+            )
+
+        if write.pending:
+            self._drop_write(item, write.value)
+        write.value = value
+        write.pending = True
+        write.awaited = True
+        try:
+            await write.debouncer.async_call()
+        finally:
+            write.awaited = False
+
+    async def _async_write_pending(self, write: _PendingWrite) -> None:
+        """Write the value held back for one register, unless it holds it already.
+
+        A write held back goes out on the cooldown timer, long after the service
+        call that asked for it returned. If that write fails, there is nobody
+        left to raise the error to - the timer would only log it as unexpected -
+        so it is logged here. The register gets back the value it held if the
+        read-back could not tell what the controller kept, and the entities
+        showing it are written either way, so they do not go on showing a value
+        the controller never took.
+        """
+        if not write.pending:
+            return
+        write.pending = False
+
+        register = getattr(write.component, write.item)
+        written = int(register.reverse_scale(write.value))
+        if written == int(register.value):
+            self._drop_write(write.item, write.value)
+            return
+
+        held = register.value
+        try:
+            await self.async_write(write.component, {write.item: write.value})
+        except HomeAssistantError as err:
+            if write.awaited:
+                raise
+            if int(register.value) == written:
+                register.value = held
+            _LOGGER.warning(
+                "Cannot write %s to %s of %s, register %s: %s",
+                write.value,
+                write.item,
+                self._address,
+                register.get_absolute_address(),
+                err,
+            )
+        finally:
+            self._async_update_readers_of(frozenset({register}))
+
+    def _drop_write(self, item: str, value: Any) -> None:
+        """Count a value that is not going to be written."""
+        self.dropped_writes += 1
+        _LOGGER.debug(
+            "Not writing %s to %s of %s, %s dropped so far",
+            value,
+            item,
+            self._address,
+            self.dropped_writes,
+        )
+
+    @callback
+    def _async_update_readers_of(self, registers: frozenset[DataValue]) -> None:
+        """Call back every entity that shows one of these registers."""
+        for update_callback, reader in list(self._readers.items()):
+            if reader.registers & registers:
+                update_callback()
+
+    async def _async_write_registers(
+        self,
+        client: ModbusClient,
+        component: Any,
+        registers: list[DataValue],
+        side_effects: bool,
+    ) -> bool:
+        """Write registers of one component over the integration's own connection.
+
+        Stops at the first request the controller refuses, and reads back
+        whether it got to the end or not: what did make it is on the controller
+        either way.
+        """
+        if not client.is_connected and not await client.async_connect():
+            return False
+
+        written = True
+        for request in plan_writes(registers):
+            try:
+                await client.async_write_registers(request.address, request.words)
+            except ModbusError as err:
+                _LOGGER.warning("Cannot write to %s: %s", self._address, err)
+                written = False
+                break
+
+        if client.is_connected:
+            await self._planner.async_read(
+                client, [component], None if side_effects else {component: registers}
+            )
+        return written
+
+    def _library_write(self, component: Any, registers: list[DataValue]) -> bool:
+        """Write registers through the library, and have it read them back.
+
+        Blocks until the controller answered all of it, so it is for the
+        executor.
+        """
+        # The registers may be read over a connection of the integration's own,
+        # which leaves the library's unopened until there is something to write.
+        if not self.api.is_connected:
+            self.api.connect()
+
+        written = True
+        for register in registers:
+            raw_value = register.value
+            if isinstance(raw_value, (int, float)) and raw_value < 0:
+                # Modbus transmits registers as unsigned words, negative values
+                # have to be written as two's complement (16 bit per register).
+                # The signed value is restored afterwards, reading the register
+                # turns it back into a signed one.
+                register.value = raw_value + (1 << (16 * register.count))
+                written = register.commit()
+                register.value = raw_value
+            else:
+                written = register.commit()
+            if not written:
+                break
+
+        component.update()
+        return bool(written)
+
+    @callback
+    def async_add_reader(
+        self,
+        option: str,
+        component: Any,
+        items: tuple[str, ...],
+        update_callback: CALLBACK_TYPE,
+    ) -> CALLBACK_TYPE:
+        """Read these values of a component and call back when they change.
+
+        Until the call returned, which is for an entity to do once it is no
+        longer shown: one that is disabled is never added, and one disabled
+        later is removed, which is what takes its registers out of the poll
+        again without reloading the entry.
+
+        The callback is a listener of the coordinator like any other, which is
+        what keeps it polling while there is somebody to read for - see
+        `async_update_listeners` for when it is called.
+        """
+        # Under the option as its context, which is what `_async_publish`
+        # finds the readers of a component by while the poll is running.
+        remove_listener = self.async_add_listener(update_callback, option)
+        self._readers[update_callback] = _Reader(
+            option,
+            component,
+            frozenset(item_registers(component, items)),
+        )
+        self._shown = None
+
+        @callback
+        def _remove() -> None:
+            remove_listener()
+            del self._readers[update_callback]
+            self._shown = None
+
+        return _remove
+
+    @callback
+    def async_read_only_what_is_shown(self) -> None:
+        """Poll only what the entities added so far read, from now on.
+
+        For `async_setup_entry` to call once the platforms are set up. Until
+        then every configured component is read whole: the first refresh is
+        what says whether the entry can be set up at all, and it is also what
+        the entities show when they are added.
+        """
+        self._readers_complete = True
+        self._shown = None
+
+    def _what_is_shown(self) -> dict[str, dict[Any, frozenset[DataValue]]] | None:
+        """Return what the shown entities read, by option and component.
+
+        None while everything is read, see `async_read_only_what_is_shown`.
+        """
+        if not self._readers_complete:
+            return None
+
+        if self._shown is None:
+            shown: dict[str, dict[Any, set[DataValue]]] = {}
+            for reader in self._readers.values():
+                shown.setdefault(reader.option, {}).setdefault(
+                    reader.component, set()
+                ).update(reader.registers)
+            self._shown = {
+                option: {
+                    component: frozenset(values)
+                    for component, values in components.items()
+                }
+                for option, components in shown.items()
+            }
+            _LOGGER.debug(
+                "Reading the registers of %s only, for the entities shown",
+                ", ".join(self._shown) or "nothing",
+            )
+
+        return self._shown
+
+    def _library_components(self, option: str) -> list[Any]:
+        """Return the pysolarfocus components configured under one option.
+
+        A list of them for most components, one for the rest, and nothing at
+        all for one the selected api version does not have - which the library
+        reads as a success without asking the controller anything, and so does
+        the planner.
+        """
+        components = getattr(self.api, COMPONENT_ATTRIBUTES[option], None)
+        if components is None:
+            return []
+        if not isinstance(components, list):
+            return [components]
+        return components
+
     def _report_partial_failure(self, failed: list[str]) -> None:
         """Log components that could not be read while others could.
 
@@ -209,50 +1172,102 @@ class SolarfocusDataUpdateCoordinator(DataUpdateCoordinator[None]):
         user should switch it off in the options, or the api version is set
         higher than the controller runs.
 
-        Every component is answered for, not only the ones that changed or are
-        configured: switching a component off is what the issue asks the user to
-        do, and that reloads the entry into a coordinator that knows nothing
-        about the issues the one before it raised.
+        Every component is answered for the first time, not only the ones that
+        are configured: switching a component off is what the issue asks the
+        user to do, and that reloads the entry into a coordinator that knows
+        nothing about the issues the one before it raised.
+
+        From then on only what changed is: an issue goes when its component
+        reads again, and is raised again only if the names of its devices are
+        not the ones it was raised with. Every poll used to delete an issue for
+        every component that reads fine and raise one over the top for every
+        one that does not, and each of those is a write the issue registry
+        saves to disk - every five seconds, to say what it already said.
+
+        What an issue says is not even worked out again while its component
+        keeps failing, unless the device registry changed since: a rename is
+        the only thing that changes it between two polls, and the names and
+        links of every device of the component are no small thing to build
+        for a component that stays broken for weeks.
         """
-        for option, _ in COMPONENT_UPDATES:
-            issue_id = component_issue_id(self._entry.entry_id, option)
-            if option not in failed:
-                ir.async_delete_issue(self.hass, DOMAIN, issue_id)
+        entry_id = self._entry.entry_id
+        if self._raised_issues is None:
+            for option, _ in COMPONENT_UPDATES:
+                if option not in failed:
+                    ir.async_delete_issue(
+                        self.hass, DOMAIN, component_issue_id(entry_id, option)
+                    )
+            self._raised_issues = {}
+
+        raised = self._raised_issues
+        for option in [option for option in raised if option not in failed]:
+            del raised[option]
+            ir.async_delete_issue(self.hass, DOMAIN, component_issue_id(entry_id, option))
+
+        stale, self._issue_names_stale = self._issue_names_stale, False
+        for option in failed:
+            if option in raised and not stale:
                 continue
 
-            devices = self._component_devices(option)
-            # What the device page calls this component's model, for when
-            # there is no device yet to ask - either it is not registered yet,
-            # which is what the report at the end of `async_setup_entry`
-            # catches up with, or the configured api version does not have it
-            # at all. Either way this is never the bare option: that is a
-            # config key, not a word, and leaks into every language's text.
-            fallback = COMPONENT_DEVICES[COMPONENT_PREFIXES[option]].model
-            # What the device page calls this component, which is translated
-            # and is whatever the user renamed it to, and the same names as
-            # links to those pages.
-            names = [
-                device.name_by_user or device.name or fallback for device in devices
-            ]
-            links = [
-                f"[{_escape_markdown_link_text(name)}](/config/devices/device/{device.id})"
-                for name, device in zip(names, devices, strict=True)
-            ]
+            placeholders = self._issue_placeholders(option)
+            if raised.get(option) == placeholders:
+                continue
 
+            raised[option] = placeholders
             ir.async_create_issue(
                 self.hass,
                 DOMAIN,
-                issue_id,
+                component_issue_id(entry_id, option),
                 is_fixable=False,
                 severity=ir.IssueSeverity.WARNING,
                 translation_key="component_unavailable",
-                translation_placeholders={
-                    "component": ", ".join(names) or fallback,
-                    "devices": ", ".join(links) or fallback,
-                    "address": self._address,
-                    "title": self._entry.title,
-                },
+                translation_placeholders=placeholders,
+            )
+
+        self._follow_device_names(bool(raised))
+
+    def _follow_device_names(self, follow: bool) -> None:
+        """Listen for renamed devices while an issue names any, and only then."""
+        if follow and self._unsub_device_updates is None:
+            self._unsub_device_updates = self.hass.bus.async_listen(
+                dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_updated
             )
+        elif not follow and self._unsub_device_updates is not None:
+            self._unsub_device_updates()
+            self._unsub_device_updates = None
+
+    @callback
+    def _async_device_updated(
+        self, _: Event[dr.EventDeviceRegistryUpdatedData]
+    ) -> None:
+        """Have the next report work out what its issues say again."""
+        self._issue_names_stale = True
+
+    def _issue_placeholders(self, option: str) -> dict[str, str]:
+        """Return what the issue of a failing component says about it."""
+        devices = self._component_devices(option)
+        # What the device page calls this component's model, for when there is
+        # no device yet to ask - either it is not registered yet, which is what
+        # the report at the end of `async_setup_entry` catches up with, or the
+        # configured api version does not have it at all. Either way this is
+        # never the bare option: that is a config key, not a word, and leaks
+        # into every language's text.
+        fallback = COMPONENT_DEVICES[COMPONENT_PREFIXES[option]].model
+        # What the device page calls this component, which is translated and
+        # is whatever the user renamed it to, and the same names as links to
+        # those pages.
+        names = [device.name_by_user or device.name or fallback for device in devices]
+        links = [
+            f"[{_escape_markdown_link_text(name)}](/config/devices/device/{device.id})"
+            for name, device in zip(names, devices, strict=True)
+        ]
+
+        return {
+            "component": ", ".join(names) or fallback,
+            "devices": ", ".join(links) or fallback,
+            "address": self._address,
+            "title": self._entry.title,
+        }
 
     def _component_devices(self, option: str) -> list[dr.DeviceEntry]:
         """Return the registered devices of one component, in order.
@@ -283,6 +1298,7 @@ class SolarfocusDataUpdateCoordinator(DataUpdateCoordinator[None]):
         are configured under, because nothing has registered them yet. Raising
         it again over the top is what puts the device names and their links in.
         """
+        self._issue_names_stale = True
         self._report_failed_components(sorted(self._failed_components))
 
 
@@ -305,6 +1321,24 @@ def component_issue_id(entry_id: str, option: str) -> str:
     return f"component_unavailable_{entry_id}_{option}"
 
 
+def _snapshot_store(
+    hass: HomeAssistant, entry: "SolarfocusConfigEntry"
+) -> Store[dict[str, Any]]:
+    """Return where the snapshot of an entry is kept, one file per entry."""
+    return Store(hass, SNAPSHOT_VERSION, f"{DOMAIN}.{entry.entry_id}")
+
+
+async def async_remove_snapshot(
+    hass: HomeAssistant, entry: "SolarfocusConfigEntry"
+) -> None:
+    """Delete the snapshot of an entry that is removed.
+
+    It is named after the entry, so no entry will ever read it again, and Home
+    Assistant does not clean up after a store it knows nothing of.
+    """
+    await _snapshot_store(hass, entry).async_remove()
+
+
 @callback
 def async_delete_component_issues(
     hass: HomeAssistant, entry: "SolarfocusConfigEntry"
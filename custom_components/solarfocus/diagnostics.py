@@ -78,6 +78,22 @@ def _component_registers(component: Any) -> Any:
     return None if component is None else _registers(component)
 
 
+def _component_names(api: Any) -> dict[Any, str]:
+    """Return a name for every component object, as `components` lists it.
+
+    With the position in its list for the ones that can exist several times
+    over, so `boilers[1]` in the read statistics is the second boiler below.
+    """
+    names: dict[Any, str] = {}
+    for name in COMPONENTS:
+        component = getattr(api, name, None)
+        if isinstance(component, list):
+            names.update({one: f"{name}[{idx}]" for idx, one in enumerate(component)})
+        elif component is not None:
+            names[component] = name
+    return names
+
+
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: SolarfocusConfigEntry
 ) -> dict[str, Any]:
@@ -95,6 +111,22 @@ async def async_get_config_entry_diagnostics(
             # Empty unless a component fails on its own while the others read
             # fine, which is what an unsupported register range looks like.
             "failed_components": sorted(coordinator.failed_components),
+            # Setpoints asked for that never went out, see `async_write_latest`.
+            "dropped_writes": coordinator.dropped_writes,
+            # Polls that ran out of time before reading everything that was
+            # due, see `POLL_BUDGET`.
+            "overruns": coordinator.overruns,
+            # Components that keep failing, and when each is probed next.
+            "breakers": coordinator.breakers.as_dict(coordinator.polls),
+            # The read requests on the wire at once: 1 where the options say
+            # so, and where the controller would not take more.
+            "pipeline_window": coordinator.pipeline_window,
+            # What reading each component and each register range cost on the
+            # last poll, and how long the last ones took, so a slow one can be
+            # found without a debug log.
+            "read_statistics": coordinator.read_statistics.as_dict(
+                _component_names(coordinator.api)
+            ),
         },
         "components": {
             name: _component_registers(getattr(coordinator.api, name, None))
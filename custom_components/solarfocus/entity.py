@@ -1,21 +1,18 @@
 """Entity for Solarfocus integration."""
 
 
-from collections.abc import Generator
 from dataclasses import dataclass, replace
 import logging
-from typing import Any, override
+from typing import Any, cast, override
 
-from packaging import version
 from pysolarfocus import Systems
 
-from homeassistant.const import CONF_API_VERSION
 from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import Entity, EntityDescription
 
-from .const import COMPONENT_DEVICES, CONF_SOLARFOCUS_SYSTEM, DOMAIN, MANUFACTURER
-from .coordinator import SolarfocusConfigEntry, SolarfocusDataUpdateCoordinator
+from .const import ATTR_RESTORED, COMPONENT_DEVICES, DOMAIN, MANUFACTURER
+from .coordinator import SolarfocusDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -44,6 +41,14 @@ class SolarfocusEntityDescription(EntityDescription):
     unsupported_systems: list[Systems] | None = None
 
 
+# Every description an entity has been built from, by what it was bound to and
+# what it was bound from - see `create_description`.
+_BOUND: dict[
+    tuple[type, str, str, str, str],
+    tuple[SolarfocusEntityDescription, SolarfocusEntityDescription],
+] = {}
+
+
 def create_description[_DescriptionT: SolarfocusEntityDescription](
     component: str,
     prefix: str,
@@ -57,7 +62,22 @@ def create_description[_DescriptionT: SolarfocusEntityDescription](
 
     Generic in the description so a platform gets its own description type back
     rather than this base one, and can read the fields it added to it.
+
+    Bound once per process rather than once per entity: a description bound to
+    an instance is frozen, so the copy a reload or another entry asks for is the
+    very one the last asked for. An entry of four of everything has hundreds of
+    entities, each of which used to get a copy of its own on every reload - a
+    dataclass, and the keys joined together for it, all equal to the last.
     """
+    # By the type as well as the key: a sensor and a number can be declared
+    # under one key. And only while the description is still the one bound: a
+    # description built on the fly, as a test does, is a new one for every
+    # entity it describes even where it has the key of the last.
+    cache_key = (type(description), component, prefix, idx, description.key)
+    if (cached := _BOUND.get(cache_key)) is not None and cached[0] is description:
+        # Of the type asked for: the type of the description is in the key.
+        return cast(_DescriptionT, cached[1])
+
     # The name the user reads is not built here any more. `has_entity_name` makes
     # it the name of the entity, and a name built from the key is English
     # whatever language Home Assistant is in, so it comes from the translation of
@@ -74,7 +94,7 @@ def create_description[_DescriptionT: SolarfocusEntityDescription](
     # the index are not in it either - the device supplies both. The words of the
     # key rather than the translated name, so this half of the id stays English
     # in every language.
-    return replace(
+    bound = replace(
         description,
         item=description.key,
         component=component,
@@ -85,6 +105,8 @@ def create_description[_DescriptionT: SolarfocusEntityDescription](
         key="".join(filter(None, (prefix, idx, "_", description.key))),
         translation_key="".join(filter(None, (prefix, "_", description.key))),
     )
+    _BOUND[cache_key] = (description, bound)
+    return bound
 
 
 def every_system_but(*supported: Systems) -> list[Systems]:
@@ -99,34 +121,25 @@ def every_system_but(*supported: Systems) -> list[Systems]:
     return [system for system in Systems if system not in supported]
 
 
-def filterVersionAndSystem[_EntityT: SolarfocusEntity](
-    config_entry: SolarfocusConfigEntry, entities: list[_EntityT]
-) -> Generator[_EntityT]:
-    """Filter entities not compatible to version or system."""
-    api_version = version.parse(config_entry.data[CONF_API_VERSION])
-
-    filtered_entities = filter(
-        lambda entity: version.parse(entity.entity_description.min_required_version)
-        <= api_version,
-        entities,
-    )
-
-    current_system = config_entry.data[CONF_SOLARFOCUS_SYSTEM]
-
-    for entity in filtered_entities:
-        unsupported_systems = entity.entity_description.unsupported_systems
-        if unsupported_systems is None:
-            yield entity
-        elif current_system not in unsupported_systems:
-            yield entity
-
-
 class SolarfocusEntity(Entity):
     """Defines a base Solarfocus entity."""
 
-    _attr_should_poll = True
+    # The coordinator polls, for every entity of the entry at once, and tells
+    # each entity when there is something new for it. Polling an entity on its
+    # own timer on top of that only ever asked the coordinator for a refresh it
+    # was about to do anyway.
+    _attr_should_poll = False
     has_entity_name = True
 
+    # What every entity of the integration carries besides its description,
+    # held in slots rather than in the dict of each instance: an entry of four
+    # of everything builds hundreds of entities, on every reload. Home
+    # Assistant still gives each one a dict for everything it sets on it.
+    #
+    # `_bound_api` is the api `_bound_component` was looked up on, see `_bind`,
+    # and None until the entity first reads or writes.
+    __slots__ = ("coordinator", "_entry_id", "_bound_api", "_bound_component")
+
     entity_description: SolarfocusEntityDescription
 
     def __init__(
@@ -137,7 +150,8 @@ class SolarfocusEntity(Entity):
         """Initialize the Atag entity."""
         self.coordinator = coordinator
         self._entry_id = coordinator._entry.entry_id
-        self._state: str | None = None
+        self._bound_api: Any = None
+        self._bound_component: Any = None
         self.entity_description = description
 
     @property
@@ -162,8 +176,11 @@ class SolarfocusEntity(Entity):
 
         device_info = DeviceInfo(
             identifiers={
-                (DOMAIN, f"{self._entry_id}_{description.component_prefix}"
-                 f"{description.component_idx}")
+                (
+                    DOMAIN,
+                    f"{self._entry_id}_{description.component_prefix}"
+                    f"{description.component_idx}",
+                )
             },
             translation_key=device.translation_key,
             # Blank for the components that exist once, and for the single
@@ -234,7 +251,6 @@ class SolarfocusEntity(Entity):
     @override
     def translation_key(self) -> str:
         """Return a translation key to use for this entity."""
-        _LOGGER.debug("Translation_key - %s", self.entity_description.translation_key)
         return f"{self.entity_description.translation_key}"
 
     @property
@@ -258,85 +274,129 @@ class SolarfocusEntity(Entity):
 
         self._async_follow_the_poll()
 
+    @property
+    @override
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag a value that is from before the restart, until it is read again.
+
+        See `async_restore_snapshot` of the coordinator. Nothing otherwise, so
+        the attribute is gone for good once the first poll is through.
+        """
+        if self.coordinator.stale:
+            return {ATTR_RESTORED: True}
+        return None
+
     @callback
     def _async_follow_the_poll(self) -> None:
-        """Write this entity on every refresh of the coordinator.
+        """Write this entity whenever a refresh changes what it shows.
 
         Its own hook rather than the body of `async_added_to_hass`, so the one
         kind of entity that has nothing to hear from a poll can leave this out
         without cutting the chain of hooks Home Assistant itself hangs there.
         """
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_reader(
+                COMPONENT_DEVICES[self.entity_description.component_prefix].option,
+                self._component,
+                self.register_items,
+                self.async_write_ha_state,
+            )
         )
 
+    @property
+    def register_items(self) -> tuple[str, ...]:
+        """Return the values of its component this entity shows.
+
+        The one its description names, for every entity that shows a single
+        register. What is not in here is not read while this is the only
+        entity on the component that is shown.
+        """
+        return (self.entity_description.item,)
+
+    @property
+    def _component(self) -> Any:
+        """Return the pysolarfocus component this entity is on."""
+        if self._bound_api is not self.coordinator.api:
+            self._bind()
+        return self._bound_component
+
+    def _bind(self) -> None:
+        """Look up the component this entity is on, on the api of the coordinator.
+
+        The library builds its component objects, and the register objects on
+        them, once for the api they belong to, and a read only ever changes the
+        value a register holds. So what is looked up here holds for as long as
+        the coordinator keeps that api, and is only looked up again for another
+        one - rather than by name and position for every value on every state
+        write, which for an entry of hundreds of entities is most of a poll.
+        """
+        api = self.coordinator.api
+        description = self.entity_description
+        component = getattr(api, description.component)
+        if description.component_idx:
+            component = component[int(description.component_idx) - 1]
+        self._bound_api = api
+        self._bound_component = component
+
+    def _register(self, item: str) -> Any:
+        """Return one register of the component this entity is on.
+
+        Not kept by item on the entity: a register is an attribute of the
+        component, so looking it up there is the one lookup a dict of them
+        would take as well, without a dict for every entity to hold it.
+        """
+        return getattr(self._component, item)
+
     async def async_update(self) -> None:
-        """Update entity."""
+        """Ask the coordinator for a refresh, as `update_entity` does.
+
+        Never called by a timer, the entity is not polled. This is what the
+        service - and the refresh an automation or the UI asks for through it -
+        lands on, and a refresh of the coordinator is what it means: one entity
+        is read with its whole entry or not at all.
+        """
         await self.coordinator.async_request_refresh()
 
-    def _set_native_value(self, item: str, value: Any) -> None:
+    async def _async_set_native_value(
+        self, item: str, value: Any, *, side_effects: bool = False
+    ) -> None:
         """Write a value to one register of the component this entity is on."""
-        # The library builds its components at runtime, so what a component and
-        # its registers are is only known to it - `Any` is the honest type here.
-        component: Any
-        idx = -1
-
-        if self.entity_description.component_idx:
-            idx = int(self.entity_description.component_idx) - 1
-            component = getattr(
-                self.coordinator.api, self.entity_description.component
-            )[idx]
-        else:
-            component = getattr(self.coordinator.api, self.entity_description.component)
+        await self._async_set_native_values({item: value}, side_effects=side_effects)
+
+    async def _async_set_native_values(
+        self, values: dict[str, Any], *, side_effects: bool = False
+    ) -> None:
+        """Write values to registers of the component this entity is on, together.
+
+        The coordinator does the writing, and reads the component back once
+        after all of them - see `SolarfocusDataUpdateCoordinator.async_write`.
+
+        Only the registers written are read back, unless `side_effects` says
+        the write sets anything else of the component in motion: a mode that
+        changes the state the component reports, say. That is a question about
+        the write rather than the entity - a thermostat has a setpoint as well
+        as a mode, and a new setpoint changes nothing but itself.
+        """
         _LOGGER.debug(
-            "_set_native_value - idx: %s, component: %s, entity: %s",
-            idx,
+            "_async_set_native_values - component: %s, idx: %s, values: %s",
             self.entity_description.component,
-            item,
+            self.entity_description.component_idx,
+            values,
+        )
+        await self.coordinator.async_write(
+            self._component, values, side_effects=side_effects
         )
-        entity = getattr(component, item)
-        entity.set_unscaled_value(value)
-
-        raw_value = entity.value
-        if isinstance(raw_value, (int, float)) and raw_value < 0:
-            # Modbus transmits registers as unsigned words, negative values have
-            # to be written as two's complement (16 bit per register). The signed
-            # value is restored afterwards, reading the register turns it back
-            # into a signed one.
-            entity.value = raw_value + (1 << (16 * entity.count))
-            entity.commit()
-            entity.value = raw_value
-        else:
-            entity.commit()
-
-        component.update()
 
         self.async_write_ha_state()
 
     def _get_native_value(self, item: str) -> Any:
-        """Read the value of one register of the component this entity is on."""
-        component: Any
-        idx = -1
-
-        if self.entity_description.component_idx:
-            idx = int(self.entity_description.component_idx) - 1
-            component = getattr(
-                self.coordinator.api, self.entity_description.component
-            )[idx]
-        else:
-            component = getattr(self.coordinator.api, self.entity_description.component)
+        """Read the value of one register of the component this entity is on.
 
-        native_value = getattr(component, item).scaled_value
-
-        _LOGGER.debug(
-            "_get_native_value - idx: %s, component: %s, entity: %s, value: %s",
-            idx,
-            self.entity_description.component,
-            item,
-            native_value,
-        )
-
-        return native_value
+        Every state write of every entity goes through here, which is why there
+        is no logging in it: a debug line per value is hundreds of them a poll,
+        formatted or not, for values the diagnostics show all of at once.
+        """
+        return self._register(item).scaled_value
 
 
 class SolarfocusControllerEntity(SolarfocusEntity):
@@ -349,10 +409,6 @@ class SolarfocusControllerEntity(SolarfocusEntity):
     entity does with the coordinator applies to them.
     """
 
-    # There is nothing to poll: these follow the calendar and the user, not the
-    # heating system.
-    _attr_should_poll = False
-
     @property
     @override
     def available(self) -> bool:
@@ -0,0 +1,185 @@
+"""Keeping count of what reading each component of the heating system costs.
+
+A poll that takes longer than the interval it runs at is a poll that is always
+late, and the entry does not say why: it knows whether the last refresh worked
+and which components failed, not which of them took the time. On a controller
+that answers one range in 20 ms and another in two seconds, that is the
+difference between moving one component to the slow tier and turning the
+interval of all of them down.
+
+So every request the planner sends during a poll is timed, and the time goes to
+the components it read - shared out by how many of its registers each of them
+took, where the planner joined several into one request - and to the register
+range it asked for. A component read through the library's own calls is timed
+as a whole: what those send is not for the integration to see, beyond the
+request per register slice of the component the library sends them as.
+
+Per component and poll that is the read duration, the requests it took part in,
+the ones sent again on their own after a joined request failed (retries) and
+the ones that failed (errors). The durations of the last `HISTORY` polls are
+kept as well, for the histograms the diagnostics download carries.
+"""
+
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from pysolarfocus.components.base.enums import RegisterTypes
+
+# How many polls the rolling histograms cover.
+HISTORY = 120
+
+# The upper bounds of the histogram buckets, in milliseconds. A controller on
+# the local network answers in the first few; the last are what a poll that
+# overruns an interval of a few seconds is made of.
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+@dataclass(slots=True)
+class ReadStatistics:
+    """What reading one component, or one register range, cost on the last poll."""
+
+    duration: float = 0.0
+    transactions: int = 0
+    retries: int = 0
+    errors: int = 0
+    # Seconds per poll, oldest first.
+    history: deque[float] = field(default_factory=lambda: deque(maxlen=HISTORY))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the figures, and the histogram of the durations, in milliseconds."""
+        durations = [seconds * 1000 for seconds in self.history]
+        histogram = {f"<= {bound} ms": 0 for bound in BUCKETS_MS}
+        histogram[f"> {BUCKETS_MS[-1]} ms"] = 0
+        for duration in durations:
+            bucket = next(
+                (f"<= {bound} ms" for bound in BUCKETS_MS if duration <= bound),
+                f"> {BUCKETS_MS[-1]} ms",
+            )
+            histogram[bucket] += 1
+
+        return {
+            "duration_ms": round(self.duration * 1000, 1),
+            "transactions": self.transactions,
+            "retries": self.retries,
+            "errors": self.errors,
+            "polls": len(durations),
+            "max_ms": round(max(durations, default=0.0), 1),
+            "histogram": histogram,
+        }
+
+
+class PollInstrumentation:
+    """The read statistics of every component of one entry, and of every range.
+
+    Requests count between `start_poll` and `finish_poll` only: the read-back
+    after a write goes through the same planner, and is not what a poll costs.
+    """
+
+    def __init__(self) -> None:
+        """Start out knowing nothing."""
+        self._components: dict[Any, ReadStatistics] = {}
+        self._ranges: dict[tuple[RegisterTypes, int, int], ReadStatistics] = {}
+        # What the poll that is running has cost so far, by component and by
+        # range, or None between polls.
+        self._poll: dict[Any, ReadStatistics] | None = None
+
+    def start_poll(self) -> None:
+        """Count the requests from here on as the ones of a new poll."""
+        self._poll = {}
+
+    def finish_poll(self) -> None:
+        """Make what the poll cost the latest figures of what it read."""
+        poll, self._poll = self._poll, None
+        if poll is None:
+            return
+
+        for key, figures in poll.items():
+            known = self._ranges if isinstance(key, tuple) else self._components
+            if (statistics := known.get(key)) is None:
+                statistics = known[key] = ReadStatistics()
+            statistics.duration = figures.duration
+            statistics.transactions = figures.transactions
+            statistics.retries = figures.retries
+            statistics.errors = figures.errors
+            statistics.history.append(figures.duration)
+
+    def record_request(
+        self,
+        registers: tuple[RegisterTypes, int, int],
+        shares: Iterable[tuple[Any, int]],
+        duration: float,
+        *,
+        error: bool = False,
+        retry: bool = False,
+    ) -> None:
+        """Count one request of a poll, and the components it read.
+
+        `registers` is what it asked for - the type, the first address and the
+        count - and `shares` each component it read, with how many of those
+        registers were that component's.
+        """
+        if self._poll is None:
+            return
+
+        # Two slices of one component joined into the request are still one
+        # request that component took part in.
+        parts: dict[Any, int] = {}
+        for component, share in shares:
+            parts[component] = parts.get(component, 0) + share
+        total = sum(parts.values()) or 1
+        for key, part in (
+            (registers, duration),
+            *(
+                (component, duration * share / total)
+                for component, share in parts.items()
+            ),
+        ):
+            figures = self._poll.setdefault(key, ReadStatistics())
+            figures.duration += part
+            figures.transactions += 1
+            figures.retries += retry
+            figures.errors += error
+
+    def record_component(
+        self, component: Any, duration: float, *, transactions: int, error: bool
+    ) -> None:
+        """Count a component the library read, as one whole.
+
+        `transactions` is how many requests that took the library, which sends
+        one per register slice of the component - so the statistic compares
+        with what the planner needs for the same component.
+        """
+        if self._poll is None:
+            return
+
+        figures = self._poll.setdefault(component, ReadStatistics())
+        figures.duration += duration
+        figures.transactions += transactions
+        figures.errors += error
+
+    def component(self, component: Any) -> ReadStatistics | None:
+        """Return the statistics of one component, None if it was never read."""
+        return self._components.get(component)
+
+    def as_dict(self, names: Mapping[Any, str]) -> dict[str, Any]:
+        """Return every statistic, components by the names given for them.
+
+        The slowest range first, so the one to look at is at the top.
+        """
+        ranges = sorted(
+            self._ranges.items(), key=lambda item: item[1].duration, reverse=True
+        )
+        return {
+            "components": {
+                names.get(component, repr(component)): statistics.as_dict()
+                for component, statistics in self._components.items()
+            },
+            "ranges": {
+                f"{register_type.value.lower()} {address}-{address + count - 1}": (
+                    statistics.as_dict()
+                )
+                for (register_type, address, count), statistics in ranges
+            },
+        }
@@ -0,0 +1,364 @@
+"""Modbus TCP on the event loop, for the integration to read the controller with.
+
+pysolarfocus talks to the controller through a blocking pymodbus client, which
+is why every read used to be a job for the executor - one hand-off per
+configured component and refresh, and on an installation with several entries
+the shared executor pool is what the refreshes end up queueing for, not the
+controller.
+
+The same goes for writing: a write through the library blocks whoever calls
+it until the controller has answered, and on the event loop that is all of
+Home Assistant.
+
+What is here speaks the few requests the integration needs straight off an
+asyncio stream. The library is still what knows the registers: its components
+say which ranges to read and turn the words that come back into values, so an
+entity reads exactly what it read before, whichever of the two transports
+fetched it.
+
+Reads can also be pipelined: several requests sent before the first has been
+answered, each answer matched to its request by the transaction id the protocol
+has for it. What that saves is the round trips - the controller still answers
+one request after the other - so it is worth it on a link that is slow rather
+than a controller that is, and only on a controller that takes it at all.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator, Iterable
+import contextlib
+import logging
+import struct
+
+from pysolarfocus.components.base.enums import RegisterTypes
+from pysolarfocus.const import SLAVE_ID
+
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+# How long one request may take to be answered. A controller that is busy
+# answers in tens of milliseconds; one that has not answered in this long is
+# not going to.
+REQUEST_TIMEOUT = 5.0
+
+# How long opening the connection may take, for the same reason.
+CONNECT_TIMEOUT = 10.0
+
+# The function codes of the two reads, one per register type, and of the two
+# writes, which only holding registers take.
+READ_HOLDING_REGISTERS = 0x03
+READ_INPUT_REGISTERS = 0x04
+WRITE_SINGLE_REGISTER = 0x06
+WRITE_MULTIPLE_REGISTERS = 0x10
+
+# The exception a controller answers a request with that it has no time for
+# yet, which is one way of saying it does not take a second request before it
+# has answered the first.
+SERVER_DEVICE_BUSY = 0x06
+
+# Transaction id, protocol id, length, unit id.
+_MBAP_HEADER = struct.Struct(">HHHB")
+
+
+class ModbusError(HomeAssistantError):
+    """A request the controller did not answer, or answered with an exception."""
+
+
+class PipelineRejected(ModbusError):
+    """A controller that does not take a request before it answered the last.
+
+    Or a connection that went away while requests overlapped, which looks the
+    same from here: one that was dropped, or one that stopped answering.
+    """
+
+
+class PipelineBusy(PipelineRejected):
+    """A controller that answered an overlapping request "server device busy".
+
+    The one way of rejecting a pipeline that says so in as many words.
+    """
+
+
+class ModbusClient:
+    """One Modbus TCP connection to a controller, driven from the event loop.
+
+    One request is on the wire at a time, unless the reads are asked for through
+    `async_read_pipelined`: the controller answers them in the order they
+    arrive anyway, and a second request behind the first only gains anything
+    where it is the way there and back that takes the time.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        unit_id: int = SLAVE_ID,
+        timeout: float = REQUEST_TIMEOUT,
+    ) -> None:
+        """Set up a client for the controller at host:port, unconnected."""
+        self.host = host
+        self.port = port
+        self.unit_id = unit_id
+        self.timeout = timeout
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._transaction_id = 0
+        self._lock = asyncio.Lock()
+        # How many times the connection has been opened, so a caller can tell
+        # the connection it is on from the one it saw go wrong.
+        self.connects = 0
+
+    @property
+    def is_connected(self) -> bool:
+        """Return True while the connection is open."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def async_connect(self) -> bool:
+        """Open the connection, and return whether that worked.
+
+        A bool rather than an exception, like the `connect` of the library:
+        there is exactly one thing a caller does with a controller that is not
+        there, and that is to say so.
+        """
+        if self.is_connected:
+            return True
+
+        try:
+            async with asyncio.timeout(CONNECT_TIMEOUT):
+                self._reader, self._writer = await asyncio.open_connection(
+                    self.host, self.port
+                )
+        except (OSError, TimeoutError) as err:
+            _LOGGER.debug("Cannot connect to %s:%s: %s", self.host, self.port, err)
+            self._reader = self._writer = None
+            return False
+
+        self.connects += 1
+        return True
+
+    async def async_close(self) -> None:
+        """Close the connection, if there is one."""
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is None:
+            return
+
+        writer.close()
+        # Whatever the socket has to say on its way out, it is going.
+        with contextlib.suppress(OSError):
+            await writer.wait_closed()
+
+    async def async_read_registers(
+        self, register_type: RegisterTypes, address: int, count: int
+    ) -> list[int]:
+        """Read `count` registers of one type, starting at `address`."""
+        pdu = _read_pdu(register_type, address, count)
+        return _registers(await self._async_request(pdu), pdu, count)
+
+    async def async_read_pipelined(
+        self,
+        requests: Iterable[tuple[RegisterTypes, int, int]],
+        window: int,
+    ) -> AsyncGenerator[tuple[int, list[int] | ModbusError]]:
+        """Read several ranges with up to `window` requests on the wire at once.
+
+        Each range is the register type, the first address and the count, and
+        what comes back for it is yielded with its index among `requests` as
+        soon as it arrives: the registers, or the error it was answered with.
+        `requests` is only drawn from when there is room in the window, so
+        whatever decides whether a range is still worth asking for can look at
+        the clock.
+
+        A controller that does not take a second request before it has answered
+        the first says so in one of three ways: it answers "server device busy",
+        it never answers the second at all, or it closes the connection. Any of
+        those while more than one request is on the wire raises
+        `PipelineRejected` - `PipelineBusy` for the first, the only one that
+        cannot also be a connection that just went away. What was not answered
+        yet is the caller's to ask for again, and an answer that turns up for it
+        later is dropped like any other late one. With a single request on the
+        wire, each of them is an error of that request, as it would be for
+        `async_read_registers`.
+        """
+        ranges = enumerate(requests)
+        async with self._lock:
+            reader, writer = self._streams()
+            # The index, the request and the count of every request on the
+            # wire, by transaction id.
+            pending: dict[int, tuple[int, bytes, int]] = {}
+            drawn = False
+
+            while True:
+                while not drawn and len(pending) < window and self.is_connected:
+                    if (item := next(ranges, None)) is None:
+                        drawn = True
+                        break
+                    index, (register_type, address, count) = item
+                    pdu = _read_pdu(register_type, address, count)
+                    pending[self._send(writer, pdu)] = (index, pdu, count)
+                if not pending:
+                    return
+
+                overlapping = len(pending) > 1
+                try:
+                    transaction_id, response = await self._async_receive(
+                        reader, writer, pending
+                    )
+                except ModbusError as err:
+                    if overlapping:
+                        raise PipelineRejected(
+                            f"{self.host}:{self.port} does not take overlapping"
+                            f" requests: {err}"
+                        ) from err
+                    yield pending.popitem()[1][0], err
+                    continue
+
+                index, pdu, count = pending.pop(transaction_id)
+                busy = bytes((pdu[0] | 0x80, SERVER_DEVICE_BUSY))
+                if overlapping and response == busy:
+                    raise PipelineBusy(
+                        f"{self.host}:{self.port} is busy with the request before"
+                    )
+                try:
+                    words = _registers(_checked(pdu[0], response), pdu, count)
+                except ModbusError as err:
+                    yield index, err
+                else:
+                    yield index, words
+
+    async def async_write_registers(self, address: int, values: list[int]) -> None:
+        """Write unsigned words to holding registers, starting at `address`.
+
+        One register is written with the function meant for one, which every
+        controller takes; more than one in a single request, so that they
+        arrive together.
+        """
+        if len(values) == 1:
+            pdu = struct.pack(">BHH", WRITE_SINGLE_REGISTER, address, values[0])
+            expected = pdu
+        else:
+            count = len(values)
+            pdu = struct.pack(
+                f">BHHB{count}H",
+                WRITE_MULTIPLE_REGISTERS,
+                address,
+                count,
+                2 * count,
+                *values,
+            )
+            expected = pdu[:5]
+
+        # Either answer repeats what was written where, and how much of it.
+        if await self._async_request(pdu) != expected:
+            raise ModbusError(
+                f"Controller did not confirm writing {len(values)} registers"
+                f" at {address}"
+            )
+
+    async def _async_request(self, pdu: bytes) -> bytes:
+        """Send one request and return the response to it, function code first.
+
+        A response with another transaction id is one the controller sent too
+        late for the request it answers, which gave up on it - it is dropped and
+        the one this is waiting for is read after it.
+
+        A request the controller does not answer in time leaves the connection
+        as it was: nothing of an answer has been read, so whatever arrives for
+        it later is dropped like any other late response. Only a response cut
+        off half way through closes it, since there is no telling where the
+        next one starts after that.
+        """
+        async with self._lock:
+            reader, writer = self._streams()
+            transaction_id = self._send(writer, pdu)
+            _, response = await self._async_receive(reader, writer, {transaction_id})
+
+        return _checked(pdu[0], response)
+
+    def _streams(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Return the two ends of the connection, if it is open."""
+        reader, writer = self._reader, self._writer
+        if reader is None or writer is None or writer.is_closing():
+            raise ModbusError(f"Not connected to {self.host}:{self.port}")
+        return reader, writer
+
+    def _send(self, writer: asyncio.StreamWriter, pdu: bytes) -> int:
+        """Put one request on the wire, and return its transaction id."""
+        self._transaction_id = (self._transaction_id + 1) & 0xFFFF
+        writer.write(
+            _MBAP_HEADER.pack(self._transaction_id, 0, len(pdu) + 1, self.unit_id)
+            + pdu
+        )
+        return self._transaction_id
+
+    async def _async_receive(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        expected: Iterable[int],
+    ) -> tuple[int, bytes]:
+        """Return the next response to one of the `expected` transaction ids.
+
+        With its transaction id, and function code first. Within the timeout,
+        which starts over for every response a pipelined read waits for.
+        """
+        in_frame = False
+        try:
+            async with asyncio.timeout(self.timeout):
+                await writer.drain()
+
+                while True:
+                    header = await reader.readexactly(_MBAP_HEADER.size)
+                    in_frame = True
+                    received_id, _, length, _ = _MBAP_HEADER.unpack(header)
+                    response = await reader.readexactly(length - 1)
+                    in_frame = False
+                    if received_id in expected:
+                        return received_id, response
+        except TimeoutError as err:
+            if in_frame:
+                await self.async_close()
+            raise ModbusError(
+                f"No response from {self.host}:{self.port} within {self.timeout}s"
+            ) from err
+        except (OSError, asyncio.IncompleteReadError) as err:
+            await self.async_close()
+            raise ModbusError(
+                f"Connection to {self.host}:{self.port} lost: {err}"
+            ) from err
+
+
+def _read_pdu(register_type: RegisterTypes, address: int, count: int) -> bytes:
+    """Return the request reading `count` registers of one type from `address`."""
+    function_code = (
+        READ_INPUT_REGISTERS
+        if register_type == RegisterTypes.INPUT
+        else READ_HOLDING_REGISTERS
+    )
+    return struct.pack(">BHH", function_code, address, count)
+
+
+def _checked(function_code: int, response: bytes) -> bytes:
+    """Return a response to a function, unless it is an exception or another's."""
+    if response[0] == function_code | 0x80:
+        raise ModbusError(
+            f"Controller answered function {function_code} with exception"
+            f" {response[1] if len(response) > 1 else 'unknown'}"
+        )
+    if response[0] != function_code:
+        raise ModbusError(
+            f"Controller answered function {function_code} with {response[0]}"
+        )
+
+    return response
+
+
+def _registers(response: bytes, pdu: bytes, count: int) -> list[int]:
+    """Return the registers the response to a read request carries."""
+    # The function code, the byte count, and two bytes per register after it.
+    if len(response) != 2 + 2 * count or response[1] != 2 * count:
+        address = struct.unpack(">H", pdu[1:3])[0]
+        raise ModbusError(
+            f"Expected {count} registers from {address}, got {len(response)} bytes"
+        )
+
+    return list(struct.unpack(f">{count}H", response[2:]))
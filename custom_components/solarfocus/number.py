@@ -26,6 +26,7 @@ from .const import (
     HEATING_CIRCUIT_COMPONENT_PREFIX,
     PHOTOVOLTAIC_COMPONENT,
     PHOTOVOLTAIC_COMPONENT_PREFIX,
+    entry_capabilities,
 )
 from .coordinator import SolarfocusConfigEntry, SolarfocusDataUpdateCoordinator
 from .entity import (
@@ -33,7 +34,6 @@ from .entity import (
     SolarfocusEntity,
     SolarfocusEntityDescription,
     create_description,
-    filterVersionAndSystem,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -52,12 +52,13 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Solarfocus config entry."""
     coordinator = config_entry.runtime_data
+    capabilities = entry_capabilities(config_entry)
     # The controller has an entity of its own, which is not a number of a
     # component, so the list is of what they have in common.
     entities: list[SolarfocusEntity] = []
 
     for i in range(config_entry.options[CONF_HEATING_CIRCUIT]):
-        for description in HEATING_CIRCUIT_NUMBER_TYPES:
+        for description in capabilities.supported(HEATING_CIRCUIT_NUMBER_TYPES):
             _description = create_description(
                 HEATING_CIRCUIT_COMPONENT,
                 HEATING_CIRCUIT_COMPONENT_PREFIX,
@@ -69,7 +70,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     for i in range(config_entry.options[CONF_BOILER]):
-        for description in BOILER_NUMBER_TYPES:
+        for description in capabilities.supported(BOILER_NUMBER_TYPES):
             _description = create_description(
                 BOILER_COMPONENT,
                 BOILER_COMPONENT_PREFIX,
@@ -81,7 +82,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     if config_entry.options[CONF_PHOTOVOLTAIC]:
-        for description in PHOTOVOLTAIC_NUMBER_TYPES:
+        for description in capabilities.supported(PHOTOVOLTAIC_NUMBER_TYPES):
             _description = create_description(
                 PHOTOVOLTAIC_COMPONENT,
                 PHOTOVOLTAIC_COMPONENT_PREFIX,
@@ -99,7 +100,7 @@ async def async_setup_entry(
         SolarfocusDisplayedNumberEntity(coordinator, DISPLAYED_NUMBER_TYPE)
     )
 
-    async_add_entities(filterVersionAndSystem(config_entry, entities))
+    async_add_entities(entities)
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -126,9 +127,14 @@ class SolarfocusNumberEntity(SolarfocusEntity, NumberEntity):
 
     @override
     async def async_set_native_value(self, value: float) -> None:
-        """Update the current value."""
+        """Update the current value.
+
+        Only the latest of a run of them is written, see `async_write_latest` of
+        the coordinator: a number is a setpoint or a meter reading, and either is
+        set far more often than the controller needs to hear of it.
+        """
         number = self.entity_description.item
-        return self._set_native_value(number, value)
+        await self.coordinator.async_write_latest(self._component, number, value)
 
     @property
     @override
@@ -0,0 +1,601 @@
+"""Reading the registers of every configured component in as few requests as it takes.
+
+Left to itself, pysolarfocus reads a component slice by slice: the heating
+circuit alone takes four requests, and four buffers four more, each waiting for
+the controller to answer before the next one goes out. A controller that takes
+tens of milliseconds per answer turns that into most of the time a refresh
+takes.
+
+Most of those ranges sit close together - the instances of a component follow
+each other at a fixed stride, and the slices of one component are split around
+a register or two nobody reads. So the slices of every component are laid out
+by address and read in runs, each run one request of at most the 125 registers
+Modbus allows, and the words that come back are handed to the components they
+belong to.
+
+The library splits its slices where it does for a reason: a register the
+controller refuses to be read across. A run that covers one fails as a whole,
+so its slices are read one by one instead and the run is not tried again - what
+that costs is one refresh of extra requests, once.
+
+Nor does a slice have to be read whole. Given the registers somebody is
+actually shown, only the stretch of a slice from the first of them to the last
+is read - never more than the library would, so never across anything it does
+not read either - and a slice with none of them in it is not read at all.
+
+The requests of a poll can be pipelined, too - sent a few at a time without
+waiting for the answer to the one before, see `ModbusClient` - once a user
+has said how many. A controller that turns out not to take that is read one
+request at a time again from then on.
+
+Writes are joined the same way, only more strictly: a write request sets every
+register from its first address to its last, so registers are written together
+only where each starts right where the one before it ends.
+"""
+
+from collections import Counter
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    Mapping,
+)
+import contextlib
+from dataclasses import dataclass, field
+import itertools
+import logging
+import time
+from typing import Any
+
+from pysolarfocus.components.base.data_value import DataValue
+from pysolarfocus.components.base.enums import RegisterTypes
+from pysolarfocus.components.base.performance_calculator import PerformanceCalculator
+
+from .instrumentation import PollInstrumentation
+from .modbus import ModbusClient, ModbusError, PipelineBusy, PipelineRejected
+
+_LOGGER = logging.getLogger(__name__)
+
+# The most registers one read request may ask for, by the Modbus specification.
+MAX_READ_COUNT = 125
+
+# The most registers one write request may carry, by the Modbus specification.
+MAX_WRITE_COUNT = 123
+
+# The most registers nobody reads that a run may read over to reach the next
+# slice. Reading a register costs two bytes of an answer, starting a request
+# costs a round trip, so this is generous: it joins the buffers and the fresh
+# water modules up, which are 20 and 25 apart, and stops short of the 50 that
+# separate two heating circuits or two boilers.
+MAX_GAP = 32
+
+
+@dataclass(frozen=True, slots=True)
+class Span:
+    """A run of registers one component reads in one go - a slice of it."""
+
+    register_type: RegisterTypes
+    address: int
+    count: int
+    # The library builds its components at runtime, see `SolarfocusEntity`.
+    component: Any
+    # Where the run starts among the registers of its component.
+    offset: int
+
+    @property
+    def end(self) -> int:
+        """Return the address after the last register of the run."""
+        return self.address + self.count
+
+
+@dataclass(slots=True)
+class ReadRequest:
+    """One request to the controller, and the spans it reads."""
+
+    register_type: RegisterTypes
+    address: int
+    count: int
+    spans: list[Span] = field(default_factory=list)
+
+    @property
+    def end(self) -> int:
+        """Return the address after the last register the request reads."""
+        return self.address + self.count
+
+
+@dataclass(slots=True)
+class WriteRequest:
+    """One request writing adjacent holding registers, and the words for them."""
+
+    address: int
+    words: list[int]
+
+
+def item_registers(component: Any, items: Iterable[str]) -> set[DataValue]:
+    """Return the registers behind some values of one pysolarfocus component.
+
+    Most values are a register of their own. A few are worked out of two, like
+    the performance figures of the heat pump, and take both; one the component
+    does not have takes none.
+    """
+
+    def _registers(part: Any) -> Iterator[DataValue]:
+        if isinstance(part, DataValue):
+            yield part
+        elif isinstance(part, PerformanceCalculator):
+            yield from _registers(part.nominator)
+            yield from _registers(part.denominator)
+
+    return {
+        register
+        for item in items
+        for register in _registers(getattr(component, item, None))
+    }
+
+
+def component_registers(component: Any) -> list[DataValue]:
+    """Return every register of one pysolarfocus component, in no set order."""
+    return [
+        register
+        for register in vars(component).values()
+        if isinstance(register, DataValue)
+    ]
+
+
+def component_spans(
+    component: Any, registers: Collection[DataValue] | None = None
+) -> list[Span]:
+    """Return the spans of one pysolarfocus component, as the library slices it.
+
+    Every slice whole without `registers`, and with them only the part of each
+    slice from the first of them in it to the last.
+    """
+    spans: list[Span] = []
+    for register_type, present, slices in (
+        (RegisterTypes.INPUT, component.has_input_address, component.input_slices),
+        (
+            RegisterTypes.HOLDING,
+            component.has_holding_address,
+            component.holding_slices,
+        ),
+    ):
+        if not present:
+            continue
+        for register_slice in slices:
+            start = register_slice.relative_address
+            end = start + register_slice.count
+            if registers is not None:
+                wanted = [
+                    register
+                    for register in registers
+                    if register.register_type == register_type
+                    and start <= register.address < end
+                ]
+                if not wanted:
+                    continue
+                start = min(register.address for register in wanted)
+                end = max(register.address + register.count for register in wanted)
+            spans.append(
+                Span(
+                    register_type,
+                    register_slice.absolute_address
+                    + start
+                    - register_slice.relative_address,
+                    end - start,
+                    component,
+                    start,
+                )
+            )
+
+    return spans
+
+
+def plan_reads(
+    spans: Iterable[Span],
+    alone: Collection[Span] = (),
+    max_gap: int = MAX_GAP,
+    max_count: int = MAX_READ_COUNT,
+) -> list[ReadRequest]:
+    """Return the fewest requests that read every span.
+
+    Spans are joined into one request while they are of the same register type,
+    no more than `max_gap` registers apart, and the request stays within
+    `max_count` registers. A span in `alone` is read on its own whatever is
+    next to it.
+    """
+    requests: list[ReadRequest] = []
+    current: ReadRequest | None = None
+    current_alone = False
+
+    for span in sorted(spans, key=lambda span: (span.register_type.value, span.address)):
+        is_alone = span in alone
+        if (
+            current is not None
+            and not current_alone
+            and not is_alone
+            and span.register_type == current.register_type
+            and span.address - current.end <= max_gap
+            and max(span.end, current.end) - current.address <= max_count
+        ):
+            current.count = max(span.end, current.end) - current.address
+            current.spans.append(span)
+            continue
+
+        current = ReadRequest(span.register_type, span.address, span.count, [span])
+        current_alone = is_alone
+        requests.append(current)
+
+    return requests
+
+
+def plan_writes(
+    registers: Iterable[DataValue], max_count: int = MAX_WRITE_COUNT
+) -> list[WriteRequest]:
+    """Return the fewest requests that write the current values of these registers.
+
+    In the order of their addresses, and joined while there is no register in
+    between and the request stays within `max_count` registers.
+    """
+    requests: list[WriteRequest] = []
+    current: WriteRequest | None = None
+
+    for register in sorted(
+        registers, key=lambda register: register.get_absolute_address()
+    ):
+        address = register.get_absolute_address()
+        words = register_words(register)
+        if (
+            current is not None
+            and address == current.address + len(current.words)
+            and len(current.words) + len(words) <= max_count
+        ):
+            current.words.extend(words)
+            continue
+
+        current = WriteRequest(address, words)
+        requests.append(current)
+
+    return requests
+
+
+def register_words(register: DataValue) -> list[int]:
+    """Return the value of a register as the controller stores it.
+
+    Unsigned, so a negative value is its two's complement over every word the
+    register spans, and the high word first.
+    """
+    raw = int(register.value) & ((1 << 16 * register.count) - 1)
+    return [
+        (raw >> 16 * (register.count - 1 - index)) & 0xFFFF
+        for index in range(register.count)
+    ]
+
+
+class ReadPlanner:
+    """Read components in as few requests as they can be, for one controller.
+
+    What it learns about the controller is kept for as long as the entry is
+    loaded: the spans that have to be read on their own, and the plan for each
+    set of components and registers asked for, which does not change between
+    refreshes.
+
+    Every request it sends is timed, and counted by the instrumentation it is
+    given, if any.
+
+    With a `window` of more than one, that many requests are on the wire at
+    once. A controller that answers that "server device busy" takes it back
+    down to one for as long as the planner is around. A connection that is
+    dropped or stops answering while requests overlap only takes it down until
+    the connection has been opened again: that is as likely to be a controller
+    rebooting or the network going away for a moment as a controller that does
+    not take a second request.
+    """
+
+    def __init__(
+        self, instrumentation: PollInstrumentation | None = None, window: int = 1
+    ) -> None:
+        """Start out joining every span that can be."""
+        self._alone: set[Span] = set()
+        self._plans: dict[frozenset[Any], list[ReadRequest]] = {}
+        self._instrumentation = instrumentation
+        self.window = window
+        # The `connects` of the client on the connection a pipeline went wrong
+        # on, which is read one request at a time for as long as it is open.
+        self._unpipelined: int | None = None
+
+    def plan(
+        self,
+        components: Collection[Any],
+        registers: Mapping[Any, Collection[DataValue]] | None = None,
+    ) -> list[ReadRequest]:
+        """Return the requests that read these components.
+
+        All of each without `registers`, and with them only what they list for
+        it - see `component_spans`.
+        """
+        wanted = {
+            component: (
+                None if registers is None else frozenset(registers.get(component, ()))
+            )
+            for component in components
+        }
+        key = frozenset(wanted.items())
+        if (plan := self._plans.get(key)) is None:
+            plan = self._plans[key] = plan_reads(
+                (
+                    span
+                    for component, values in wanted.items()
+                    for span in component_spans(component, values)
+                ),
+                self._alone,
+            )
+        return plan
+
+    async def async_read(
+        self,
+        client: ModbusClient,
+        components: Collection[Any],
+        registers: Mapping[Any, Collection[DataValue]] | None = None,
+        *,
+        deadline: float | None = None,
+        first: Collection[Any] = (),
+        unreached: set[Any] | None = None,
+        on_read: Callable[[Any], None] | None = None,
+    ) -> set[Any]:
+        """Read these components over the client, and return those that failed.
+
+        A component is parsed once every one of its spans has been read, and not
+        at all otherwise: half of a component read is a component that could not
+        be read. Once the connection is gone, nothing after it is asked for.
+
+        A register left out by `registers` keeps the value it had: the library
+        parses a component whole, so it is handed what it last parsed for it.
+
+        With a `deadline`, on the clock of `time.monotonic`, no request goes out
+        once it has passed, bar the first - so every call gets somewhere. The
+        components that were not read for it are neither parsed nor failed, but
+        added to `unreached`. The requests that read any of the components in
+        `first` go out before the rest, which is how those left unreached by
+        one call are read first by the next.
+
+        Each component is parsed as soon as its last span is in, rather than
+        once the last request of the call is, and handed to `on_read` then: the
+        values of a component read early are not held back for every request
+        that comes after it.
+
+        A request that fails with more than one span in it has its spans read
+        one by one once the others have been sent, rather than right away: a
+        pipelined read has the connection until its last answer is in.
+        """
+        buffers: dict[tuple[Any, RegisterTypes], list[int | None]] = {}
+        failed: set[Any] = set()
+        skipped: set[Any] = set()
+
+        plan = self.plan(components, registers)
+        if first:
+            plan = sorted(
+                plan,
+                key=lambda request: not any(
+                    span.component in first for span in request.spans
+                ),
+            )
+        # The spans of each component still to be read.
+        remaining = Counter(
+            span.component for request in plan for span in request.spans
+        )
+
+        def _read(span: Span) -> None:
+            """Count a span in, and parse its component if it was the last."""
+            component = span.component
+            remaining[component] -= 1
+            if remaining[component] or component in failed:
+                return
+            if not _parse(component, buffers):
+                failed.add(component)
+            elif on_read is not None:
+                on_read(component)
+
+        def _due() -> Iterator[ReadRequest]:
+            """Yield the requests still to be sent when it is their turn."""
+            for sent, request in enumerate(plan):
+                if not client.is_connected:
+                    failed.update(span.component for span in request.spans)
+                elif deadline is not None and sent and time.monotonic() >= deadline:
+                    skipped.update(span.component for span in request.spans)
+                else:
+                    yield request
+
+        alone: list[ReadRequest] = []
+        async for request, start, result in self._async_send(client, _due()):
+            if isinstance(result, ModbusError):
+                self._record(request.spans, request, start, error=True)
+                _LOGGER.debug(
+                    "Cannot read %s registers %s-%s: %s",
+                    request.register_type.value.lower(),
+                    request.address,
+                    request.end - 1,
+                    result,
+                )
+                if len(request.spans) == 1 or not client.is_connected:
+                    failed.update(span.component for span in request.spans)
+                else:
+                    alone.append(request)
+                continue
+
+            self._record(request.spans, request, start)
+            for span in request.spans:
+                start = span.address - request.address
+                _store(buffers, span, result[start : start + span.count])
+                _read(span)
+
+        for request in alone:
+            for span in await self._async_read_alone(client, request, buffers, failed):
+                _read(span)
+
+        skipped -= failed
+        if unreached is not None:
+            unreached |= skipped
+
+        return failed
+
+    async def _async_send(
+        self, client: ModbusClient, requests: Iterator[ReadRequest]
+    ) -> AsyncIterator[tuple[ReadRequest, float, list[int] | ModbusError]]:
+        """Send each request, and yield what it was answered with as it comes in.
+
+        With when it was sent, for the instrumentation. Pipelined while the
+        window allows it, and one after the other from the first request the
+        controller rejected that on: the ones it left unanswered are sent again,
+        and then the rest.
+        """
+        sent: list[tuple[ReadRequest, float]] = []
+        answered: set[int] = set()
+
+        def _drawn() -> Iterator[tuple[RegisterTypes, int, int]]:
+            for request in requests:
+                sent.append((request, time.monotonic()))
+                yield request.register_type, request.address, request.count
+
+        if self.window > 1 and self._unpipelined != client.connects:
+            try:
+                async with contextlib.aclosing(
+                    client.async_read_pipelined(_drawn(), self.window)
+                ) as answers:
+                    async for index, result in answers:
+                        answered.add(index)
+                        yield *sent[index], result
+            except PipelineBusy as err:
+                _LOGGER.warning("%s; reading one request at a time from now on", err)
+                self.window = 1
+            except PipelineRejected as err:
+                _LOGGER.warning(
+                    "%s; reading one request at a time until it reconnects", err
+                )
+                self._unpipelined = client.connects
+
+        unanswered = [
+            request for index, (request, _) in enumerate(sent) if index not in answered
+        ]
+        for request in itertools.chain(unanswered, requests):
+            start = time.monotonic()
+            try:
+                words = await client.async_read_registers(
+                    request.register_type, request.address, request.count
+                )
+            except ModbusError as err:
+                yield request, start, err
+            else:
+                yield request, start, words
+
+    async def _async_read_alone(
+        self,
+        client: ModbusClient,
+        request: ReadRequest,
+        buffers: dict[tuple[Any, RegisterTypes], list[int | None]],
+        failed: set[Any],
+    ) -> list[Span]:
+        """Read the spans of a request that failed one by one, return the read.
+
+        A span that reads fine on its own is one the run was failing for
+        somebody else: a register in between the controller refuses, or a
+        neighbour that is not installed. It is read on its own from then on, so
+        a component that does not answer cannot take the ones next to it down
+        with it on every refresh.
+        """
+        read: list[Span] = []
+        for span in request.spans:
+            if not client.is_connected:
+                failed.add(span.component)
+                continue
+            start = time.monotonic()
+            try:
+                words = await client.async_read_registers(
+                    span.register_type, span.address, span.count
+                )
+            except ModbusError:
+                self._record((span,), span, start, error=True, retry=True)
+                failed.add(span.component)
+                continue
+
+            self._record((span,), span, start, retry=True)
+            _store(buffers, span, words)
+            read.append(span)
+            self._alone.add(span)
+            self._plans.clear()
+
+        return read
+
+    def _record(
+        self,
+        spans: Iterable[Span],
+        request: ReadRequest | Span,
+        start: float,
+        *,
+        error: bool = False,
+        retry: bool = False,
+    ) -> None:
+        """Count a request that started at `start` and has just ended."""
+        if self._instrumentation is None:
+            return
+        self._instrumentation.record_request(
+            (request.register_type, request.address, request.count),
+            ((span.component, span.count) for span in spans),
+            time.monotonic() - start,
+            error=error,
+            retry=retry,
+        )
+
+
+def _store(
+    buffers: dict[tuple[Any, RegisterTypes], list[int | None]],
+    span: Span,
+    words: list[int],
+) -> None:
+    """Put the words of one span where its component will parse them from."""
+    component = span.component
+    key = (component, span.register_type)
+    if (registers := buffers.get(key)) is None:
+        count = (
+            component.input_count
+            if span.register_type == RegisterTypes.INPUT
+            else component.holding_count
+        )
+        registers = buffers[key] = [None] * count
+
+    registers[span.offset : span.offset + span.count] = words
+
+
+def _parse(
+    component: Any, buffers: dict[tuple[Any, RegisterTypes], list[int | None]]
+) -> bool:
+    """Hand a component the words read for it, return whether it took them."""
+    for register_type in (RegisterTypes.INPUT, RegisterTypes.HOLDING):
+        buffer = buffers.get((component, register_type))
+        if buffer is None:
+            continue
+        _keep_unread(component, register_type, buffer)
+        # pylint: disable-next=protected-access
+        if not component._parse(buffer, register_type):
+            return False
+    return True
+
+
+def _keep_unread(
+    component: Any, register_type: RegisterTypes, words: list[int | None]
+) -> None:
+    """Put back the words of the registers of one component that were not read.
+
+    As the controller would have sent them, so that parsing them gives back the
+    values they had: unsigned, and the high word first.
+    """
+    for register in component_registers(component):
+        if (
+            register.register_type != register_type
+            or words[register.address] is not None
+        ):
+            continue
+        words[register.address : register.address + register.count] = register_words(
+            register
+        )
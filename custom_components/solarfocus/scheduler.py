@@ -0,0 +1,77 @@
+"""Taking turns on the one connection an entry has to its controller.
+
+A poll and a write used to go out whenever they were asked for: the poll from
+the coordinator's refresh, a write from whichever entity was set. Each of them
+is several requests - a poll one per planned read, a write its requests and the
+read-back after them - and through the library they are executor jobs, which
+run side by side on the same pymodbus client. Two of those interleaving on one
+socket is one of them reading the other's answer, and a component that read
+fine a second ago failing for it, with the reconnect and the wasted poll that
+come after.
+
+So every exchange with the controller is a transaction here, and one is
+running at a time. Whoever is waiting when it ends goes next, writes before
+reads: a write is somebody waiting for the heating to do something, a poll is
+the same values as a few seconds ago, give or take, and it can wait for the
+write to be read back.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from enum import IntEnum
+import heapq
+import itertools
+
+
+class Priority(IntEnum):
+    """Which transaction goes first, lowest first."""
+
+    WRITE = 0
+    READ = 1
+
+
+class TransactionScheduler:
+    """One transaction with the controller at a time, the most urgent next."""
+
+    def __init__(self) -> None:
+        """Start out idle, with nobody waiting."""
+        self._busy = False
+        # Priority, then order of arrival, then the future that lets it in.
+        self._waiting: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._arrivals = itertools.count()
+
+    @asynccontextmanager
+    async def transaction(self, priority: Priority) -> AsyncIterator[None]:
+        """Wait for the turn of a transaction, and hold it until the block ends."""
+        await self._async_acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _async_acquire(self, priority: Priority) -> None:
+        """Return once it is this transaction's turn."""
+        if not self._busy and not self._waiting:
+            self._busy = True
+            return
+
+        turn: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._arrivals), turn))
+        try:
+            await turn
+        except asyncio.CancelledError:
+            # Handed the turn just as it gave up waiting: pass it on, or nobody
+            # would ever get it.
+            if turn.done() and not turn.cancelled():
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Hand the turn to the most urgent transaction waiting, if any."""
+        while self._waiting:
+            _, _, turn = heapq.heappop(self._waiting)
+            if not turn.done():
+                turn.set_result(None)
+                return
+        self._busy = False
@@ -21,14 +21,10 @@ from .const import (
     HEAT_PUMP_COMPONENT_PREFIX,
     HEATING_CIRCUIT_COMPONENT,
     HEATING_CIRCUIT_COMPONENT_PREFIX,
+    entry_capabilities,
 )
 from .coordinator import SolarfocusConfigEntry, SolarfocusDataUpdateCoordinator
-from .entity import (
-    SolarfocusEntity,
-    SolarfocusEntityDescription,
-    create_description,
-    filterVersionAndSystem,
-)
+from .entity import SolarfocusEntity, SolarfocusEntityDescription, create_description
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,10 +42,11 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Solarfocus config entry."""
     coordinator = config_entry.runtime_data
+    capabilities = entry_capabilities(config_entry)
     entities = []
 
     for i in range(config_entry.options[CONF_HEATING_CIRCUIT]):
-        for description in HEATING_CIRCUIT_SELECT_TYPES:
+        for description in capabilities.supported(HEATING_CIRCUIT_SELECT_TYPES):
             _description = create_description(
                 HEATING_CIRCUIT_COMPONENT,
                 HEATING_CIRCUIT_COMPONENT_PREFIX,
@@ -61,7 +58,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     for i in range(config_entry.options[CONF_BOILER]):
-        for description in BOILER_SELECT_TYPES:
+        for description in capabilities.supported(BOILER_SELECT_TYPES):
             _description = create_description(
                 BOILER_COMPONENT,
                 BOILER_COMPONENT_PREFIX,
@@ -73,7 +70,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     if config_entry.options[CONF_HEATPUMP]:
-        for description in HEATPUMP_SELECT_TYPES:
+        for description in capabilities.supported(HEATPUMP_SELECT_TYPES):
             _description = create_description(
                 HEAT_PUMP_COMPONENT,
                 HEAT_PUMP_COMPONENT_PREFIX,
@@ -84,7 +81,7 @@ async def async_setup_entry(
             entity = SolarfocusSelectEntity(coordinator, _description)
             entities.append(entity)
 
-    async_add_entities(filterVersionAndSystem(config_entry, entities))
+    async_add_entities(entities)
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -120,7 +117,8 @@ class SolarfocusSelectEntity(SolarfocusEntity, SelectEntity):
         """Update the current selected option."""
         self._attr_current_option = option
         select = self.entity_description.item
-        return self._set_native_value(select, option)
+        # Every select is a mode of its component, and so is what it is doing
+        await self._async_set_native_value(select, option, side_effects=True)
 
     @property
     @override
@@ -21,6 +21,7 @@ from homeassistant.const import (
     UnitOfMass,
     UnitOfPower,
     UnitOfTemperature,
+    UnitOfTime,
     UnitOfVolume,
     UnitOfVolumeFlowRate,
 )
@@ -40,6 +41,7 @@ from .const import (
     BUFFER_COMPONENT_PREFIX,
     CIRCULATION_COMPONENT,
     CIRCULATION_COMPONENT_PREFIX,
+    COMPONENT_PREFIXES,
     CONF_BIOMASS_BOILER,
     CONF_BOILER,
     CONF_BUFFER,
@@ -60,19 +62,24 @@ from .const import (
     HEATING_CIRCUIT_COMPONENT_PREFIX,
     PHOTOVOLTAIC_COMPONENT,
     PHOTOVOLTAIC_COMPONENT_PREFIX,
+    SINGLE_COMPONENTS,
     SOLAR_COMPONENT,
     SOLAR_COMPONENT_PREFIX,
     component_count,
+    entry_capabilities,
     solar_count,
 )
-from .coordinator import SolarfocusConfigEntry, SolarfocusDataUpdateCoordinator
+from .coordinator import (
+    COMPONENT_ATTRIBUTES,
+    SolarfocusConfigEntry,
+    SolarfocusDataUpdateCoordinator,
+)
 from .entity import (
     SolarfocusControllerEntity,
     SolarfocusEntity,
     SolarfocusEntityDescription,
     create_description,
     every_system_but,
-    filterVersionAndSystem,
 )
 from .service_menu import installer_code, service_code
 
@@ -101,6 +108,7 @@ async def async_setup_entry(
 ) -> None:
     """Initialize sensor platform from config entry."""
     coordinator = config_entry.runtime_data
+    capabilities = entry_capabilities(config_entry)
     # The controller has entities of its own, which are not sensors of a
     # component, so the list is of what they have in common.
     entities: list[SolarfocusEntity] = []
@@ -109,7 +117,7 @@ async def async_setup_entry(
     _LOGGER.debug("Sensor async_setup_entry: %s", config_entry.options)
 
     for i in range(config_entry.options[CONF_HEATING_CIRCUIT]):
-        for description in HEATING_CIRCUIT_SENSOR_TYPES:
+        for description in capabilities.supported(HEATING_CIRCUIT_SENSOR_TYPES):
             _description = create_description(
                 HEATING_CIRCUIT_COMPONENT,
                 HEATING_CIRCUIT_COMPONENT_PREFIX,
@@ -121,7 +129,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     for i in range(config_entry.options[CONF_BOILER]):
-        for description in BOILER_SENSOR_TYPES:
+        for description in capabilities.supported(BOILER_SENSOR_TYPES):
             _description = create_description(
                 BOILER_COMPONENT,
                 BOILER_COMPONENT_PREFIX,
@@ -133,7 +141,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     for i in range(config_entry.options[CONF_BUFFER]):
-        for description in BUFFER_SENSOR_TYPES:
+        for description in capabilities.supported(BUFFER_SENSOR_TYPES):
             _description = create_description(
                 BUFFER_COMPONENT,
                 BUFFER_COMPONENT_PREFIX,
@@ -145,7 +153,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     if config_entry.options[CONF_HEATPUMP]:
-        for description in HEATPUMP_SENSOR_TYPES:
+        for description in capabilities.supported(HEATPUMP_SENSOR_TYPES):
             _description = create_description(
                 HEAT_PUMP_COMPONENT,
                 HEAT_PUMP_COMPONENT_PREFIX,
@@ -157,7 +165,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     if config_entry.options[CONF_BIOMASS_BOILER]:
-        for description in BIOMASS_BOILER_SENSOR_TYPES:
+        for description in capabilities.supported(BIOMASS_BOILER_SENSOR_TYPES):
             _description = create_description(
                 BIOMASS_BOILER_COMPONENT,
                 BIOMASS_BOILER_COMPONENT_PREFIX,
@@ -169,7 +177,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     if config_entry.options[CONF_PHOTOVOLTAIC]:
-        for description in PHOTOVOLTAIC_SENSOR_TYPES:
+        for description in capabilities.supported(PHOTOVOLTAIC_SENSOR_TYPES):
             _description = create_description(
                 PHOTOVOLTAIC_COMPONENT,
                 PHOTOVOLTAIC_COMPONENT_PREFIX,
@@ -185,7 +193,7 @@ async def async_setup_entry(
         count = solar_count(config_entry)
 
         for i in range(count):
-            for description in SOLAR_SENSOR_TYPES:
+            for description in capabilities.supported(SOLAR_SENSOR_TYPES):
                 # Always use index since solar is now always a list in pysolarfocus
                 # But for single instance, don't show the number in the entity name
                 idx = str(i + 1)
@@ -210,7 +218,7 @@ async def async_setup_entry(
                 entities.append(entity)
 
     for i in range(config_entry.options[CONF_FRESH_WATER_MODULE]):
-        for description in FRESH_WATER_MODULE_SENSOR_TYPES:
+        for description in capabilities.supported(FRESH_WATER_MODULE_SENSOR_TYPES):
             _description = create_description(
                 FRESH_WATER_MODULE_COMPONENT,
                 FRESH_WATER_MODULE_COMPONENT_PREFIX,
@@ -222,7 +230,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     for i in range(component_count(config_entry, CONF_CIRCULATION)):
-        for description in CIRCULATION_SENSOR_TYPES:
+        for description in capabilities.supported(CIRCULATION_SENSOR_TYPES):
             _description = create_description(
                 CIRCULATION_COMPONENT,
                 CIRCULATION_COMPONENT_PREFIX,
@@ -234,7 +242,7 @@ async def async_setup_entry(
             entities.append(entity)
 
     for i in range(component_count(config_entry, CONF_DIFFERENTIAL_MODULE)):
-        for description in DIFFERENTIAL_MODULE_SENSOR_TYPES:
+        for description in capabilities.supported(DIFFERENTIAL_MODULE_SENSOR_TYPES):
             _description = create_description(
                 DIFFERENTIAL_MODULE_COMPONENT,
                 DIFFERENTIAL_MODULE_COMPONENT_PREFIX,
@@ -247,13 +255,64 @@ async def async_setup_entry(
 
     # The controller is a device of its own, and the service menu codes are on
     # it: they are arithmetic rather than a reading of any component, so they
-    # exist whatever the entry has configured.
-    entities.append(SolarfocusServiceCodeSensor(coordinator, SERVICE_CODE_SENSOR_TYPE))
-    entities.append(
-        SolarfocusInstallerCodeSensor(coordinator, INSTALLER_CODE_SENSOR_TYPE)
-    )
+    # exist whatever the entry has configured - on any api version its
+    # descriptions are there on.
+    if capabilities.supports(SERVICE_CODE_SENSOR_TYPE):
+        entities.append(
+            SolarfocusServiceCodeSensor(coordinator, SERVICE_CODE_SENSOR_TYPE)
+        )
+    if capabilities.supports(INSTALLER_CODE_SENSOR_TYPE):
+        entities.append(
+            SolarfocusInstallerCodeSensor(coordinator, INSTALLER_CODE_SENSOR_TYPE)
+        )
+
+    entities.extend(read_statistics_sensors(coordinator, config_entry))
+
+    async_add_entities(entities)
+
+
+def read_statistics_sensors(
+    coordinator: SolarfocusDataUpdateCoordinator, entry: SolarfocusConfigEntry
+) -> list["SolarfocusReadStatisticsSensor"]:
+    """Return the read statistics of every component device the entry configures.
+
+    Built off the counts the devices of the entry are expected by - see
+    `component_device_identifiers` - rather than off the sensors, so that a
+    component shown by numbers, selects or switches alone gets its statistics
+    as well: it is read all the same. Each sits on the device, under the key,
+    that the entities of its component do.
+    """
+    statistics: list[SolarfocusReadStatisticsSensor] = []
+    for option, component in COMPONENT_ATTRIBUTES.items():
+        prefix = COMPONENT_PREFIXES[option]
+        if option == CONF_SOLAR:
+            count = solar_count(entry)
+        else:
+            count = component_count(entry, option)
+        # A single solar circuit keeps the unnumbered name and key the solar
+        # sensors above keep, and the library still addresses it by its index.
+        unnumbered = option == CONF_SOLAR and count == 1
+        for index in range(count):
+            idx = "" if option in SINGLE_COMPONENTS else str(index + 1)
+            shown_idx = "" if unnumbered else idx
+            statistics.extend(
+                SolarfocusReadStatisticsSensor(
+                    coordinator,
+                    replace(
+                        statistic,
+                        item=statistic.key,
+                        component=component,
+                        component_prefix=prefix,
+                        component_idx=idx,
+                        device_idx=f" {shown_idx}" if shown_idx else "",
+                        object_id_name=statistic.key.replace("_", " "),
+                        key=f"{prefix}{shown_idx}_{statistic.key}",
+                    ),
+                )
+                for statistic in READ_STATISTICS_SENSOR_TYPES
+            )
 
-    async_add_entities(filterVersionAndSystem(config_entry, entities))
+    return statistics
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -368,6 +427,53 @@ class SolarfocusInstallerCodeSensor(SolarfocusControllerSensor):
         return installer_code(displayed, dt_util.now())
 
 
+class SolarfocusReadStatisticsSensor(SolarfocusEntity, SensorEntity):
+    """What reading the component this sits on cost on the last poll.
+
+    One of `read_statistics` of the coordinator rather than a register, so it
+    asks for no registers to be read either: it is written after every refresh,
+    and does not keep anything on the controller polled that nothing else
+    shows.
+    """
+
+    entity_description: SolarfocusSensorEntityDescription
+
+    @property
+    @override
+    def available(self) -> bool:
+        """Return True, most of all while the component cannot be read.
+
+        The errors that go with a component failing are the point of these.
+        """
+        return True
+
+    @property
+    @override
+    def native_value(self) -> StateType:
+        """Return the statistic, unknown until the component has been polled."""
+        statistics = self.coordinator.read_statistics.component(self._component)
+        if statistics is None:
+            return None
+        return cast(
+            StateType,
+            getattr(statistics, self.entity_description.item.removeprefix("read_")),
+        )
+
+    @property
+    @override
+    def extra_state_attributes(self) -> None:
+        """Return nothing - the statistics of a previous run are not restored."""
+        return None
+
+    @callback
+    @override
+    def _async_follow_the_poll(self) -> None:
+        """Write this entity after every refresh, as a plain listener."""
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self.async_write_ha_state)
+        )
+
+
 # The two entities of this integration that read no register, so they name no
 # component and carry no `item` - `native_value` computes them. Diagnostic: they
 # say something about the controller rather than about the heating.
@@ -390,6 +496,33 @@ INSTALLER_CODE_SENSOR_TYPE = SolarfocusSensorEntityDescription(
     entity_registry_enabled_default=False,
 )
 
+# What reading a component costs, on every component device - see
+# `PollInstrumentation`. Off by default and diagnostic: they are for finding
+# the component that makes the poll slow, not for the dashboard.
+READ_STATISTICS_SENSOR_TYPES = [
+    SolarfocusSensorEntityDescription(
+        key="read_duration",
+        translation_key="read_duration",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    *(
+        SolarfocusSensorEntityDescription(
+            key=key,
+            translation_key=key,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        )
+        for key in ("read_transactions", "read_retries", "read_errors")
+    ),
+]
+
 
 HEATING_CIRCUIT_SENSOR_TYPES = [
     SolarfocusSensorEntityDescription(
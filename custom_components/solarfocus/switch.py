@@ -12,14 +12,14 @@ from homeassistant.components.switch import (
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import CONF_HEATPUMP, HEAT_PUMP_COMPONENT, HEAT_PUMP_COMPONENT_PREFIX
-from .coordinator import SolarfocusConfigEntry, SolarfocusDataUpdateCoordinator
-from .entity import (
-    SolarfocusEntity,
-    SolarfocusEntityDescription,
-    create_description,
-    filterVersionAndSystem,
+from .const import (
+    CONF_HEATPUMP,
+    HEAT_PUMP_COMPONENT,
+    HEAT_PUMP_COMPONENT_PREFIX,
+    entry_capabilities,
 )
+from .coordinator import SolarfocusConfigEntry, SolarfocusDataUpdateCoordinator
+from .entity import SolarfocusEntity, SolarfocusEntityDescription, create_description
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,10 +40,11 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Solarfocus config entry."""
     coordinator = config_entry.runtime_data
+    capabilities = entry_capabilities(config_entry)
     entities = []
 
     if config_entry.options[CONF_HEATPUMP]:
-        for description in HEATPUMP_SWITCH_TYPES:
+        for description in capabilities.supported(HEATPUMP_SWITCH_TYPES):
             _description = create_description(
                 HEAT_PUMP_COMPONENT,
                 HEAT_PUMP_COMPONENT_PREFIX,
@@ -54,7 +55,7 @@ async def async_setup_entry(
             entity = SolarfocusSwitchEntity(coordinator, _description)
             entities.append(entity)
 
-    async_add_entities(filterVersionAndSystem(config_entry, entities))
+    async_add_entities(entities)
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -93,13 +94,14 @@ class SolarfocusSwitchEntity(SolarfocusEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
         switch = self.entity_description.item
-        return self._set_native_value(switch, ON)
+        # The EVU lock stops the heat pump
+        await self._async_set_native_value(switch, ON, side_effects=True)
 
     @override
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
         switch = self.entity_description.item
-        return self._set_native_value(switch, OFF)
+        await self._async_set_native_value(switch, OFF, side_effects=True)
 
 
 HEATPUMP_SWITCH_TYPES = [
@@ -110,6 +110,12 @@ class SolarfocusWaterHeaterEntity(SolarfocusEntity, WaterHeaterEntity):
         """Initialize the Solarfocus select entity."""
         super().__init__(coordinator, description)
 
+    @property
+    @override
+    def register_items(self) -> tuple[str, ...]:
+        """Return the values of the boiler the water heater is made of."""
+        return ("temperature", "target_temperature", "mode")
+
     @property
     @override
     def operation_list(self) -> list[str]:
@@ -138,9 +144,7 @@ class SolarfocusWaterHeaterEntity(SolarfocusEntity, WaterHeaterEntity):
     @override
     def current_operation(self) -> str | None:
         """Return current operation ie. heat, cool, idle."""
-        mode = self._get_native_value("mode")
-        _LOGGER.debug("Current_operation: %s", mode)
-        return SOLARFOCUS_TO_HA_MODE.get(mode)
+        return SOLARFOCUS_TO_HA_MODE.get(self._get_native_value("mode"))
 
     @property
     @override
@@ -164,14 +168,17 @@ class SolarfocusWaterHeaterEntity(SolarfocusEntity, WaterHeaterEntity):
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperature."""
         if (temp := kwargs.get(ATTR_TEMPERATURE)) is not None:
-            self._set_native_value("target_temperature", temp)
+            await self._async_set_native_value("target_temperature", temp)
             _LOGGER.debug("Set Temperature: %s", temp)
 
     @override
     async def async_set_operation_mode(self, operation_mode: str) -> None:
         """Set new target temperature."""
         mapped_mode = HA_MODE_TO_SOLARFOCUS.get(operation_mode)
-        self._set_native_value("holding_mode", mapped_mode)
+        # The operation mode decides whether the boiler is charged at all
+        await self._async_set_native_value(
+            "holding_mode", mapped_mode, side_effects=True
+        )
         _LOGGER.debug(
             "Set Operation Mode: %s (mapped to: %s)", operation_mode, mapped_mode
         )
@@ -179,13 +186,17 @@ class SolarfocusWaterHeaterEntity(SolarfocusEntity, WaterHeaterEntity):
     @override
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn water heater on."""
-        self._set_native_value("holding_mode", SOLARFOCUS_MODE_ALWAYS_ON)
+        await self._async_set_native_value(
+            "holding_mode", SOLARFOCUS_MODE_ALWAYS_ON, side_effects=True
+        )
         _LOGGER.debug("async_turn_on")
 
     @override
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn water heater off."""
-        self._set_native_value("holding_mode", SOLARFOCUS_MODE_ALWAYS_OFF)
+        await self._async_set_native_value(
+            "holding_mode", SOLARFOCUS_MODE_ALWAYS_OFF, side_effects=True
+        )
         _LOGGER.debug("async_turn_off")
 
 
@@ -1,8 +1,9 @@
 """Fixtures for the Solarfocus tests."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from pysolarfocus import ApiVersions, Systems
+from pysolarfocus import ApiVersions, SolarfocusAPI, Systems
+from pysolarfocus.components.base.enums import RegisterTypes
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
@@ -16,12 +17,17 @@ from custom_components.solarfocus.const import (
     CONF_HEATING_CIRCUIT,
     CONF_HEATPUMP,
     CONF_PHOTOVOLTAIC,
+    CONF_PIPELINE_WINDOW,
+    CONF_POLL_TIERS,
     CONF_SOLAR,
     CONF_SOLARFOCUS_SYSTEM,
     DEFAULT_NAME,
     DOMAIN,
     build_unique_id,
+    component_count,
+    solar_count,
 )
+from custom_components.solarfocus.modbus import ModbusError
 from custom_components.solarfocus.service_menu import DisplayedNumber
 from homeassistant.const import (
     CONF_API_VERSION,
@@ -32,7 +38,21 @@ from homeassistant.const import (
 )
 
 # The config entry version the integration currently migrates to.
-CURRENT_VERSION = 11
+CURRENT_VERSION = 13
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the options that take a new baseline for the benchmarks, and time them."""
+    parser.addoption(
+        "--update-benchmarks",
+        action="store_true",
+        help="store what tests/test_benchmark.py measures as its new baseline",
+    )
+    parser.addoption(
+        "--benchmark-timings",
+        action="store_true",
+        help="fail tests/test_benchmark.py on its times as well, not only its counts",
+    )
 
 
 def build_data(system: Systems = Systems.VAMPAIR) -> dict:
@@ -60,6 +80,8 @@ def build_options(**overrides) -> dict:
         CONF_HEATPUMP: False,
         CONF_BIOMASS_BOILER: False,
         CONF_PHOTOVOLTAIC: False,
+        CONF_POLL_TIERS: {},
+        CONF_PIPELINE_WINDOW: 1,
     }
     options.update(overrides)
     return options
@@ -153,6 +175,7 @@ def build_coordinator(entry, api: MagicMock | None = None) -> MagicMock:
     coordinator._entry = entry
     coordinator.api = api if api is not None else build_api()
     coordinator.last_update_success = True
+    coordinator.stale = False
     # Every component reads, so the entities on them are available. A stub of it
     # rather than whatever a MagicMock makes of `in`, which is what availability
     # asks of this.
@@ -160,4 +183,96 @@ def build_coordinator(entry, api: MagicMock | None = None) -> MagicMock:
     # The real one, not a mock: the number the installer menu shows is shared
     # between two entities, and what a test of either is about is that sharing.
     coordinator.displayed_number = DisplayedNumber()
+    coordinator.async_write = AsyncMock()
+    coordinator.async_write_latest = AsyncMock()
     return coordinator
+
+
+def build_library_api(entry) -> SolarfocusAPI:
+    """Return a real SolarfocusAPI for an entry, which never connects by itself.
+
+    The coordinator reads the components of one of these off the event loop,
+    so a test of that needs the library's components rather than mocks of them.
+    The counts are capped to the api version the way the setup caps them.
+    """
+    return SolarfocusAPI(
+        ip=entry.data[CONF_HOST],
+        port=entry.data[CONF_PORT],
+        heating_circuit_count=entry.options[CONF_HEATING_CIRCUIT],
+        buffer_count=entry.options[CONF_BUFFER],
+        boiler_count=entry.options[CONF_BOILER],
+        fresh_water_module_count=entry.options[CONF_FRESH_WATER_MODULE],
+        circulation_count=component_count(entry, CONF_CIRCULATION),
+        differential_module_count=component_count(entry, CONF_DIFFERENTIAL_MODULE),
+        solar_count=solar_count(entry),
+        system=Systems(entry.data[CONF_SOLARFOCUS_SYSTEM]),
+        api_version=ApiVersions(entry.data[CONF_API_VERSION]),
+    )
+
+
+class FakeModbusClient:
+    """A ModbusClient that answers from a dict instead of a controller.
+
+    Registers nobody set read as 0, and an address in `unanswered` fails every
+    read that covers it, which is what a range the firmware does not have does.
+    """
+
+    def __init__(self, host: str = "solarfocus.local", port: int = 502) -> None:
+        """Start out unconnected, with every register at 0."""
+        self.host = host
+        self.port = port
+        self.connected = False
+        self.connects = 0
+        self.registers: dict[tuple[RegisterTypes, int], int] = {}
+        self.unanswered: set[int] = set()
+        self.reads: list[tuple[RegisterTypes, int, int]] = []
+        self.writes: list[tuple[int, list[int]]] = []
+
+    @property
+    def is_connected(self) -> bool:
+        """Return whether the test left it connected."""
+        return self.connected
+
+    async def async_connect(self) -> bool:
+        """Connect, which always works."""
+        self.connects += 1
+        self.connected = True
+        return True
+
+    async def async_close(self) -> None:
+        """Disconnect."""
+        self.connected = False
+
+    async def async_read_registers(
+        self, register_type: RegisterTypes, address: int, count: int
+    ) -> list[int]:
+        """Return the registers asked for, or fail like the controller would."""
+        self.reads.append((register_type, address, count))
+        if not self.connected:
+            raise ModbusError("Not connected")
+        if self.unanswered & set(range(address, address + count)):
+            raise ModbusError(f"Illegal data address {address}")
+        return [
+            self.registers.get((register_type, register), 0)
+            for register in range(address, address + count)
+        ]
+
+    async def async_write_registers(self, address: int, values: list[int]) -> None:
+        """Set the holding registers written, or fail like the controller would."""
+        self.writes.append((address, values))
+        if not self.connected:
+            raise ModbusError("Not connected")
+        if self.unanswered & set(range(address, address + len(values))):
+            raise ModbusError(f"Illegal data address {address}")
+        for offset, value in enumerate(values):
+            self.registers[(RegisterTypes.HOLDING, address + offset)] = value
+
+
+@pytest.fixture(name="modbus_client")
+def modbus_client_fixture():
+    """Patch the client the coordinator reads a real SolarfocusAPI with."""
+    client = FakeModbusClient()
+    with patch(
+        "custom_components.solarfocus.connection.ModbusClient", return_value=client
+    ):
+        yield client
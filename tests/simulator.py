@@ -0,0 +1,380 @@
+"""An eco manager-touch to test against, speaking Modbus TCP on 127.0.0.1.
+
+The rest of the suite stands in for the controller one layer up: a mocked
+`SolarfocusAPI`, or a `FakeModbusClient` that answers from a dict. Neither has
+a socket, so neither has what a controller is mostly about once the register
+map is right - how long an answer takes, a connection that goes away half way
+through a poll, a range that is never answered at all.
+
+The simulator below is a controller as far as anything over TCP can tell. It
+serves the registers of the components pysolarfocus builds for a system and an
+api version, every one of them configured as many times as the options allow,
+which is the register map of docs/modbus-registers.md for that combination.
+Each family of components answers over its whole stride - the registers between
+two buffers are documented as the first buffer's, even though nothing reads
+them - and anything outside every family is refused with "illegal data
+address", the way a controller refuses a component it does not have.
+
+What a test can set, on the instance and while it runs:
+
+- `registers`, the value of every register by type and address, 0 unless set;
+- `latency`, how long every request takes to be answered from when it
+  arrives, in seconds - so several sent at once, see `overlapping`, are
+  answered together, as over a slow link;
+- `unanswered`, addresses a request covering any of is never answered;
+- `refused`, addresses a request covering any of is answered with an
+  exception, on top of the ones outside the map;
+- `drop_every`, a connection closed instead of answering every that many
+  requests, and `drop_connections` to close all of them right away;
+- `overlapping`, what it does with a request that arrives while one before it
+  on the same connection is not answered yet: answer it in turn (`ANSWER`,
+  the default), answer it "server device busy" (`BUSY`), leave it unanswered
+  (`IGNORE`) or close the connection (`DROP`).
+
+Everything it was asked is in `requests`, and `connections` counts the
+connections it accepted, so a test can say what a poll cost and not only what
+it read. `most_outstanding` is the most requests one connection had waiting
+for an answer at once.
+
+It runs on the event loop of the test, or - for a test that measures that
+loop - on one of its own in a thread, see `start_in_thread`.
+"""
+
+import asyncio
+from collections.abc import Iterable
+import contextlib
+import struct
+import threading
+from typing import Any
+
+from pysolarfocus import ApiVersions, Systems
+from pysolarfocus.components.base.enums import RegisterTypes
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.solarfocus.const import (
+    CONF_BIOMASS_BOILER,
+    CONF_BOILER,
+    CONF_BUFFER,
+    CONF_CIRCULATION,
+    CONF_DIFFERENTIAL_MODULE,
+    CONF_FRESH_WATER_MODULE,
+    CONF_HEATING_CIRCUIT,
+    CONF_HEATPUMP,
+    CONF_PHOTOVOLTAIC,
+    CONF_SOLAR,
+)
+from custom_components.solarfocus.coordinator import COMPONENT_ATTRIBUTES
+from custom_components.solarfocus.modbus import (
+    READ_HOLDING_REGISTERS,
+    READ_INPUT_REGISTERS,
+    WRITE_MULTIPLE_REGISTERS,
+    WRITE_SINGLE_REGISTER,
+)
+from homeassistant.const import CONF_API_VERSION, CONF_HOST, CONF_PORT
+
+from .conftest import build_config_entry, build_library_api
+
+# The api version with every component the integration knows.
+LATEST_API_VERSION = list(ApiVersions)[-1]
+
+# Every component as many times as the options allow. Both heat sources are in
+# it: the system decides which of them the library reads.
+MAXIMAL_OPTIONS: dict[str, Any] = {
+    CONF_HEATING_CIRCUIT: 8,
+    CONF_BUFFER: 4,
+    CONF_BOILER: 4,
+    CONF_FRESH_WATER_MODULE: 4,
+    CONF_CIRCULATION: 4,
+    CONF_DIFFERENTIAL_MODULE: 4,
+    CONF_SOLAR: 4,
+    CONF_HEATPUMP: True,
+    CONF_BIOMASS_BOILER: True,
+    CONF_PHOTOVOLTAIC: True,
+}
+
+# The exception codes of the Modbus specification that a controller sends.
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_ADDRESS = 0x02
+ILLEGAL_DATA_VALUE = 0x03
+SERVER_DEVICE_BUSY = 0x06
+
+# What the simulator can do with a request sent before the one before it was
+# answered.
+ANSWER = "answer"
+BUSY = "busy"
+IGNORE = "ignore"
+DROP = "drop"
+
+# Transaction id, protocol id, length, unit id.
+_MBAP_HEADER = struct.Struct(">HHHB")
+
+# The most registers one read may ask for.
+_MAX_READ_COUNT = 125
+
+
+def _family_range(components: list[Any], register_type: RegisterTypes) -> range:
+    """Return the addresses the instances of one component answer, all of them.
+
+    From the first instance to the stride after the last, where there is more
+    than one of them, and the registers the one reads where there is not.
+    """
+    holding = register_type == RegisterTypes.HOLDING
+    addresses = [
+        component.holding_address if holding else component.input_address
+        for component in components
+    ]
+    count = components[0].holding_count if holding else components[0].input_count
+    stride = addresses[1] - addresses[0] if len(addresses) > 1 else count
+    return range(addresses[0], addresses[-1] + max(stride, count))
+
+
+def register_map(
+    system: Systems, api_version: ApiVersions
+) -> dict[RegisterTypes, list[range]]:
+    """Return the ranges a controller of this system and api version answers."""
+    api = build_library_api(
+        build_config_entry(system, api_version=api_version.value, **MAXIMAL_OPTIONS)
+    )
+    ranges: dict[RegisterTypes, list[range]] = {
+        RegisterTypes.INPUT: [],
+        RegisterTypes.HOLDING: [],
+    }
+    for attribute in COMPONENT_ATTRIBUTES.values():
+        components = getattr(api, attribute, None)
+        if components is None:
+            continue
+        if not isinstance(components, list):
+            components = [components]
+        if not components:
+            continue
+        if components[0].has_input_address:
+            ranges[RegisterTypes.INPUT].append(
+                _family_range(components, RegisterTypes.INPUT)
+            )
+        if components[0].has_holding_address:
+            ranges[RegisterTypes.HOLDING].append(
+                _family_range(components, RegisterTypes.HOLDING)
+            )
+    return ranges
+
+
+class ControllerSimulator:
+    """A controller of one system and api version, on a free local port."""
+
+    def __init__(
+        self,
+        system: Systems = Systems.VAMPAIR,
+        api_version: ApiVersions = LATEST_API_VERSION,
+        *,
+        latency: float = 0.0,
+    ) -> None:
+        """Set up a controller with every register at 0, not listening yet."""
+        self.system = system
+        self.api_version = api_version
+        self.latency = latency
+        self.registers: dict[tuple[RegisterTypes, int], int] = {}
+        self.unanswered: set[int] = set()
+        self.refused: set[int] = set()
+        self.drop_every = 0
+        self.overlapping = ANSWER
+        self.requests: list[tuple[int, int, int]] = []
+        self.connections = 0
+        self.most_outstanding = 0
+        self.host = "127.0.0.1"
+        self.port = 0
+        self._map = register_map(system, api_version)
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    async def async_start(self) -> None:
+        """Start listening, on a port of the system's choosing."""
+        self._server = await asyncio.start_server(self._async_serve, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def async_stop(self) -> None:
+        """Stop listening, and close every connection still open."""
+        self.drop_connections()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def start_in_thread(self) -> None:
+        """Start listening from an event loop of its own, in a thread of its own.
+
+        Served from the loop of the test, the controller's half of every request
+        would count as the integration's in anything that measures that loop.
+        """
+        loop = self._loop = asyncio.new_event_loop()
+        listening = threading.Event()
+
+        def _run() -> None:
+            loop.run_until_complete(self.async_start())
+            listening.set()
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=_run, name="controller simulator")
+        self._thread.start()
+        listening.wait()
+
+    def stop_thread(self) -> None:
+        """Stop a simulator `start_in_thread` started, and wait for its thread."""
+        assert self._loop is not None and self._thread is not None
+        asyncio.run_coroutine_threadsafe(self.async_stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def drop_connections(self) -> None:
+        """Close every open connection, as a controller that restarts does."""
+        for writer in list(self._writers):
+            writer.close()
+
+    def config_entry(self, **overrides: Any) -> MockConfigEntry:
+        """Return an entry for this controller, with every component configured."""
+        settings: dict[str, Any] = {
+            CONF_HOST: self.host,
+            CONF_PORT: self.port,
+            CONF_API_VERSION: self.api_version.value,
+            **MAXIMAL_OPTIONS,
+            **overrides,
+        }
+        return build_config_entry(self.system, **settings)
+
+    def answers(self, register_type: RegisterTypes, addresses: Iterable[int]) -> bool:
+        """Return whether every one of the addresses is on the register map."""
+        ranges = self._map[register_type]
+        return all(
+            any(address in answered for answered in ranges) for address in addresses
+        )
+
+    async def _async_serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Take the requests of one connection as they arrive.
+
+        They are answered from a queue, in the order they arrived, so that a
+        request is taken while the one before it is still waiting for its
+        answer - which is the only way to tell that it was sent before that
+        answer was.
+        """
+        self.connections += 1
+        self._writers.add(writer)
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[tuple[float, bytes, bytes]] = asyncio.Queue()
+        # Requests taken and not answered, whether they are in the queue yet or
+        # not: one the queue got to is still being answered until it is sent.
+        outstanding = [0]
+        answering = loop.create_task(self._async_answer(writer, queue, outstanding))
+        try:
+            while True:
+                header = await reader.readexactly(_MBAP_HEADER.size)
+                length = _MBAP_HEADER.unpack(header)[2]
+                pdu = await reader.readexactly(length - 1)
+                address, count = self._request_range(pdu)
+                self.requests.append((pdu[0], address, count))
+
+                if self.drop_every and len(self.requests) % self.drop_every == 0:
+                    break
+                if self.unanswered & set(range(address, address + count)):
+                    continue
+                if outstanding[0] and self.overlapping != ANSWER:
+                    if self.overlapping == DROP:
+                        break
+                    if self.overlapping == IGNORE:
+                        continue
+                    writer.write(
+                        _reply(header, self._exception(pdu[0], SERVER_DEVICE_BUSY))
+                    )
+                    continue
+
+                outstanding[0] += 1
+                self.most_outstanding = max(self.most_outstanding, outstanding[0])
+                queue.put_nowait((loop.time() + self.latency, header, pdu))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            answering.cancel()
+            self._writers.discard(writer)
+            writer.close()
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+
+    async def _async_answer(
+        self,
+        writer: asyncio.StreamWriter,
+        queue: asyncio.Queue[tuple[float, bytes, bytes]],
+        outstanding: list[int],
+    ) -> None:
+        """Answer the requests of one connection, each when its time has come."""
+        loop = asyncio.get_running_loop()
+        while True:
+            due, header, pdu = await queue.get()
+            await asyncio.sleep(max(due - loop.time(), 0))
+            writer.write(_reply(header, self._answer(pdu, *self._request_range(pdu))))
+            outstanding[0] -= 1
+            with contextlib.suppress(ConnectionError):
+                await writer.drain()
+
+    @staticmethod
+    def _request_range(pdu: bytes) -> tuple[int, int]:
+        """Return the first register a request is about, and how many."""
+        if len(pdu) < 5:
+            return 0, 0
+        address, second = struct.unpack(">HH", pdu[1:5])
+        # A single register write carries the value where the others carry the
+        # count.
+        return address, 1 if pdu[0] == WRITE_SINGLE_REGISTER else second
+
+    def _answer(self, pdu: bytes, address: int, count: int) -> bytes:
+        """Return the response to one request, function code first."""
+        function_code = pdu[0]
+        if function_code in (READ_INPUT_REGISTERS, READ_HOLDING_REGISTERS):
+            register_type = (
+                RegisterTypes.INPUT
+                if function_code == READ_INPUT_REGISTERS
+                else RegisterTypes.HOLDING
+            )
+            if not 1 <= count <= _MAX_READ_COUNT:
+                return self._exception(function_code, ILLEGAL_DATA_VALUE)
+            if not self._allowed(register_type, address, count):
+                return self._exception(function_code, ILLEGAL_DATA_ADDRESS)
+            words = [
+                self.registers.get((register_type, register), 0)
+                for register in range(address, address + count)
+            ]
+            return struct.pack(f">BB{count}H", function_code, 2 * count, *words)
+
+        if function_code == WRITE_SINGLE_REGISTER:
+            values = list(struct.unpack(">H", pdu[3:5]))
+            echo = pdu[:5]
+        elif function_code == WRITE_MULTIPLE_REGISTERS:
+            values = list(struct.unpack(f">{count}H", pdu[6 : 6 + 2 * count]))
+            echo = pdu[:5]
+        else:
+            return self._exception(function_code, ILLEGAL_FUNCTION)
+
+        if not self._allowed(RegisterTypes.HOLDING, address, count):
+            return self._exception(function_code, ILLEGAL_DATA_ADDRESS)
+        for offset, value in enumerate(values):
+            self.registers[(RegisterTypes.HOLDING, address + offset)] = value
+        return echo
+
+    def _allowed(self, register_type: RegisterTypes, address: int, count: int) -> bool:
+        """Return whether a request for these registers is answered at all."""
+        addresses = range(address, address + count)
+        return not self.refused & set(addresses) and self.answers(
+            register_type, addresses
+        )
+
+    @staticmethod
+    def _exception(function_code: int, code: int) -> bytes:
+        """Return the exception response to a function."""
+        return struct.pack(">BB", function_code | 0x80, code)
+
+
+def _reply(header: bytes, response: bytes) -> bytes:
+    """Return the frame of a response, under the header of its request."""
+    transaction_id, _, _, unit_id = _MBAP_HEADER.unpack(header)
+    return _MBAP_HEADER.pack(transaction_id, 0, len(response) + 1, unit_id) + response
@@ -0,0 +1,389 @@
+"""Benchmark what a poll, a state write and a mode change cost, against a baseline.
+
+A poll every five seconds is only affordable if a poll is cheap, and nothing
+else in the suite says whether it is: the tests say what is read and written,
+not what it took. These run a set up entry against the simulated controller and
+measure, per operation:
+
+- `wall`, how long it took from start to end;
+- `busy`, how much of that the event loop of Home Assistant spent working
+  rather than waiting - what every other integration waits for meanwhile;
+- `transactions`, the Modbus requests it sent;
+- `allocated`, the most memory in KiB it had allocated at any one point.
+
+A reload is measured by what it costs each entity instead, `entity_bytes`: the
+most memory it had allocated at any one point, over the entities it built. An
+entry of four of everything has hundreds of them, and every one is built again
+by every reload.
+
+Setting an entry up among the entities of every other integration is measured
+by `wall` alone, as a pass over a registry of `FOREIGN_ENTITIES` of them: what
+it costs should grow with the entities of the entry, not with the instance.
+
+Both times are in units of a fixed piece of pure Python timed on the same
+machine, see `_reference_time`, so that a baseline taken on one machine means
+something on another. The controller is simulated in a thread of its own, so
+its half of every request is not counted as the integration's.
+
+Each measurement is checked against benchmark_baseline.json next to this file,
+and fails a test when it regressed beyond the tolerance below. The times only
+with `--benchmark-timings`: they say as much about how busy the machine was as
+about the change, and a shared CI runner is busy in ways no tolerance covers.
+The requests and the memory do not depend on the machine, and are always
+checked. After a change
+that is meant to move them, `pytest tests/test_benchmark.py --update-benchmarks`
+writes the numbers it measured as the new baseline, to be committed with it.
+"""
+
+from collections.abc import Awaitable, Callable, Generator
+from dataclasses import asdict, dataclass
+import json
+import logging
+from pathlib import Path
+import struct
+import time
+import tracemalloc
+from typing import Any
+
+from pysolarfocus import ApiVersions, Systems
+import pytest
+
+from custom_components.solarfocus import _async_align_solar_unique_ids
+from custom_components.solarfocus.const import (
+    CONF_BOILER,
+    CONF_BUFFER,
+    CONF_HEATING_CIRCUIT,
+    CONF_HEATPUMP,
+    CONF_PHOTOVOLTAIC,
+    DOMAIN,
+)
+from homeassistant.components.climate import (
+    ATTR_HVAC_MODE,
+    DOMAIN as CLIMATE_DOMAIN,
+    SERVICE_SET_HVAC_MODE,
+    HVACMode,
+)
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_platform import async_get_platforms
+
+from .conftest import build_config_entry
+from .simulator import MAXIMAL_OPTIONS, ControllerSimulator
+
+_LOGGER = logging.getLogger(__name__)
+
+BASELINE = Path(__file__).with_name("benchmark_baseline.json")
+
+# How often an operation runs per measurement, and how many measurements the
+# times are the best of: the fastest of a few is the one the least else on the
+# machine got in the way of.
+ROUNDS = 10
+REPEATS = 3
+
+# How far a measurement may exceed its baseline before it fails the test. The
+# transactions are exact - a poll that sends one more request is a regression,
+# whatever the machine - the memory varies a little with the versions of
+# Python and Home Assistant, and the times with everything.
+TOLERANCE = {
+    "transactions": 1.0,
+    "allocated": 1.5,
+    "wall": 2.0,
+    "busy": 2.0,
+    "entity_bytes": 1.5,
+}
+
+# The metrics that are only checked with `--benchmark-timings`.
+TIMINGS = frozenset({"wall", "busy"})
+
+# The entities of other integrations a large installation has registered.
+FOREIGN_ENTITIES = 50_000
+
+# From a single heat pump to four of every component.
+CONFIGURATIONS: dict[str, dict[str, Any]] = {
+    "heat_pump": {
+        **{option: type(value)(0) for option, value in MAXIMAL_OPTIONS.items()},
+        CONF_HEATPUMP: True,
+    },
+    "house": {
+        **{option: type(value)(0) for option, value in MAXIMAL_OPTIONS.items()},
+        CONF_HEATING_CIRCUIT: 2,
+        CONF_BUFFER: 1,
+        CONF_BOILER: 1,
+        CONF_HEATPUMP: True,
+        CONF_PHOTOVOLTAIC: True,
+    },
+    "four_of_everything": {
+        **{
+            option: value if isinstance(value, bool) else 4
+            for option, value in MAXIMAL_OPTIONS.items()
+        },
+    },
+}
+
+
+@dataclass
+class Measurement:
+    """What one operation cost, on average over `ROUNDS`."""
+
+    wall: float
+    busy: float
+    transactions: float
+    allocated: float
+
+
+@dataclass
+class RegistryPass:
+    """What one pass over the entity registry at setup cost."""
+
+    wall: float
+
+
+@dataclass
+class Footprint:
+    """What one reload cost each entity it built."""
+
+    entity_bytes: float
+
+
+def _reference_time() -> float:
+    """Return how long a fixed piece of work takes on this machine, in seconds.
+
+    Unpacking and summing register words, which is the kind of work a poll is
+    made of, and the best of a few runs of it.
+    """
+    words = struct.pack(">100H", *range(100))
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(2000):
+            sum(struct.unpack(">100H", words))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.fixture(name="benchmark_simulator")
+def benchmark_simulator_fixture(
+    socket_enabled: None,
+) -> Generator[ControllerSimulator]:
+    """Run a simulated Vampair in a thread of its own."""
+    simulator = ControllerSimulator()
+    simulator.start_in_thread()
+    yield simulator
+    simulator.stop_thread()
+
+
+async def _set_up(
+    hass: HomeAssistant, simulator: ControllerSimulator, configuration: str
+):
+    """Set up an entry of a configuration, and return it."""
+    entry = simulator.config_entry(**CONFIGURATIONS[configuration])
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _measure(
+    simulator: ControllerSimulator, operation: Callable[[], Awaitable[None]]
+) -> Measurement:
+    """Run an operation `ROUNDS` times, `REPEATS` times over, and measure it."""
+    reference = _reference_time()
+    wall = busy = float("inf")
+    requests = len(simulator.requests)
+    for _ in range(REPEATS):
+        start_wall, start_busy = time.perf_counter(), time.thread_time()
+        for _ in range(ROUNDS):
+            await operation()
+        wall = min(wall, time.perf_counter() - start_wall)
+        busy = min(busy, time.thread_time() - start_busy)
+    transactions = (len(simulator.requests) - requests) / (ROUNDS * REPEATS)
+
+    tracemalloc.start()
+    try:
+        await operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(
+        wall=round(wall / ROUNDS / reference, 2),
+        busy=round(busy / ROUNDS / reference, 2),
+        transactions=transactions,
+        allocated=round(peak / 1024),
+    )
+
+
+def _check(
+    request: pytest.FixtureRequest,
+    name: str,
+    measured: Measurement | Footprint | RegistryPass,
+) -> None:
+    """Compare a measurement with its baseline, or store it as the new one."""
+    _LOGGER.info("%s: %s", name, measured)
+    for metric, value in asdict(measured).items():
+        request.node.user_properties.append((metric, value))
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    if request.config.getoption("update_benchmarks"):
+        baseline[name] = asdict(measured)
+        BASELINE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        return
+
+    if name not in baseline:
+        pytest.fail(f"No baseline for {name}, run with --update-benchmarks")
+
+    timed = request.config.getoption("benchmark_timings")
+    regressed = [
+        f"{metric} {value} > {baseline[name][metric]} x {TOLERANCE[metric]}"
+        for metric, value in asdict(measured).items()
+        if (timed or metric not in TIMINGS)
+        and value > baseline[name][metric] * TOLERANCE[metric]
+    ]
+    assert not regressed, f"{name} regressed: {', '.join(regressed)}"
+
+
+@pytest.mark.parametrize("configuration", CONFIGURATIONS)
+async def test_a_poll(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    benchmark_simulator: ControllerSimulator,
+    request: pytest.FixtureRequest,
+    configuration: str,
+) -> None:
+    """A refresh of the coordinator, every component of the entry read."""
+    entry = await _set_up(hass, benchmark_simulator, configuration)
+    coordinator = entry.runtime_data
+
+    measured = await _measure(benchmark_simulator, coordinator.async_refresh)
+
+    assert coordinator.last_update_success
+    _check(request, f"poll[{configuration}]", measured)
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.parametrize("configuration", CONFIGURATIONS)
+async def test_writing_every_state(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    benchmark_simulator: ControllerSimulator,
+    request: pytest.FixtureRequest,
+    configuration: str,
+) -> None:
+    """Every entity of the entry writing its state, as after a poll changed all."""
+    entry = await _set_up(hass, benchmark_simulator, configuration)
+    entities = [
+        entity
+        for platform in async_get_platforms(hass, entry.domain)
+        for entity in platform.entities.values()
+    ]
+
+    async def _write_every_state() -> None:
+        for entity in entities:
+            entity.async_write_ha_state()
+
+    measured = await _measure(benchmark_simulator, _write_every_state)
+
+    _check(request, f"states[{configuration}]", measured)
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.parametrize(
+    "configuration", [name for name in CONFIGURATIONS if name != "heat_pump"]
+)
+async def test_a_climate_mode_change(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    benchmark_simulator: ControllerSimulator,
+    request: pytest.FixtureRequest,
+    configuration: str,
+) -> None:
+    """A heating circuit switched on and off, written and read back each time."""
+    entry = await _set_up(hass, benchmark_simulator, configuration)
+    entity_id = next(
+        entity.entity_id
+        for entity in er.async_entries_for_config_entry(
+            er.async_get(hass), entry.entry_id
+        )
+        if entity.domain == CLIMATE_DOMAIN
+    )
+    modes = iter([HVACMode.HEAT, HVACMode.OFF] * ROUNDS * (REPEATS + 1))
+
+    async def _change_mode() -> None:
+        await hass.services.async_call(
+            CLIMATE_DOMAIN,
+            SERVICE_SET_HVAC_MODE,
+            {ATTR_ENTITY_ID: entity_id, ATTR_HVAC_MODE: next(modes)},
+            blocking=True,
+        )
+
+    measured = await _measure(benchmark_simulator, _change_mode)
+
+    _check(request, f"climate[{configuration}]", measured)
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.parametrize("configuration", CONFIGURATIONS)
+async def test_the_memory_a_reload_takes_per_entity(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    benchmark_simulator: ControllerSimulator,
+    request: pytest.FixtureRequest,
+    configuration: str,
+) -> None:
+    """Every entity of the entry built again, with the descriptions it is built from."""
+    entry = await _set_up(hass, benchmark_simulator, configuration)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    entities = len(
+        er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    )
+    measured = Footprint(entity_bytes=round((peak - before) / entities))
+
+    _check(request, f"reload[{configuration}]", measured)
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_aligning_the_solar_keys_among_other_entities(
+    hass: HomeAssistant, request: pytest.FixtureRequest
+) -> None:
+    """Renaming the solar entities of an entry, in a registry of many others."""
+    registry = er.async_get(hass)
+    for index in range(FOREIGN_ENTITIES):
+        registry.entities[f"sensor.other_{index}"] = er.RegistryEntry(
+            entity_id=f"sensor.other_{index}", unique_id=str(index), platform="other"
+        )
+
+    entry = build_config_entry(
+        Systems.VAMPAIR, api_version=ApiVersions.V_25_030.value, solar=2
+    )
+    entry.add_to_hass(hass)
+    for key in ("collector_temperature_1", "yield_today", "state"):
+        registry.async_get_or_create(
+            "sensor", DOMAIN, f"{entry.entry_id}_so_{key}", config_entry=entry
+        )
+
+    reference = _reference_time()
+    wall = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            await _async_align_solar_unique_ids(hass, entry)
+        wall = min(wall, time.perf_counter() - start)
+
+    assert registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}_so1_yield_today"
+    )
+    _check(
+        request,
+        f"registry[{FOREIGN_ENTITIES}]",
+        RegistryPass(wall=round(wall / ROUNDS / reference, 4)),
+    )
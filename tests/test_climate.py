@@ -17,9 +17,10 @@ cooling. This integration keeps the preset the user configured instead and only
 switches a circuit that is off back on, see the module docstring of climate.py.
 """
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 from pysolarfocus import ApiVersions
+from pysolarfocus.components.base.enums import RegisterTypes
 import pytest
 
 from custom_components.solarfocus.climate import (
@@ -34,6 +35,7 @@ from custom_components.solarfocus.const import (
     HEATING_CIRCUIT_COMPONENT_PREFIX,
     HEATING_CIRCUIT_PREFIX,
 )
+from custom_components.solarfocus.coordinator import SolarfocusDataUpdateCoordinator
 from custom_components.solarfocus.entity import SolarfocusEntity, create_description
 from homeassistant.components.climate.const import (
     PRESET_COMFORT,
@@ -43,11 +45,17 @@ from homeassistant.components.climate.const import (
     HVACMode,
 )
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
-from homeassistant.core import State
+from homeassistant.core import HomeAssistant, State
 
 from pytest_homeassistant_custom_component.common import mock_restore_cache_with_extra_data
 
-from .conftest import build_api, build_config_entry, build_coordinator
+from .conftest import (
+    FakeModbusClient,
+    build_api,
+    build_config_entry,
+    build_coordinator,
+    build_library_api,
+)
 
 # The registers the specification requires to be written together.
 REGISTERS = ("target_supply_temperature", "cooling", "mode", "heating_mode")
@@ -94,7 +102,11 @@ def build_climate(
 
 def written(set_value: MagicMock) -> dict[str, float]:
     """Return the registers a call wrote, keyed by their item name."""
-    return {call.args[0]: call.args[1] for call in set_value.call_args_list}
+    return {
+        item: value
+        for call in set_value.call_args_list
+        for item, value in call.args[0].items()
+    }
 
 
 @pytest.fixture(name="climate")
@@ -108,7 +120,7 @@ def climate_fixture() -> SolarfocusClimateEntity:
 
 async def test_heating_writes_every_register(climate) -> None:
     """6.2.1, the circuit is switched to heating."""
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_set_hvac_mode(HVACMode.HEAT)
 
     assert written(set_value) == {
@@ -121,7 +133,7 @@ async def test_heating_writes_every_register(climate) -> None:
 
 async def test_cooling_writes_every_register(climate) -> None:
     """6.2.2, the circuit is switched to cooling."""
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_set_hvac_mode(HVACMode.COOL)
 
     assert written(set_value) == {
@@ -135,7 +147,7 @@ async def test_cooling_writes_every_register(climate) -> None:
 
 async def test_off_writes_every_register(climate) -> None:
     """6.2.3, the circuit is switched off, including the setpoint of 0."""
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_set_hvac_mode(HVACMode.OFF)
 
     assert written(set_value) == {
@@ -151,12 +163,27 @@ async def test_off_writes_every_register(climate) -> None:
 )
 async def test_no_register_is_left_out(climate, hvac_mode: HVACMode) -> None:
     """The specification requires all four registers on every transition."""
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_set_hvac_mode(hvac_mode)
 
     assert set(written(set_value)) == set(REGISTERS)
 
 
+@pytest.mark.parametrize(
+    "hvac_mode", [HVACMode.HEAT, HVACMode.COOL, HVACMode.OFF], ids=str
+)
+async def test_the_registers_are_written_in_one_go(
+    climate, hvac_mode: HVACMode
+) -> None:
+    """Not one by one, each with the circuit read back after it."""
+    await climate.async_set_hvac_mode(hvac_mode)
+
+    climate.coordinator.async_write.assert_awaited_once()
+    component, values = climate.coordinator.async_write.await_args.args
+    assert component is climate.coordinator.api.heating_circuits[0]
+    assert set(values) == set(REGISTERS)
+
+
 # --- the preset deviation ----------------------------------------------------
 
 
@@ -164,7 +191,7 @@ async def test_switching_on_keeps_the_configured_preset() -> None:
     """A circuit on an auto schedule keeps it when the mode is switched."""
     climate = build_climate(mode=MODE_AUTO)
 
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_set_hvac_mode(HVACMode.COOL)
 
     assert written(set_value)["mode"] == MODE_AUTO
@@ -174,7 +201,7 @@ async def test_switching_on_a_circuit_that_is_off_selects_continuous() -> None:
     """A circuit that is switched off has to be switched back on."""
     climate = build_climate(state=STATE_OFF, mode=MODE_OFF)
 
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_set_hvac_mode(HVACMode.HEAT)
 
     assert written(set_value)["mode"] == MODE_CONTINUOUS
@@ -196,7 +223,7 @@ async def test_heating_mode_is_not_written_below_22_090() -> None:
     """Writing a register the api version does not have raises AttributeError."""
     climate = build_climate(api_version=ApiVersions.V_21_140)
 
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_set_hvac_mode(HVACMode.HEAT)
 
     assert "heating_mode" not in written(set_value)
@@ -221,14 +248,14 @@ async def test_an_old_circuit_never_reports_cooling() -> None:
 
 async def test_the_setpoint_survives_being_switched_off(climate) -> None:
     """Switching off writes 0, switching back on restores the setpoint."""
-    with patch.object(climate, "_set_native_value"):
+    with patch.object(climate, "_async_set_native_values"):
         await climate.async_set_temperature(**{ATTR_TEMPERATURE: 41.5})
 
     # The circuit is off, register 32600 reads 0
     climate.coordinator.api.heating_circuits[0].target_supply_temperature.scaled_value = 0
     climate.coordinator.api.heating_circuits[0].state.scaled_value = STATE_OFF
 
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_set_hvac_mode(HVACMode.HEAT)
 
     assert written(set_value)["target_supply_temperature"] == 41.5
@@ -236,19 +263,19 @@ async def test_the_setpoint_survives_being_switched_off(climate) -> None:
 
 async def test_each_mode_keeps_its_own_setpoint(climate) -> None:
     """A heating setpoint is far outside the cooling range and vice versa."""
-    with patch.object(climate, "_set_native_value"):
+    with patch.object(climate, "_async_set_native_values"):
         await climate.async_set_temperature(**{ATTR_TEMPERATURE: 41.5})
 
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_set_hvac_mode(HVACMode.COOL)
     assert written(set_value)["target_supply_temperature"] == 19.0
 
     climate.coordinator.api.heating_circuits[0].cooling.scaled_value = 1
-    with patch.object(climate, "_set_native_value"):
+    with patch.object(climate, "_async_set_native_values"):
         await climate.async_set_temperature(**{ATTR_TEMPERATURE: 18.0})
 
     climate.coordinator.api.heating_circuits[0].cooling.scaled_value = 0
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_set_hvac_mode(HVACMode.COOL)
 
     assert written(set_value)["target_supply_temperature"] == 18.0
@@ -258,7 +285,7 @@ async def test_setting_a_temperature_while_off_only_remembers_it() -> None:
     """Register 32600 has to stay 0 while the circuit is switched off."""
     climate = build_climate(state=STATE_OFF, target_supply_temperature=0)
 
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_set_temperature(**{ATTR_TEMPERATURE: 40.0})
 
     assert not set_value.called
@@ -267,15 +294,42 @@ async def test_setting_a_temperature_while_off_only_remembers_it() -> None:
 
 async def test_setting_a_temperature_writes_the_setpoint(climate) -> None:
     """A running circuit takes the setpoint immediately."""
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_set_temperature(**{ATTR_TEMPERATURE: 42.0})
 
     assert written(set_value) == {"target_supply_temperature": 42.0}
 
 
+async def test_a_setpoint_is_the_only_register_read_back(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """A new setpoint sets nothing else of the circuit in motion, unlike a mode."""
+    entry = build_config_entry(heating_circuit=1)
+    entry.add_to_hass(hass)
+    coordinator = SolarfocusDataUpdateCoordinator(
+        hass, entry, build_library_api(entry)
+    )
+    coordinator.api.heating_circuits[0].state.value = STATE_HEATING
+    climate = SolarfocusClimateEntity(
+        coordinator,
+        create_description(
+            HEATING_CIRCUIT_COMPONENT,
+            HEATING_CIRCUIT_COMPONENT_PREFIX,
+            "1",
+            CLIMATE_TYPES[0],
+        ),
+    )
+    climate.async_write_ha_state = MagicMock()
+
+    await climate.async_set_temperature(**{ATTR_TEMPERATURE: 42.0})
+
+    assert modbus_client.writes == [(32600, [420])]
+    assert modbus_client.reads == [(RegisterTypes.HOLDING, 32600, 1)]
+
+
 async def test_a_call_without_a_temperature_writes_nothing(climate) -> None:
     """The service can be called with other attributes only."""
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_set_temperature(hvac_mode=HVACMode.HEAT)
 
     assert not set_value.called
@@ -295,7 +349,7 @@ async def test_switching_to_cooling_warns_about_the_dew_point(
     climate, caplog: pytest.LogCaptureFixture
 ) -> None:
     """The controller stops watching the dew point once 32602 is written."""
-    with patch.object(climate, "_set_native_value"):
+    with patch.object(climate, "_async_set_native_values"):
         await climate.async_set_hvac_mode(HVACMode.COOL)
 
     assert "dew point" in caplog.text
@@ -306,7 +360,7 @@ async def test_the_dew_point_warning_is_logged_once(
     climate, caplog: pytest.LogCaptureFixture
 ) -> None:
     """A thermostat in cooling mode must not warn on every service call."""
-    with patch.object(climate, "_set_native_value"):
+    with patch.object(climate, "_async_set_native_values"):
         await climate.async_set_hvac_mode(HVACMode.COOL)
         await climate.async_set_hvac_mode(HVACMode.COOL)
 
@@ -316,7 +370,7 @@ async def test_the_dew_point_warning_is_logged_once(
 
 async def test_heating_does_not_warn(climate, caplog: pytest.LogCaptureFixture) -> None:
     """Heating leaves the dew point monitoring of the controller alone."""
-    with patch.object(climate, "_set_native_value"):
+    with patch.object(climate, "_async_set_native_values"):
         await climate.async_set_hvac_mode(HVACMode.HEAT)
 
     assert "dew point" not in caplog.text
@@ -360,10 +414,10 @@ def test_preset_mode(mode: int, preset: str) -> None:
 )
 async def test_set_preset_mode(climate, preset: str, expected: int) -> None:
     """Selecting a preset writes the numeric mode."""
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_set_preset_mode(preset)
 
-    assert set_value.call_args_list == [(("mode", expected),)]
+    assert set_value.call_args_list == [call({"mode": expected}, side_effects=True)]
 
 
 @pytest.mark.parametrize(
@@ -398,7 +452,7 @@ def test_supported_features_include_the_setpoint(climate) -> None:
 
 async def test_setpoints_are_stored_for_a_restart(climate) -> None:
     """The remembered setpoints are written to the restore state."""
-    with patch.object(climate, "_set_native_value"):
+    with patch.object(climate, "_async_set_native_values"):
         await climate.async_set_temperature(**{ATTR_TEMPERATURE: 41.5})
 
     assert climate.extra_restore_state_data.as_dict() == {
@@ -445,7 +499,7 @@ async def test_a_first_start_has_nothing_to_restore(climate) -> None:
 
 async def test_turn_off(climate) -> None:
     """Turning off is the off state of the specification."""
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_turn_off()
 
     assert written(set_value)["mode"] == MODE_OFF
@@ -454,7 +508,7 @@ async def test_turn_off(climate) -> None:
 
 async def test_turn_on_heats(climate) -> None:
     """Turning on never starts cooling on its own."""
-    with patch.object(climate, "_set_native_value") as set_value:
+    with patch.object(climate, "_async_set_native_values") as set_value:
         await climate.async_turn_on()
 
     assert written(set_value)["cooling"] == 0
@@ -25,10 +25,15 @@ from custom_components.solarfocus.const import (
     CONF_HEATING_CIRCUIT,
     CONF_HEATPUMP,
     CONF_PHOTOVOLTAIC,
+    CONF_PIPELINE_WINDOW,
+    CONF_POLL_TIERS,
     CONF_SOLAR,
     CONF_SOLARFOCUS_SYSTEM,
     DEFAULT_NAME,
     DOMAIN,
+    POLL_TIER_FAST,
+    POLL_TIER_NORMAL,
+    POLL_TIER_SLOW,
 )
 from homeassistant.config_entries import SOURCE_RECONFIGURE
 from homeassistant.const import (
@@ -194,6 +199,10 @@ async def test_full_flow_vampair(
         CONF_HEATPUMP: True,
         # A heat pump system never has a biomass boiler
         CONF_BIOMASS_BOILER: False,
+        # Every component is read on every poll until the options say otherwise
+        CONF_POLL_TIERS: {},
+        # And one request at a time, which every controller takes
+        CONF_PIPELINE_WINDOW: 1,
     }
     assert len(setup_entry.mock_calls) == 1
 
@@ -455,6 +464,45 @@ async def test_options_flow_updates_options(
     assert result["data"][CONF_BIOMASS_BOILER] is False
 
 
+async def test_options_flow_stores_the_tiers_moved_off_the_default(
+    hass: HomeAssistant, enable_custom_integrations, mock_api
+) -> None:
+    """A component left on the fast tier is not written down at all."""
+    entry = build_config_entry(
+        Systems.VAMPAIR,
+        heating_circuit=1,
+        heatpump=True,
+        poll_tiers={CONF_BOILER: POLL_TIER_NORMAL},
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    defaults = result["data_schema"]({})[CONF_POLL_TIERS]
+
+    # The stored tier for the boiler, the default for the rest
+    assert defaults[CONF_BOILER] == POLL_TIER_NORMAL
+    assert defaults[CONF_HEATING_CIRCUIT] == POLL_TIER_FAST
+
+    with patch("custom_components.solarfocus.async_setup_entry", return_value=True):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            {
+                **OPTIONS_INPUT,
+                CONF_POLL_TIERS: {
+                    CONF_HEATING_CIRCUIT: POLL_TIER_FAST,
+                    CONF_BUFFER: POLL_TIER_SLOW,
+                },
+            },
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_POLL_TIERS] == {
+        CONF_BUFFER: POLL_TIER_SLOW,
+        CONF_BOILER: POLL_TIER_NORMAL,
+    }
+
+
 async def test_the_options_form_does_not_ask_for_the_connection(
     hass: HomeAssistant, enable_custom_integrations, mock_api
 ) -> None:
@@ -0,0 +1,67 @@
+"""Test the connections the entries of one controller address share."""
+
+from custom_components.solarfocus.connection import async_get_connection_pool
+from homeassistant.core import HomeAssistant
+
+from .conftest import FakeModbusClient
+
+
+async def test_entries_for_one_address_share_its_connection(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """And its turns: one scheduler for whoever reads over it."""
+    pool = async_get_connection_pool(hass)
+
+    first = pool.acquire("solarfocus.local", 502, "first")
+    second = pool.acquire("solarfocus.local", 502, "second")
+
+    assert first is second
+    assert first.users == {"first", "second"}
+    assert first.address == "solarfocus.local:502"
+
+
+async def test_another_port_is_another_controller(hass: HomeAssistant) -> None:
+    """Keyed like the unique id of an entry, host and port."""
+    pool = async_get_connection_pool(hass)
+
+    first = pool.acquire("solarfocus.local", 502, "first")
+    second = pool.acquire("solarfocus.local", 503, "second")
+
+    assert first is not second
+    assert first.client is not second.client
+    assert first.scheduler is not second.scheduler
+
+
+async def test_the_connection_is_closed_by_the_last_entry_to_let_go(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """Not by the first, which would cut the other off half way through a poll."""
+    pool = async_get_connection_pool(hass)
+    first = pool.acquire("solarfocus.local", 502, "first")
+    pool.acquire("solarfocus.local", 502, "second")
+    await modbus_client.async_connect()
+
+    await pool.async_release(first, "first")
+    assert modbus_client.is_connected
+
+    await pool.async_release(first, "second")
+    assert not modbus_client.is_connected
+
+    # The next entry for the address starts a connection of its own
+    assert pool.acquire("solarfocus.local", 502, "third") is not first
+
+
+async def test_letting_go_twice_leaves_the_next_connection_alone(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """Such as a setup that fails closing, and the unload closing once more."""
+    pool = async_get_connection_pool(hass)
+    old = pool.acquire("solarfocus.local", 502, "entry")
+    await pool.async_release(old, "entry")
+
+    new = pool.acquire("solarfocus.local", 502, "entry")
+    await modbus_client.async_connect()
+    await pool.async_release(old, "entry")
+
+    assert modbus_client.is_connected
+    assert pool.acquire("solarfocus.local", 502, "other") is new
@@ -1,11 +1,21 @@
 """Test the Solarfocus data update coordinator."""
 
+import asyncio
 from datetime import timedelta
 import logging
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
 
 from pysolarfocus import ApiVersions
+from pysolarfocus.components.base.enums import RegisterTypes
 import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
+from custom_components.solarfocus.breaker import (
+    FAILURE_THRESHOLD,
+    FIRST_BACKOFF,
+    MAX_BACKOFF,
+)
 from custom_components.solarfocus.const import (
     CONF_BIOMASS_BOILER,
     CONF_BOILER,
@@ -18,14 +28,23 @@ from custom_components.solarfocus.const import (
     CONF_PHOTOVOLTAIC,
     CONF_SOLAR,
     DOMAIN,
+    POLL_TIER_PERIODS,
+    POLL_TIER_SLOW,
+)
+from custom_components.solarfocus.coordinator import (
+    WRITE_COOLDOWN,
+    SolarfocusDataUpdateCoordinator,
+    reads_natively,
 )
-from custom_components.solarfocus.coordinator import SolarfocusDataUpdateCoordinator
+from custom_components.solarfocus.modbus import ModbusError
 from homeassistant.const import STATE_UNAVAILABLE
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .conftest import build_api, build_config_entry
+from .conftest import FakeModbusClient, build_api, build_config_entry, build_library_api
 
 # The api version that has every component of the table below - the circulation
 # and the differential module arrived in it, and the entries the tests build
@@ -101,6 +120,218 @@ async def test_all_components_are_polled(hass: HomeAssistant) -> None:
         assert getattr(api, update).called
 
 
+async def test_a_slow_component_is_read_once_every_so_many_polls(
+    hass: HomeAssistant,
+) -> None:
+    """While the components left on the fast tier are read on every one."""
+    api = build_api()
+    coordinator = _coordinator(
+        hass,
+        api,
+        heating_circuit=1,
+        buffer=1,
+        poll_tiers={CONF_BUFFER: POLL_TIER_SLOW},
+    )
+
+    for _ in range(POLL_TIER_PERIODS[POLL_TIER_SLOW] + 1):
+        await coordinator._async_update_data()
+
+    # The first poll, and the one a full period after it
+    assert api.update_buffer.call_count == 2
+    assert api.update_heating.call_count == POLL_TIER_PERIODS[POLL_TIER_SLOW] + 1
+
+
+async def test_a_slow_component_that_failed_is_read_again_on_the_next_poll(
+    hass: HomeAssistant,
+) -> None:
+    """Not left without a value until its turn comes round again."""
+    api = build_api()
+    api.update_buffer.return_value = False
+    coordinator = _coordinator(
+        hass,
+        api,
+        heating_circuit=1,
+        buffer=1,
+        poll_tiers={CONF_BUFFER: POLL_TIER_SLOW},
+    )
+
+    await coordinator._async_update_data()
+    api.update_buffer.return_value = True
+    await coordinator._async_update_data()
+    await coordinator._async_update_data()
+
+    assert api.update_buffer.call_count == 2
+    assert coordinator.failed_components == frozenset()
+
+
+async def test_a_component_that_is_not_due_keeps_its_last_result(
+    hass: HomeAssistant,
+) -> None:
+    """Skipping a read is not the same as reading it successfully."""
+    api = build_api()
+    coordinator = _coordinator(
+        hass,
+        api,
+        heating_circuit=1,
+        buffer=1,
+        poll_tiers={CONF_BUFFER: POLL_TIER_SLOW},
+    )
+    await coordinator._async_update_data()
+
+    # Failing the buffer read from now on, which is only noticed when it is due
+    # again - the entities keep the value they were last read with until then.
+    api.update_buffer.return_value = False
+    await coordinator._async_update_data()
+
+    assert coordinator.failed_components == frozenset()
+    assert api.update_buffer.call_count == 1
+
+
+async def test_a_component_that_keeps_failing_is_only_probed(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Not waited for on every poll, once it has failed enough of them in a row."""
+    api = build_api()
+    api.update_heating.return_value = False
+    coordinator = _coordinator(hass, api, heating_circuit=1, buffer=1)
+
+    for _ in range(FAILURE_THRESHOLD + FIRST_BACKOFF - 1):
+        await coordinator._async_update_data()
+
+    assert api.update_heating.call_count == FAILURE_THRESHOLD
+    assert "has not answered 3 polls in a row" in caplog.text
+    # Still failed, and still unavailable, while it is not read
+    assert coordinator.failed_components == {CONF_HEATING_CIRCUIT}
+
+    await coordinator._async_update_data()
+
+    assert api.update_heating.call_count == FAILURE_THRESHOLD + 1
+    assert api.update_buffer.call_count == FAILURE_THRESHOLD + FIRST_BACKOFF
+
+
+async def test_the_probes_of_a_failing_component_grow_further_apart(
+    hass: HomeAssistant,
+) -> None:
+    """Twice as far each time, up to a limit."""
+    api = build_api()
+    api.update_heating.return_value = False
+    coordinator = _coordinator(hass, api, heating_circuit=1, buffer=1)
+
+    probes = []
+    for poll in range(FAILURE_THRESHOLD + 4 * MAX_BACKOFF):
+        calls = api.update_heating.call_count
+        await coordinator._async_update_data()
+        if api.update_heating.call_count > calls and poll >= FAILURE_THRESHOLD:
+            probes.append(poll)
+
+    gaps = [later - earlier for earlier, later in zip(probes, probes[1:])]
+    assert probes[0] == FAILURE_THRESHOLD - 1 + FIRST_BACKOFF
+    assert gaps[:3] == [2 * FIRST_BACKOFF, 4 * FIRST_BACKOFF, 8 * FIRST_BACKOFF]
+    assert gaps[-1] == MAX_BACKOFF
+
+
+async def test_a_probe_that_answers_brings_the_component_back(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Read on every poll again, and available."""
+    api = build_api()
+    api.update_heating.return_value = False
+    coordinator = _coordinator(hass, api, heating_circuit=1, buffer=1)
+    for _ in range(FAILURE_THRESHOLD):
+        await coordinator._async_update_data()
+
+    api.update_heating.return_value = True
+    for _ in range(FIRST_BACKOFF + 2):
+        await coordinator._async_update_data()
+
+    assert coordinator.failed_components == frozenset()
+    assert not coordinator.breakers.is_open(CONF_HEATING_CIRCUIT)
+    assert api.update_heating.call_count == FAILURE_THRESHOLD + 3
+    assert "heating_circuit of solarfocus.local:502 answers again" in caplog.text
+
+
+async def test_an_outage_does_not_trip_a_breaker(hass: HomeAssistant) -> None:
+    """A system that answers nothing says nothing about any one component."""
+    api = build_api()
+    api.update_heating.return_value = False
+    api.update_buffer.return_value = False
+    coordinator = _coordinator(hass, api, heating_circuit=1, buffer=1)
+
+    for _ in range(FAILURE_THRESHOLD):
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+
+    api.update_buffer.return_value = True
+    await coordinator._async_update_data()
+
+    assert not coordinator.breakers.is_open(CONF_HEATING_CIRCUIT)
+    assert api.update_heating.call_count == FAILURE_THRESHOLD + 1
+
+
+async def test_a_component_that_uses_up_the_poll_is_not_an_outage(
+    hass: HomeAssistant,
+) -> None:
+    """The entry stays available, and the component gets a breaker of its own."""
+    api = build_api()
+    api.update_heating.return_value = False
+    coordinator = _coordinator(hass, api, heating_circuit=1, buffer=1, boiler=1)
+    # No time at all, so the failing read is the only one of its poll
+    coordinator.update_interval = timedelta(0)
+
+    while api.update_heating.call_count < FAILURE_THRESHOLD:
+        await coordinator._async_update_data()
+        assert coordinator.failed_components == {CONF_HEATING_CIRCUIT}
+
+    assert coordinator.breakers.is_open(CONF_HEATING_CIRCUIT)
+    assert api.update_buffer.call_count == FAILURE_THRESHOLD - 1
+    assert api.update_boiler.call_count == FAILURE_THRESHOLD - 1
+
+
+async def test_a_poll_out_of_time_leaves_the_rest_to_the_next(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Which reads them first, so every component gets its turn."""
+    api = build_api()
+    coordinator = _coordinator(hass, api, heating_circuit=1, buffer=1, boiler=1)
+    # No time at all, so every poll reads one component and no more
+    coordinator.update_interval = timedelta(0)
+    updates = {
+        api.update_heating: CONF_HEATING_CIRCUIT,
+        api.update_buffer: CONF_BUFFER,
+        api.update_boiler: CONF_BOILER,
+    }
+    read = []
+    for update, option in updates.items():
+        update.side_effect = lambda option=option: read.append(option) or True
+
+    for _ in range(6):
+        await coordinator._async_update_data()
+
+    assert read == [CONF_HEATING_CIRCUIT, CONF_BUFFER, CONF_BOILER] * 2
+    assert coordinator.overruns == 6
+    assert coordinator.failed_components == frozenset()
+    assert [
+        record.levelno
+        for record in caplog.records
+        if "took longer than" in record.getMessage()
+    ] == [logging.WARNING] + [logging.DEBUG] * 5
+
+
+async def test_a_poll_in_time_reads_everything_that_is_due(
+    hass: HomeAssistant,
+) -> None:
+    """And is no overrun."""
+    api = build_api()
+    coordinator = _coordinator(hass, api, heating_circuit=1, buffer=1, boiler=1)
+
+    await coordinator._async_update_data()
+
+    assert api.update_heating.called
+    assert api.update_buffer.called
+    assert api.update_boiler.called
+    assert coordinator.overruns == 0
+
+
 async def test_scan_interval_is_taken_from_the_options(hass: HomeAssistant) -> None:
     """The configured scan interval becomes the update interval."""
     coordinator = _coordinator(hass, build_api(), scan_interval=42)
@@ -122,6 +353,22 @@ async def test_coordinator_keeps_the_entry(hass: HomeAssistant) -> None:
     assert entry.title == "Solarfocus"
 
 
+async def test_the_library_is_charged_a_request_per_register_slice(
+    hass: HomeAssistant,
+) -> None:
+    """What its `update_*` calls send, so its read statistics are not all 0."""
+    api = build_api()
+    boiler = MagicMock(input_slices=[object(), object()], holding_slices=[object()])
+    api.boilers = [boiler]
+    coordinator = _coordinator(hass, api, heating_circuit=0, boiler=1)
+
+    await coordinator._async_update_data()
+
+    statistics = coordinator.read_statistics.component(boiler)
+    assert statistics is not None
+    assert statistics.transactions == 3
+
+
 async def test_reconnects_before_updating(hass: HomeAssistant) -> None:
     """A dropped connection is re-established on the next refresh."""
     api = build_api()
@@ -456,3 +703,504 @@ async def test_successful_update_is_logged(
         await coordinator._async_update_data()
 
     assert "Data updated successfully" in caplog.text
+
+
+def _native_coordinator(
+    hass: HomeAssistant, **options
+) -> SolarfocusDataUpdateCoordinator:
+    """Create a coordinator over a real SolarfocusAPI for the given options."""
+    entry = build_config_entry(**options)
+    entry.add_to_hass(hass)
+    return SolarfocusDataUpdateCoordinator(hass, entry, build_library_api(entry))
+
+
+async def test_the_library_is_read_off_the_event_loop(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """A real api is read over the coordinator's own connection, not the executor."""
+    coordinator = _native_coordinator(hass, boiler=1, heating_circuit=1)
+    modbus_client.registers[(RegisterTypes.INPUT, 500)] = 453
+
+    await coordinator._async_update_data()
+
+    assert modbus_client.connects == 1
+    assert coordinator.is_connected
+    assert coordinator.api.boilers[0].temperature.scaled_value == pytest.approx(45.3)
+    # Both components, each register type of them in one request: the heating
+    # circuit's holding registers are three slices the planner joins up.
+    assert sorted(address for _, address, _ in modbus_client.reads) == [
+        500,
+        1100,
+        32000,
+        32600,
+    ]
+
+
+async def test_a_mocked_api_is_read_through_the_library(hass: HomeAssistant) -> None:
+    """Anything but a pysolarfocus api falls back to its own `update_*` calls."""
+    assert not reads_natively(build_api())
+
+    entry = build_config_entry(boiler=1)
+    assert reads_natively(build_library_api(entry))
+
+
+async def test_a_component_that_is_not_answered_fails_on_its_own(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """The connection is still up, so the others are read and it is named."""
+    coordinator = _native_coordinator(hass, boiler=1, heating_circuit=1)
+    modbus_client.unanswered.add(32000)
+
+    await coordinator._async_update_data()
+
+    assert coordinator.failed_components == {CONF_BOILER}
+
+
+async def test_a_dropped_connection_fails_the_refresh(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """A read that drops the connection is the system gone, not the component."""
+    coordinator = _native_coordinator(hass, boiler=1, heating_circuit=1)
+    await coordinator._async_update_data()
+
+    async def _drop(*_: object) -> list[int]:
+        modbus_client.connected = False
+        raise ModbusError("Connection lost")
+
+    modbus_client.async_read_registers = _drop  # type: ignore[method-assign]
+
+    with pytest.raises(UpdateFailed) as failure:
+        await coordinator._async_update_data()
+
+    assert failure.value.translation_key == "cannot_connect"
+    assert coordinator.failed_components == frozenset()
+
+
+async def test_closing_the_coordinator_closes_its_connection(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """An entry that unloads does not leave a connection to the controller open."""
+    coordinator = _native_coordinator(hass, boiler=1)
+    await coordinator._async_update_data()
+
+    await coordinator.async_close()
+
+    assert not modbus_client.is_connected
+
+
+def _show(
+    coordinator: SolarfocusDataUpdateCoordinator, option: str, component, *items: str
+):
+    """Add a reader of some values of a component, as an entity that is shown.
+
+    Which keeps the coordinator polling, as it would for the entity, until it
+    is shut down.
+    """
+    return coordinator.async_add_reader(option, component, items, lambda: None)
+
+
+async def test_only_the_registers_of_shown_entities_are_read(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """A component none of whose entities is shown is not read at all."""
+    coordinator = _native_coordinator(hass, boiler=1, heating_circuit=1)
+    boiler = coordinator.api.boilers[0]
+    _show(coordinator, CONF_BOILER, boiler, "mode")
+    coordinator.async_read_only_what_is_shown()
+
+    await coordinator._async_update_data()
+
+    assert modbus_client.reads == [(RegisterTypes.INPUT, 502, 1)]
+
+    await coordinator.async_shutdown()
+
+
+async def test_everything_is_read_until_the_entities_are_added(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """The first refresh is what the entities show when they are added."""
+    coordinator = _native_coordinator(hass, boiler=1)
+    _show(coordinator, CONF_BOILER, coordinator.api.boilers[0], "mode")
+
+    await coordinator._async_update_data()
+
+    assert sorted(address for _, address, _ in modbus_client.reads) == [500, 32000]
+
+    await coordinator.async_shutdown()
+
+
+async def test_a_register_that_is_not_read_keeps_its_value(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """The library parses a component whole, including what was left out."""
+    coordinator = _native_coordinator(hass, boiler=1)
+    boiler = coordinator.api.boilers[0]
+    # Negative, which is what puts the way it is handed back to the test
+    modbus_client.registers[(RegisterTypes.INPUT, 500)] = 0x10000 - 53
+    await coordinator._async_update_data()
+
+    _show(coordinator, CONF_BOILER, boiler, "mode")
+    coordinator.async_read_only_what_is_shown()
+    modbus_client.registers[(RegisterTypes.INPUT, 500)] = 600
+    modbus_client.registers[(RegisterTypes.INPUT, 502)] = 2
+    await coordinator._async_update_data()
+
+    assert boiler.mode.value == 2
+    assert boiler.temperature.scaled_value == pytest.approx(-5.3)
+
+    await coordinator.async_shutdown()
+
+
+async def test_an_entity_going_away_takes_its_registers_with_it(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """Disabling an entity shortens the poll without reloading the entry."""
+    coordinator = _native_coordinator(hass, boiler=1)
+    boiler = coordinator.api.boilers[0]
+    _show(coordinator, CONF_BOILER, boiler, "mode")
+    remove = _show(coordinator, CONF_BOILER, boiler, "target_temperature")
+    coordinator.async_read_only_what_is_shown()
+    await coordinator._async_update_data()
+    assert len(modbus_client.reads) == 2
+
+    remove()
+    modbus_client.reads.clear()
+    await coordinator._async_update_data()
+
+    assert modbus_client.reads == [(RegisterTypes.INPUT, 502, 1)]
+
+    await coordinator.async_shutdown()
+
+
+async def test_a_component_nothing_is_shown_of_is_not_polled(
+    hass: HomeAssistant,
+) -> None:
+    """Through the library too, which reads components whole or not at all."""
+    api = build_api()
+    coordinator = _coordinator(hass, api, boiler=1, buffer=1)
+    _show(coordinator, CONF_BUFFER, api.buffers[0], "top_temperature")
+    coordinator.async_read_only_what_is_shown()
+
+    await coordinator._async_update_data()
+
+    assert api.update_buffer.called
+    assert not api.update_boiler.called
+
+    await coordinator.async_shutdown()
+
+
+async def test_only_the_entities_whose_registers_changed_are_written(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """A refresh that reads the same value again has nothing to tell anybody."""
+    coordinator = _native_coordinator(hass, boiler=1)
+    boiler = coordinator.api.boilers[0]
+    temperature, mode = MagicMock(), MagicMock()
+    coordinator.async_add_reader(CONF_BOILER, boiler, ("temperature",), temperature)
+    coordinator.async_add_reader(CONF_BOILER, boiler, ("mode",), mode)
+    coordinator.async_read_only_what_is_shown()
+    await coordinator.async_refresh()
+    temperature.reset_mock()
+    mode.reset_mock()
+
+    await coordinator.async_refresh()
+    assert not temperature.called
+    assert not mode.called
+
+    modbus_client.registers[(RegisterTypes.INPUT, 502)] = 3
+    await coordinator.async_refresh()
+    assert not temperature.called
+    assert mode.called
+
+    await coordinator.async_shutdown()
+
+
+async def test_a_component_is_written_as_soon_as_it_is_read(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """Before the components read after it, and not once more at the end."""
+    coordinator = _native_coordinator(hass, boiler=1, heating_circuit=1)
+    boiler = coordinator.api.boilers[0]
+    circuit = coordinator.api.heating_circuits[0]
+    written_after: list[int] = []
+    temperature = MagicMock(
+        side_effect=lambda: written_after.append(len(modbus_client.reads))
+    )
+    coordinator.async_add_reader(CONF_BOILER, boiler, ("temperature",), temperature)
+    coordinator.async_add_reader(
+        CONF_HEATING_CIRCUIT, circuit, ("supply_temperature",), MagicMock()
+    )
+    coordinator.async_read_only_what_is_shown()
+    await coordinator.async_refresh()
+    written_after.clear()
+    modbus_client.reads.clear()
+
+    modbus_client.registers[(RegisterTypes.INPUT, 500)] = 450
+    await coordinator.async_refresh()
+
+    # The boiler is the first request of the poll, the circuit the second
+    assert written_after == [1]
+    assert len(modbus_client.reads) == 2
+
+    await coordinator.async_shutdown()
+
+
+async def test_a_component_that_starts_failing_is_written_unchanged(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """Its entities go unavailable, which is a change of their state too."""
+    coordinator = _native_coordinator(hass, boiler=1, heating_circuit=1)
+    boiler_mode, circuit = MagicMock(), MagicMock()
+    coordinator.async_add_reader(
+        CONF_BOILER, coordinator.api.boilers[0], ("mode",), boiler_mode
+    )
+    coordinator.async_add_reader(
+        CONF_HEATING_CIRCUIT,
+        coordinator.api.heating_circuits[0],
+        ("supply_temperature",),
+        circuit,
+    )
+    coordinator.async_read_only_what_is_shown()
+    await coordinator.async_refresh()
+    boiler_mode.reset_mock()
+    circuit.reset_mock()
+
+    modbus_client.unanswered.add(502)
+    await coordinator.async_refresh()
+
+    assert coordinator.failed_components == {CONF_BOILER}
+    assert boiler_mode.called
+    assert not circuit.called
+
+    await coordinator.async_shutdown()
+
+
+async def test_every_entity_is_written_when_the_system_comes_back(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """Whether its value changed while it was away or not."""
+    coordinator = _native_coordinator(hass, boiler=1)
+    mode = MagicMock()
+    coordinator.async_add_reader(
+        CONF_BOILER, coordinator.api.boilers[0], ("mode",), mode
+    )
+    coordinator.async_read_only_what_is_shown()
+    await coordinator.async_refresh()
+
+    modbus_client.connected = False
+    modbus_client.async_connect = AsyncMock(return_value=False)  # type: ignore[method-assign]
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    mode.reset_mock()
+
+    # Back to the fake's own, which connects
+    del modbus_client.async_connect
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert mode.called
+
+    await coordinator.async_shutdown()
+
+
+async def test_a_write_goes_out_over_the_coordinator_connection(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """Not the library's, and the component is read back after it."""
+    coordinator = _native_coordinator(hass, boiler=1)
+    boiler = coordinator.api.boilers[0]
+
+    await coordinator.async_write(boiler, {"holding_mode": 2})
+
+    assert modbus_client.writes == [(32002, [2])]
+    assert boiler.holding_mode.value == 2
+
+
+async def test_only_the_registers_written_are_read_back(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """The rest of the component keeps what the last poll read for it."""
+    coordinator = _native_coordinator(hass, boiler=1)
+    boiler = coordinator.api.boilers[0]
+    boiler.temperature.value = 400
+    modbus_client.registers[(RegisterTypes.INPUT, 500)] = 453
+
+    await coordinator.async_write(boiler, {"holding_mode": 2})
+
+    assert modbus_client.reads == [(RegisterTypes.HOLDING, 32002, 1)]
+    assert boiler.temperature.scaled_value == pytest.approx(40.0)
+
+
+async def test_a_write_with_side_effects_reads_the_component_back_whole(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """Like the state of a boiler, after its mode was written."""
+    coordinator = _native_coordinator(hass, boiler=1)
+    boiler = coordinator.api.boilers[0]
+    modbus_client.registers[(RegisterTypes.INPUT, 500)] = 453
+
+    await coordinator.async_write(boiler, {"holding_mode": 2}, side_effects=True)
+
+    assert boiler.temperature.scaled_value == pytest.approx(45.3)
+
+
+async def test_a_negative_value_is_written_as_twos_complement(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """And read back as the signed value it was."""
+    coordinator = _native_coordinator(
+        hass, photovoltaic=True, api_version=ApiVersions.V_26_020.value
+    )
+    photovoltaic = coordinator.api.photovoltaic
+
+    await coordinator.async_write(photovoltaic, {"grid_im_export": -500})
+
+    assert modbus_client.writes == [(33409, [65036])]
+    assert photovoltaic.grid_im_export.scaled_value == -500
+
+
+async def test_a_write_the_controller_refuses_raises(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """The service call that asked for it fails, with the value it was about."""
+    coordinator = _native_coordinator(hass, boiler=1)
+    await modbus_client.async_connect()
+    modbus_client.unanswered.add(32002)
+
+    with pytest.raises(HomeAssistantError) as failure:
+        await coordinator.async_write(coordinator.api.boilers[0], {"holding_mode": 2})
+
+    assert failure.value.translation_key == "cannot_write"
+    assert failure.value.translation_placeholders["item"] == "holding_mode"
+
+
+async def test_registers_next_to_each_other_are_written_in_one_request(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """The mode change of a heating circuit, and one read-back after all of it."""
+    coordinator = _native_coordinator(
+        hass, heating_circuit=1, api_version=EVERY_COMPONENT_VERSION
+    )
+
+    await coordinator.async_write(
+        coordinator.api.heating_circuits[0],
+        {
+            "target_supply_temperature": 38.0,
+            "cooling": 0,
+            "mode": 2,
+            "heating_mode": 2,
+        },
+    )
+
+    # Nothing is written over 32601 and 32604-32607 to join them up
+    assert modbus_client.writes == [
+        (32600, [380]),
+        (32602, [0, 2]),
+        (32608, [2]),
+    ]
+    # And read back in one request, 32600 to 32608
+    assert modbus_client.reads == [(RegisterTypes.HOLDING, 32600, 9)]
+
+
+async def test_a_run_of_setpoints_is_written_as_its_first_and_its_last(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """The ones in between were never going to matter to the controller."""
+    coordinator = _native_coordinator(hass, boiler=1)
+    boiler = coordinator.api.boilers[0]
+    target = MagicMock()
+    coordinator.async_add_reader(CONF_BOILER, boiler, ("target_temperature",), target)
+
+    for value in (50, 51, 52, 53):
+        await coordinator.async_write_latest(boiler, "target_temperature", value)
+
+    assert modbus_client.writes == [(32000, [500])]
+    assert target.call_count == 1
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=WRITE_COOLDOWN))
+    await hass.async_block_till_done()
+
+    assert modbus_client.writes == [(32000, [500]), (32000, [530])]
+    assert target.call_count == 2
+    assert coordinator.dropped_writes == 2
+
+    await coordinator.async_close()
+    await coordinator.async_shutdown()
+
+
+async def test_a_setpoint_held_back_that_cannot_be_written_is_logged(
+    hass: HomeAssistant,
+    modbus_client: FakeModbusClient,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """And shown as what the register held, the service call being long gone."""
+    coordinator = _native_coordinator(hass, boiler=1)
+    boiler = coordinator.api.boilers[0]
+    target = MagicMock()
+    coordinator.async_add_reader(CONF_BOILER, boiler, ("target_temperature",), target)
+    await coordinator.async_write_latest(boiler, "target_temperature", 50)
+
+    modbus_client.unanswered.add(32000)
+    await coordinator.async_write_latest(boiler, "target_temperature", 53)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=WRITE_COOLDOWN))
+    await hass.async_block_till_done()
+
+    assert modbus_client.writes == [(32000, [500]), (32000, [530])]
+    assert boiler.target_temperature.value == 500
+    assert target.call_count == 2
+    assert (
+        "Cannot write 53 to target_temperature of solarfocus.local:502, "
+        "register 32000" in caplog.text
+    )
+    assert "Unexpected exception" not in caplog.text
+
+    await coordinator.async_close()
+    await coordinator.async_shutdown()
+
+
+async def test_a_setpoint_the_register_holds_already_is_not_written(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """Whatever automation keeps sending it."""
+    coordinator = _native_coordinator(hass, boiler=1)
+    boiler = coordinator.api.boilers[0]
+    modbus_client.registers[(RegisterTypes.HOLDING, 32000)] = 550
+    await coordinator._async_update_data()
+
+    await coordinator.async_write_latest(boiler, "target_temperature", 55)
+
+    assert not modbus_client.writes
+    assert coordinator.dropped_writes == 1
+
+    await coordinator.async_close()
+
+
+async def test_a_write_waits_for_the_poll_that_is_reading(
+    hass: HomeAssistant, modbus_client: FakeModbusClient
+) -> None:
+    """Rather than its requests going out in between those of the poll."""
+    coordinator = _native_coordinator(hass, boiler=1)
+    await modbus_client.async_connect()
+    reading = asyncio.Event()
+    answer = asyncio.Event()
+    read = modbus_client.async_read_registers
+
+    async def _slow_read(*args: Any) -> list[int]:
+        reading.set()
+        await answer.wait()
+        return await read(*args)
+
+    modbus_client.async_read_registers = _slow_read  # type: ignore[method-assign]
+    poll = hass.async_create_task(coordinator._async_update_data())
+    await reading.wait()
+    write = hass.async_create_task(
+        coordinator.async_write(coordinator.api.boilers[0], {"holding_mode": 2})
+    )
+    await asyncio.sleep(0)
+
+    assert not modbus_client.writes
+
+    answer.set()
+    await asyncio.gather(poll, write)
+
+    assert modbus_client.writes == [(32002, [2])]
@@ -106,6 +106,8 @@ async def test_diagnostics_describe_how_the_entry_is_configured(
     assert entry["options"]["heating_circuit"] == 2
     assert entry["data"]["api_version"] == ApiVersions.V_23_020.value
     assert entry["data"]["system"] is not None
+    # One request at a time, as the options have it
+    assert diagnostics["coordinator"]["pipeline_window"] == 1
 
 
 async def test_diagnostics_report_the_registers_of_every_component(
@@ -162,6 +164,7 @@ async def test_diagnostics_name_the_components_that_could_not_be_read(
 
     assert diagnostics["coordinator"]["last_update_success"] is True
     assert diagnostics["coordinator"]["failed_components"] == []
+    assert diagnostics["coordinator"]["dropped_writes"] == 0
 
     api.update_boiler.return_value = False
     await entry.runtime_data.async_refresh()
@@ -170,6 +173,7 @@ async def test_diagnostics_name_the_components_that_could_not_be_read(
 
     assert diagnostics["coordinator"]["last_update_success"] is True
     assert diagnostics["coordinator"]["failed_components"] == ["boiler"]
+    assert diagnostics["coordinator"]["breakers"]["boiler"]["failures"] == 1
 
 
 async def test_diagnostics_do_not_blame_one_component_for_a_whole_outage(
@@ -204,3 +208,16 @@ async def test_diagnostics_do_not_blame_one_component_for_a_whole_outage(
 
     assert diagnostics["coordinator"]["last_update_success"] is False
     assert diagnostics["coordinator"]["failed_components"] == []
+
+
+async def test_diagnostics_say_what_reading_each_component_cost(
+    hass: HomeAssistant, enable_custom_integrations, mock_api, api
+) -> None:
+    """Under the name the component has in `components`, to find the slow one."""
+    diagnostics = await _diagnostics(hass, api, heating_circuit=1, boiler=1)
+
+    statistics = diagnostics["coordinator"]["read_statistics"]
+
+    assert set(statistics["components"]) >= {"heating_circuits[0]", "boilers[0]"}
+    assert statistics["components"]["boilers[0]"]["errors"] == 0
+    assert statistics["components"]["boilers[0]"]["polls"] >= 1
@@ -1,11 +1,12 @@
 """Test what the entity classes read from and write to the device.
 
 Every entity reads its value through `_get_native_value` and writes it through
-`_set_native_value`, which address a pysolarfocus component by name and index.
+`_async_set_native_value`, which address a pysolarfocus component by name and index.
 These tests pin the mapping down for one entity of every platform.
 """
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from dataclasses import replace
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 
@@ -65,7 +66,7 @@ from custom_components.solarfocus.water_heater import (
 )
 from homeassistant.const import ATTR_TEMPERATURE, STATE_OFF, UnitOfTemperature
 
-from .conftest import build_config_entry, build_coordinator
+from .conftest import build_api, build_config_entry, build_coordinator
 
 
 def _make(entity_class, description, component, component_prefix, idx="1"):
@@ -160,6 +161,42 @@ def test_a_component_that_exists_once_is_not_numbered() -> None:
     assert entity.device_info["translation_placeholders"] == {"idx": ""}
 
 
+def test_a_description_is_bound_once_for_every_entity_built_from_it() -> None:
+    """A reload, or a second entry, gets the very description the first got."""
+    first = create_description(
+        BOILER_COMPONENT, BOILER_COMPONENT_PREFIX, "1", BOILER_SENSOR_TYPES[0]
+    )
+    again = create_description(
+        BOILER_COMPONENT, BOILER_COMPONENT_PREFIX, "1", BOILER_SENSOR_TYPES[0]
+    )
+    second = create_description(
+        BOILER_COMPONENT, BOILER_COMPONENT_PREFIX, "2", BOILER_SENSOR_TYPES[0]
+    )
+
+    assert again is first
+    assert second is not first
+    assert second.key == f"bo2_{BOILER_SENSOR_TYPES[0].key}"
+
+
+def test_a_new_description_under_a_bound_key_is_bound_of_its_own() -> None:
+    """Not served the description another one with its key was bound to."""
+    first = create_description(
+        BOILER_COMPONENT,
+        BOILER_COMPONENT_PREFIX,
+        "1",
+        replace(BOILER_SENSOR_TYPES[0], min_required_version="21.140"),
+    )
+    changed = create_description(
+        BOILER_COMPONENT,
+        BOILER_COMPONENT_PREFIX,
+        "1",
+        replace(BOILER_SENSOR_TYPES[0], min_required_version="25.030"),
+    )
+
+    assert changed is not first
+    assert changed.min_required_version == "25.030"
+
+
 def test_device_info_values_are_strings() -> None:
     """The device registry rejects anything else from 2026.12 on.
 
@@ -368,8 +405,46 @@ def test_components_without_an_index_are_read_directly() -> None:
     assert entity._get_native_value("evu_lock") == 1
 
 
-async def test_async_update_requests_a_coordinator_refresh() -> None:
-    """Polling an entity refreshes the whole device."""
+def test_a_register_is_looked_up_once_for_the_api_it_is_on() -> None:
+    """Read again by the register it resolved to, until the api is another one."""
+    entity = _make(
+        SolarfocusSensor,
+        BOILER_SENSOR_TYPES[0],
+        BOILER_COMPONENT,
+        BOILER_COMPONENT_PREFIX,
+    )
+    api = entity.coordinator.api
+    api.boilers = [MagicMock()]
+    api.boilers[0].temperature.scaled_value = 55
+    assert entity._get_native_value("temperature") == 55
+
+    # A read changes what a register holds, never which register it is
+    bound = api.boilers[0]
+    api.boilers = [MagicMock()]
+    bound.temperature.scaled_value = 56
+    assert entity._get_native_value("temperature") == 56
+
+    entity.coordinator.api = build_api()
+    entity.coordinator.api.boilers = [MagicMock()]
+    entity.coordinator.api.boilers[0].temperature.scaled_value = 40
+    assert entity._get_native_value("temperature") == 40
+    assert entity._component is entity.coordinator.api.boilers[0]
+
+
+def test_entity_is_not_polled_on_its_own() -> None:
+    """The coordinator polls for every entity, and tells each when it has news."""
+    entity = _make(
+        SolarfocusSensor,
+        BOILER_SENSOR_TYPES[0],
+        BOILER_COMPONENT,
+        BOILER_COMPONENT_PREFIX,
+    )
+
+    assert not entity.should_poll
+
+
+async def test_updating_an_entity_refreshes_the_coordinator() -> None:
+    """What `homeassistant.update_entity` calls, although nothing polls it."""
     entity = _make(
         SolarfocusSensor,
         BOILER_SENSOR_TYPES[0],
@@ -384,24 +459,42 @@ async def test_async_update_requests_a_coordinator_refresh() -> None:
 
 
 async def test_entity_follows_the_coordinator_while_added() -> None:
-    """The entity writes its state whenever the coordinator has new data."""
+    """The entity writes its state whenever the coordinator has new data for it.
+
+    Which is the register its description names, on the instance it is built
+    for.
+    """
     entity = _make(
         SolarfocusSensor,
         BOILER_SENSOR_TYPES[0],
         BOILER_COMPONENT,
         BOILER_COMPONENT_PREFIX,
     )
-    remove_listener = MagicMock()
-    entity.coordinator.async_add_listener.return_value = remove_listener
+    remove_reader = MagicMock()
+    entity.coordinator.async_add_reader.return_value = remove_reader
     entity.async_on_remove = MagicMock()
 
     await entity.async_added_to_hass()
 
-    entity.coordinator.async_add_listener.assert_called_once_with(
-        entity.async_write_ha_state
+    entity.coordinator.async_add_reader.assert_called_once_with(
+        CONF_BOILER,
+        entity.coordinator.api.boilers[0],
+        (BOILER_SENSOR_TYPES[0].key,),
+        entity.async_write_ha_state,
     )
     # The listener is removed again when the entity goes away
-    entity.async_on_remove.assert_called_once_with(remove_listener)
+    entity.async_on_remove.assert_called_once_with(remove_reader)
+
+
+def test_water_heater_reads_every_value_it_shows(
+    boiler_water_heater: SolarfocusWaterHeaterEntity,
+) -> None:
+    """Not only the one register its description names."""
+    assert set(boiler_water_heater.register_items) == {
+        "temperature",
+        "target_temperature",
+        "mode",
+    }
 
 
 # --- sensor -----------------------------------------------------------------
@@ -455,10 +548,11 @@ async def test_number_writes_the_value() -> None:
         BOILER_COMPONENT_PREFIX,
     )
 
-    with patch.object(entity, "_set_native_value") as set_value:
-        await entity.async_set_native_value(60)
+    await entity.async_set_native_value(60)
 
-    assert set_value.call_args_list == [(("target_temperature", 60),)]
+    entity.coordinator.async_write_latest.assert_awaited_once_with(
+        entity.coordinator.api.boilers[0], "target_temperature", 60
+    )
 
 
 def test_number_reads_the_value() -> None:
@@ -489,10 +583,10 @@ async def test_select_writes_and_reports_the_option() -> None:
 
     assert entity.options == HEATPUMP_SELECT_TYPES[0].solarfocus_options
 
-    with patch.object(entity, "_set_native_value") as set_value:
+    with patch.object(entity, "_async_set_native_value") as set_value:
         await entity.async_select_option("3")
 
-    assert set_value.call_args_list == [(("smart_grid", "3"),)]
+    assert set_value.call_args_list == [call("smart_grid", "3", side_effects=True)]
 
     entity.coordinator.api.heatpump.smart_grid.scaled_value = 3
     assert entity.current_option == "3"
@@ -511,13 +605,13 @@ async def test_switch_turns_the_lock_on_and_off() -> None:
         idx="",
     )
 
-    with patch.object(entity, "_set_native_value") as set_value:
+    with patch.object(entity, "_async_set_native_value") as set_value:
         await entity.async_turn_on()
         await entity.async_turn_off()
 
     assert set_value.call_args_list == [
-        (("evu_lock", ON),),
-        (("evu_lock", OFF),),
+        call("evu_lock", ON, side_effects=True),
+        call("evu_lock", OFF, side_effects=True),
     ]
 
 
@@ -553,10 +647,10 @@ async def test_button_triggers_its_item(description) -> None:
         BOILER_COMPONENT_PREFIX,
     )
 
-    with patch.object(entity, "_set_native_value") as set_value:
+    with patch.object(entity, "_async_set_native_value") as set_value:
         await entity.async_press()
 
-    assert set_value.call_args_list == [((description.key, 1),)]
+    assert set_value.call_args_list == [call(description.key, 1, side_effects=True)]
     assert not isinstance(set_value.call_args.args[1], bool)
 
 
@@ -608,7 +702,7 @@ def test_water_heater_operation_list_covers_every_device_mode(
 
 async def test_water_heater_sets_the_target_temperature(boiler_water_heater) -> None:
     """Setting the temperature writes the boiler target temperature."""
-    with patch.object(boiler_water_heater, "_set_native_value") as set_value:
+    with patch.object(boiler_water_heater, "_async_set_native_value") as set_value:
         await boiler_water_heater.async_set_temperature(**{ATTR_TEMPERATURE: 52})
 
     assert set_value.call_args_list == [(("target_temperature", 52),)]
@@ -618,7 +712,7 @@ async def test_water_heater_ignores_a_call_without_a_temperature(
     boiler_water_heater,
 ) -> None:
     """A service call without a temperature must not write anything."""
-    with patch.object(boiler_water_heater, "_set_native_value") as set_value:
+    with patch.object(boiler_water_heater, "_async_set_native_value") as set_value:
         await boiler_water_heater.async_set_temperature(operation_mode="auto")
 
     assert not set_value.called
@@ -626,44 +720,59 @@ async def test_water_heater_ignores_a_call_without_a_temperature(
 
 async def test_water_heater_sets_the_operation_mode(boiler_water_heater) -> None:
     """The displayed operation is written back as the numeric device mode."""
-    with patch.object(boiler_water_heater, "_set_native_value") as set_value:
+    with patch.object(boiler_water_heater, "_async_set_native_value") as set_value:
         await boiler_water_heater.async_set_operation_mode(HA_DISPLAY_MODE_BLOCKWISE)
 
     assert set_value.call_args_list == [
-        (("holding_mode", SOLARFOCUS_MODE_BLOCKWISE),)
+        call("holding_mode", SOLARFOCUS_MODE_BLOCKWISE, side_effects=True)
     ]
 
 
 async def test_water_heater_turns_on_and_off(boiler_water_heater) -> None:
     """On and off map to the always on and always off modes."""
-    with patch.object(boiler_water_heater, "_set_native_value") as set_value:
+    with patch.object(boiler_water_heater, "_async_set_native_value") as set_value:
         await boiler_water_heater.async_turn_on()
         await boiler_water_heater.async_turn_off()
 
     assert set_value.call_args_list == [
-        (("holding_mode", SOLARFOCUS_MODE_ALWAYS_ON),),
-        (("holding_mode", SOLARFOCUS_MODE_ALWAYS_OFF),),
+        call("holding_mode", SOLARFOCUS_MODE_ALWAYS_ON, side_effects=True),
+        call("holding_mode", SOLARFOCUS_MODE_ALWAYS_OFF, side_effects=True),
     ]
 
 
 # --- writing ----------------------------------------------------------------
 
 
-def test_set_native_value_writes_and_refreshes_the_component() -> None:
-    """Writing commits the register and reads the component back."""
+async def test_set_native_value_writes_through_the_coordinator() -> None:
+    """The value goes to the component the entity is on, and the state follows."""
     entity = _make(
         SolarfocusNumberEntity,
         BOILER_NUMBER_TYPES[0],
         BOILER_COMPONENT,
         BOILER_COMPONENT_PREFIX,
+        idx="2",
     )
-    boiler = entity.coordinator.api.boilers[0]
-    boiler.target_temperature.value = 55
-    boiler.target_temperature.count = 1
 
-    entity._set_native_value("target_temperature", 55)
+    await entity._async_set_native_value("target_temperature", 55)
 
-    boiler.target_temperature.set_unscaled_value.assert_called_once_with(55)
-    boiler.target_temperature.commit.assert_called_once()
-    boiler.update.assert_called_once()
+    entity.coordinator.async_write.assert_awaited_once_with(
+        entity.coordinator.api.boilers[1],
+        {"target_temperature": 55},
+        side_effects=False,
+    )
     entity.async_write_ha_state.assert_called_once()
+
+
+async def test_a_mode_is_written_with_its_side_effects() -> None:
+    """The state the component reports follows a mode, so all of it is read back."""
+    entity = _make(
+        SolarfocusSelectEntity,
+        HEATPUMP_SELECT_TYPES[0],
+        HEAT_PUMP_COMPONENT,
+        HEAT_PUMP_COMPONENT_PREFIX,
+        idx="",
+    )
+
+    await entity.async_select_option(entity.options[0])
+
+    assert entity.coordinator.async_write.await_args.kwargs == {"side_effects": True}
@@ -6,16 +6,27 @@ from pysolarfocus import ApiVersions
 from pysolarfocus.components.photovoltaic import Photovoltaic
 
 from custom_components.solarfocus.const import PHOTOVOLTAIC_COMPONENT
+from custom_components.solarfocus.coordinator import SolarfocusDataUpdateCoordinator
 from custom_components.solarfocus.entity import (
     SolarfocusEntity,
     SolarfocusEntityDescription,
 )
+from homeassistant.core import HomeAssistant
 
+from .conftest import build_api, build_config_entry
 
-def _entity(photovoltaic: Photovoltaic) -> SolarfocusEntity:
-    """Create an entity writing to the photovoltaic component."""
-    coordinator = MagicMock()
-    coordinator.api.photovoltaic = photovoltaic
+
+def _entity(hass: HomeAssistant, photovoltaic: Photovoltaic) -> SolarfocusEntity:
+    """Create an entity writing to the photovoltaic component.
+
+    The api is a mock, so the coordinator writes through the library, the way
+    it does for an api it cannot read natively.
+    """
+    entry = build_config_entry(photovoltaic=True)
+    entry.add_to_hass(hass)
+    api = build_api()
+    api.photovoltaic = photovoltaic
+    coordinator = SolarfocusDataUpdateCoordinator(hass, entry, api)
 
     entity = SolarfocusEntity(
         coordinator,
@@ -29,7 +40,9 @@ def _entity(photovoltaic: Photovoltaic) -> SolarfocusEntity:
     return entity
 
 
-def test_set_native_value_writes_negative_value_as_twos_complement():
+async def test_set_native_value_writes_negative_value_as_twos_complement(
+    hass: HomeAssistant,
+) -> None:
     """Negative values have to be written as unsigned words."""
     modbus = MagicMock()
     modbus.write_register.return_value = True
@@ -37,14 +50,16 @@ def test_set_native_value_writes_negative_value_as_twos_complement():
     # Don't let the read-back of the component overwrite the written value
     photovoltaic.update = MagicMock()
 
-    _entity(photovoltaic)._set_native_value("grid_im_export", -500)
+    await _entity(hass, photovoltaic)._async_set_native_value("grid_im_export", -500)
 
     modbus.write_register.assert_called_once_with(65036, 33409)
     # The entity keeps reporting the signed value
     assert photovoltaic.grid_im_export.scaled_value == -500
 
 
-def test_set_native_value_writes_positive_value_unchanged():
+async def test_set_native_value_writes_positive_value_unchanged(
+    hass: HomeAssistant,
+) -> None:
     """Positive values are written as they are."""
     modbus = MagicMock()
     modbus.write_register.return_value = True
@@ -52,7 +67,7 @@ def test_set_native_value_writes_positive_value_unchanged():
     # Don't let the read-back of the component overwrite the written value
     photovoltaic.update = MagicMock()
 
-    _entity(photovoltaic)._set_native_value("grid_im_export", 500)
+    await _entity(hass, photovoltaic)._async_set_native_value("grid_im_export", 500)
 
     modbus.write_register.assert_called_once_with(500, 33409)
     assert photovoltaic.grid_im_export.scaled_value == 500
@@ -10,6 +10,7 @@ These tests walk every description in every platform and assert the attribute ex
 for each system the description is not explicitly excluded from.
 """
 
+from packaging import version
 import pytest
 from pysolarfocus import ApiVersions, SolarfocusAPI, Systems
 
@@ -34,6 +35,7 @@ from custom_components.solarfocus.const import (
     HEATING_CIRCUIT_COMPONENT,
     PHOTOVOLTAIC_COMPONENT,
     SOLAR_COMPONENT,
+    capabilities,
 )
 
 # Entity description list -> the SolarfocusAPI attribute it is read from.
@@ -290,3 +292,31 @@ def test_the_octoplus_has_no_door_contact() -> None:
     ]
 
     assert not reaching
+
+
+def test_every_description_arrived_with_a_version_the_library_has() -> None:
+    """Which the capabilities look a description's version up among."""
+    known = {api_version.value for api_version in ApiVersions}
+    for descriptions, component in DESCRIPTION_LISTS:
+        for description in descriptions:
+            assert description.min_required_version in known, (
+                f"{component} {description.key} needs api version "
+                f"{description.min_required_version}, which pysolarfocus does not know"
+            )
+
+
+@pytest.mark.parametrize("api_version", list(ApiVersions), ids=lambda v: v.value)
+def test_the_capabilities_agree_with_comparing_the_versions(
+    api_version: ApiVersions,
+) -> None:
+    """A set lookup, and the same answer parsing both versions gave."""
+    for system in Systems:
+        supported = capabilities(system, api_version.value)
+        assert supported is capabilities(system, api_version.value)
+        for descriptions, _ in DESCRIPTION_LISTS:
+            for description in descriptions:
+                assert supported.supports(description) is (
+                    version.parse(description.min_required_version)
+                    <= version.parse(api_version.value)
+                    and system not in (description.unsupported_systems or [])
+                )
@@ -1,8 +1,11 @@
 """Test setting up, unloading and migrating a Solarfocus config entry."""
 
-from unittest.mock import patch
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, patch
 
 from pysolarfocus import ApiVersions, Systems
+from pysolarfocus.components.base.enums import RegisterTypes
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
@@ -12,6 +15,7 @@ from custom_components.solarfocus import (
     async_remove_config_entry_device,
 )
 from custom_components.solarfocus.const import (
+    ATTR_RESTORED,
     CIRCULATION_COMPONENT_PREFIX,
     CONF_BIOMASS_BOILER,
     CONF_BOILER,
@@ -22,6 +26,8 @@ from custom_components.solarfocus.const import (
     CONF_HEATING_CIRCUIT,
     CONF_HEATPUMP,
     CONF_PHOTOVOLTAIC,
+    CONF_PIPELINE_WINDOW,
+    CONF_POLL_TIERS,
     CONF_SOLAR,
     CONF_SOLARFOCUS_SYSTEM,
     CONTROLLER_NAME,
@@ -37,11 +43,17 @@ from homeassistant.const import (
     CONF_NAME,
     CONF_PORT,
     CONF_SCAN_INTERVAL,
+    STATE_UNAVAILABLE,
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 
-from .conftest import CURRENT_VERSION, build_config_entry, build_options
+from .conftest import (
+    CURRENT_VERSION,
+    FakeModbusClient,
+    build_config_entry,
+    build_options,
+)
 
 
 async def test_setup_and_unload_entry(
@@ -157,6 +169,103 @@ async def test_setup_retries_when_the_device_is_unreachable(
     assert config_entry.state is ConfigEntryState.SETUP_RETRY
 
 
+async def _set_up_and_unload(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Set the entry up against a controller that answers, and unload it again."""
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_a_restart_shows_the_last_values_before_the_first_poll(
+    hass: HomeAssistant, enable_custom_integrations, modbus_client: FakeModbusClient
+) -> None:
+    """Marked as restored until the controller has answered."""
+    modbus_client.registers[(RegisterTypes.INPUT, 500)] = 453
+    entry = build_config_entry(boiler=1)
+    await _set_up_and_unload(hass, entry)
+
+    answer = asyncio.Event()
+    read = modbus_client.async_read_registers
+
+    async def _slow_read(*args: Any) -> list[int]:
+        await answer.wait()
+        return await read(*args)
+
+    modbus_client.async_read_registers = _slow_read  # type: ignore[method-assign]
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    # Which leaves the poll running in the background
+    await hass.async_block_till_done()
+
+    state = hass.states.get("water_heater.boiler_1_domestic_hot_water")
+    assert state.attributes["current_temperature"] == 45.3
+    assert state.attributes[ATTR_RESTORED] is True
+
+    answer.set()
+    await hass.async_block_till_done()
+
+    state = hass.states.get("water_heater.boiler_1_domestic_hot_water")
+    assert state.attributes["current_temperature"] == 45.3
+    assert ATTR_RESTORED not in state.attributes
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_a_restart_with_the_controller_gone_sets_up_unavailable(
+    hass: HomeAssistant, enable_custom_integrations, modbus_client: FakeModbusClient
+) -> None:
+    """Rather than retrying the setup: the poll goes on trying by itself."""
+    entry = build_config_entry(boiler=1)
+    await _set_up_and_unload(hass, entry)
+
+    modbus_client.async_connect = AsyncMock(return_value=False)  # type: ignore[method-assign]
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert (
+        hass.states.get("water_heater.boiler_1_domestic_hot_water").state
+        == STATE_UNAVAILABLE
+    )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_removing_an_entry_removes_its_snapshot(
+    hass: HomeAssistant,
+    enable_custom_integrations,
+    modbus_client: FakeModbusClient,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Named after the entry, no other entry would ever read it again."""
+    entry = build_config_entry(boiler=1)
+    await _set_up_and_unload(hass, entry)
+    assert f"{DOMAIN}.{entry.entry_id}" in hass_storage
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert f"{DOMAIN}.{entry.entry_id}" not in hass_storage
+
+
+async def test_a_snapshot_of_other_components_is_not_restored(
+    hass: HomeAssistant, enable_custom_integrations, modbus_client: FakeModbusClient
+) -> None:
+    """A second boiler the snapshot knows nothing of would show made-up values."""
+    entry = build_config_entry(boiler=1)
+    await _set_up_and_unload(hass, entry)
+
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, CONF_BOILER: 2}
+    )
+    modbus_client.async_connect = AsyncMock(return_value=False)  # type: ignore[method-assign]
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+
+
 async def test_a_refused_connection_says_so(
     hass: HomeAssistant, enable_custom_integrations, mock_api, api, config_entry
 ) -> None:
@@ -321,6 +430,44 @@ async def test_migration_keeps_the_module_counts_an_entry_already_has(
     assert entry.options[CONF_DIFFERENTIAL_MODULE] == 1
 
 
+async def test_migration_from_version_11_reads_every_component_on_every_poll(
+    hass: HomeAssistant,
+) -> None:
+    """Version 11 predates the poll tiers, and keeps polling the way it did."""
+    entry = build_config_entry()
+    options = {
+        setting: value
+        for setting, value in entry.options.items()
+        if setting != CONF_POLL_TIERS
+    }
+    entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(entry, options=options, version=11)
+
+    assert await async_migrate_entry(hass, entry) is True
+
+    assert entry.version == CURRENT_VERSION
+    assert entry.options[CONF_POLL_TIERS] == {}
+
+
+async def test_migration_from_version_12_reads_one_request_at_a_time(
+    hass: HomeAssistant,
+) -> None:
+    """Pipelining is for a user to turn on, not for an upgrade."""
+    entry = build_config_entry()
+    options = {
+        setting: value
+        for setting, value in entry.options.items()
+        if setting != CONF_PIPELINE_WINDOW
+    }
+    entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(entry, options=options, version=12)
+
+    assert await async_migrate_entry(hass, entry) is True
+
+    assert entry.version == CURRENT_VERSION
+    assert entry.options[CONF_PIPELINE_WINDOW] == 1
+
+
 async def test_migration_from_version_3_moves_options(hass: HomeAssistant) -> None:
     """Version 3 kept everything in data."""
     entry = MockConfigEntry(
@@ -504,7 +651,8 @@ async def test_migrated_entries_can_be_set_up(
 
 def _version_6_entry(**option_overrides) -> MockConfigEntry:
     """Return an entry as version 6 stored one: no unique id, and the
-    connection still among the options."""
+    connection still among the options.
+    """
     options = {
         CONF_HOST: "solarfocus.local",
         CONF_PORT: 502,
@@ -1626,3 +1774,33 @@ async def test_the_solar_entities_follow_the_key_the_count_uses(
     await hass.async_block_till_done()
 
     assert _solar_keys() == unnumbered
+
+
+async def test_a_solar_key_already_taken_is_not_renamed_onto(
+    hass: HomeAssistant, enable_custom_integrations, mock_api, entity_registry
+) -> None:
+    """Both sets registered, which takes a rename that stopped halfway.
+
+    The set under the key the count uses is the one being written to, so the
+    other is left where it is rather than renamed over the top of it.
+    """
+    entry = build_config_entry(
+        Systems.VAMPAIR, api_version=ApiVersions.V_25_030.value, solar=1
+    )
+    entry.add_to_hass(hass)
+    numbered = entity_registry.async_get_or_create(
+        "sensor", DOMAIN, f"{entry.entry_id}_so1_yield_today", config_entry=entry
+    )
+    unnumbered = entity_registry.async_get_or_create(
+        "sensor", DOMAIN, f"{entry.entry_id}_so_yield_today", config_entry=entry
+    )
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entity_registry.async_get(numbered.entity_id).unique_id == (
+        numbered.unique_id
+    )
+    assert entity_registry.async_get(unnumbered.entity_id).unique_id == (
+        unnumbered.unique_id
+    )
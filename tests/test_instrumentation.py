@@ -0,0 +1,110 @@
+"""Test what the read statistics make of the requests of a poll."""
+
+from pysolarfocus.components.base.enums import RegisterTypes
+import pytest
+
+from custom_components.solarfocus.instrumentation import (
+    BUCKETS_MS,
+    HISTORY,
+    PollInstrumentation,
+)
+
+
+def test_a_joined_request_is_shared_out_by_registers() -> None:
+    """Each component it read took part in it, for its part of the time."""
+    instrumentation = PollInstrumentation()
+
+    instrumentation.start_poll()
+    instrumentation.record_request(
+        (RegisterTypes.INPUT, 1900, 26), [("first", 6), ("second", 18)], 0.2
+    )
+    instrumentation.finish_poll()
+
+    first = instrumentation.component("first")
+    second = instrumentation.component("second")
+    assert first is not None and second is not None
+    assert first.duration == pytest.approx(0.05)
+    assert second.duration == pytest.approx(0.15)
+    assert first.transactions == second.transactions == 1
+
+
+def test_two_slices_of_a_component_in_one_request_are_one_transaction() -> None:
+    """What the planner does with a component split around a register or two."""
+    instrumentation = PollInstrumentation()
+
+    instrumentation.start_poll()
+    instrumentation.record_request(
+        (RegisterTypes.INPUT, 1100, 8), [("circuit", 4), ("circuit", 3)], 0.1
+    )
+    instrumentation.finish_poll()
+
+    circuit = instrumentation.component("circuit")
+    assert circuit is not None
+    assert circuit.transactions == 1
+    assert circuit.duration == pytest.approx(0.1)
+
+
+def test_a_component_the_library_read_counts_its_requests() -> None:
+    """One per register slice, which is what the library sends."""
+    instrumentation = PollInstrumentation()
+
+    instrumentation.start_poll()
+    instrumentation.record_component("boiler", 0.3, transactions=2, error=False)
+    instrumentation.finish_poll()
+
+    boiler = instrumentation.component("boiler")
+    assert boiler is not None
+    assert boiler.transactions == 2
+    assert boiler.duration == pytest.approx(0.3)
+
+
+def test_the_figures_are_those_of_the_last_poll() -> None:
+    """Not a running total, so a component that recovers reads 0 errors again."""
+    instrumentation = PollInstrumentation()
+
+    for error in (True, False):
+        instrumentation.start_poll()
+        instrumentation.record_request(
+            (RegisterTypes.HOLDING, 32000, 4), [("boiler", 4)], 0.01, error=error
+        )
+        instrumentation.finish_poll()
+
+    boiler = instrumentation.component("boiler")
+    assert boiler is not None
+    assert boiler.errors == 0
+    assert len(boiler.history) == 2
+
+
+def test_a_request_outside_a_poll_is_not_counted() -> None:
+    """Such as the read-back after a write."""
+    instrumentation = PollInstrumentation()
+
+    instrumentation.record_request(
+        (RegisterTypes.HOLDING, 32000, 4), [("boiler", 4)], 1
+    )
+
+    assert instrumentation.component("boiler") is None
+    assert instrumentation.as_dict({}) == {"components": {}, "ranges": {}}
+
+
+def test_the_histogram_covers_the_last_polls_only() -> None:
+    """And the slowest range comes first."""
+    instrumentation = PollInstrumentation()
+
+    for _ in range(HISTORY + 5):
+        instrumentation.start_poll()
+        instrumentation.record_request(
+            (RegisterTypes.INPUT, 500, 3), [("boiler", 3)], 0.003
+        )
+        instrumentation.record_request(
+            (RegisterTypes.HOLDING, 32000, 4), [("boiler", 4)], 9.0
+        )
+        instrumentation.finish_poll()
+
+    statistics = instrumentation.as_dict({"boiler": "boilers[0]"})
+
+    assert list(statistics["ranges"]) == ["holding 32000-32003", "input 500-502"]
+    slow = statistics["ranges"]["holding 32000-32003"]
+    assert slow["polls"] == HISTORY
+    assert slow["histogram"][f"> {BUCKETS_MS[-1]} ms"] == HISTORY
+    assert statistics["components"]["boilers[0]"]["transactions"] == 2
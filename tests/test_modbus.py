@@ -0,0 +1,189 @@
+"""Test the Modbus TCP client the coordinator reads the controller with."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+import struct
+
+from pysolarfocus.components.base.enums import RegisterTypes
+import pytest
+
+from custom_components.solarfocus.modbus import (
+    ModbusClient,
+    ModbusError,
+    PipelineRejected,
+)
+
+# An address the server below answers with "illegal data address".
+ILLEGAL_ADDRESS = 9000
+# An address the server below never answers at all.
+SILENT_ADDRESS = 9100
+
+
+class _Server:
+    """A controller on 127.0.0.1 that answers reads with the register address.
+
+    With a `batch` of more than one, it holds its answers until that many
+    requests have arrived, and sends them last first.
+    """
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[int, int, int]] = []
+        self.server: asyncio.Server | None = None
+        self.port = 0
+        self.batch = 1
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        held: list[bytes] = []
+        try:
+            while True:
+                header = await reader.readexactly(7)
+                transaction_id, _, length, unit_id = struct.unpack(">HHHB", header)
+                function_code, address, count = struct.unpack(
+                    ">BHH", await reader.readexactly(length - 1)
+                )
+                self.requests.append((function_code, address, count))
+                if address == SILENT_ADDRESS:
+                    continue
+                if address == ILLEGAL_ADDRESS:
+                    pdu = struct.pack(">BB", function_code | 0x80, 2)
+                else:
+                    # Input registers answer with their address, holding
+                    # registers with it plus one, so the two can be told apart.
+                    offset = 0 if function_code == 0x04 else 1
+                    words = [address + offset + i for i in range(count)]
+                    pdu = struct.pack(f">BB{count}H", function_code, 2 * count, *words)
+                held.append(
+                    struct.pack(">HHHB", transaction_id, 0, len(pdu) + 1, unit_id) + pdu
+                )
+                if len(held) < self.batch:
+                    continue
+                writer.write(b"".join(reversed(held)))
+                held.clear()
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+
+@pytest.fixture(name="server")
+async def server_fixture(socket_enabled: None) -> AsyncGenerator[_Server]:
+    """Run a controller on a free local port."""
+    server = _Server()
+    server.server = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    server.port = server.server.sockets[0].getsockname()[1]
+    yield server
+    server.server.close()
+    await server.server.wait_closed()
+
+
+async def test_reads_input_and_holding_registers(server: _Server) -> None:
+    """Each register type is read with its own function code."""
+    client = ModbusClient("127.0.0.1", server.port)
+    assert await client.async_connect()
+
+    assert await client.async_read_registers(RegisterTypes.INPUT, 500, 3) == [
+        500,
+        501,
+        502,
+    ]
+    assert await client.async_read_registers(RegisterTypes.HOLDING, 32000, 2) == [
+        32001,
+        32002,
+    ]
+    assert server.requests == [(0x04, 500, 3), (0x03, 32000, 2)]
+
+    await client.async_close()
+    assert not client.is_connected
+
+
+async def test_an_exception_response_leaves_the_connection_up(server: _Server) -> None:
+    """A range the controller refuses is that range failing, not the connection."""
+    client = ModbusClient("127.0.0.1", server.port)
+    await client.async_connect()
+
+    with pytest.raises(ModbusError):
+        await client.async_read_registers(RegisterTypes.INPUT, ILLEGAL_ADDRESS, 1)
+
+    assert client.is_connected
+    assert await client.async_read_registers(RegisterTypes.INPUT, 1, 1) == [1]
+
+    await client.async_close()
+
+
+async def test_an_unanswered_request_times_out(server: _Server) -> None:
+    """Nothing of an answer was read, so the connection is still good."""
+    client = ModbusClient("127.0.0.1", server.port, timeout=0.1)
+    await client.async_connect()
+
+    with pytest.raises(ModbusError):
+        await client.async_read_registers(RegisterTypes.INPUT, SILENT_ADDRESS, 1)
+
+    assert client.is_connected
+    assert await client.async_read_registers(RegisterTypes.INPUT, 7, 1) == [7]
+
+    await client.async_close()
+
+
+async def test_reading_without_a_connection_fails() -> None:
+    """Nothing is sent before `async_connect` has been called."""
+    client = ModbusClient("127.0.0.1", 502)
+
+    with pytest.raises(ModbusError):
+        await client.async_read_registers(RegisterTypes.INPUT, 500, 1)
+
+
+async def test_connecting_to_nothing_returns_false(socket_enabled: None) -> None:
+    """A controller that is not there is a False, like the library's `connect`."""
+    server = await asyncio.start_server(lambda *_: None, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+
+    assert not await ModbusClient("127.0.0.1", port).async_connect()
+
+
+
+async def test_pipelined_reads_are_matched_by_transaction_id(server: _Server) -> None:
+    """Sent before any is answered, and told apart however they come back."""
+    server.batch = 3
+    client = ModbusClient("127.0.0.1", server.port)
+    await client.async_connect()
+
+    answers = [
+        answer
+        async for answer in client.async_read_pipelined(
+            [
+                (RegisterTypes.INPUT, 500, 2),
+                (RegisterTypes.HOLDING, 32000, 1),
+                (RegisterTypes.INPUT, 1100, 1),
+            ],
+            window=3,
+        )
+    ]
+
+    # Last first, as the server sent them
+    assert answers == [(2, [1100]), (1, [32001]), (0, [500, 501])]
+    await client.async_close()
+
+
+async def test_two_requests_left_unanswered_reject_the_pipeline(
+    server: _Server,
+) -> None:
+    """One unanswered request is that request failing, two are the pipeline."""
+    client = ModbusClient("127.0.0.1", server.port, timeout=0.1)
+    await client.async_connect()
+
+    with pytest.raises(PipelineRejected):
+        async for _ in client.async_read_pipelined(
+            [
+                (RegisterTypes.INPUT, SILENT_ADDRESS, 1),
+                (RegisterTypes.INPUT, SILENT_ADDRESS, 2),
+            ],
+            window=2,
+        ):
+            pass
+
+    assert client.is_connected
+    assert await client.async_read_registers(RegisterTypes.INPUT, 7, 1) == [7]
+    await client.async_close()
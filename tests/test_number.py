@@ -9,11 +9,9 @@ from custom_components.solarfocus.const import (
     PHOTOVOLTAIC_COMPONENT,
     PHOTOVOLTAIC_COMPONENT_PREFIX,
     PHOTOVOLTAIC_PREFIX,
+    entry_capabilities,
 )
-from custom_components.solarfocus.entity import (
-    create_description,
-    filterVersionAndSystem,
-)
+from custom_components.solarfocus.entity import create_description
 from custom_components.solarfocus.number import PHOTOVOLTAIC_NUMBER_TYPES
 from homeassistant.const import CONF_API_VERSION
 
@@ -27,21 +25,16 @@ def _config_entry(api_version: str):
 
 
 def _entities(api_version: str):
-    """Create the photovoltaic number entities for the given api version."""
-    entities = [
-        SimpleNamespace(
-            entity_description=create_description(
-                                PHOTOVOLTAIC_COMPONENT,
-                PHOTOVOLTAIC_COMPONENT_PREFIX,
-                "",
-                description,
-            )
-        )
-        for description in PHOTOVOLTAIC_NUMBER_TYPES
-    ]
+    """Return the photovoltaic number entities built for the given api version."""
+    capabilities = entry_capabilities(_config_entry(api_version))
     return [
-        entity.entity_description.item
-        for entity in filterVersionAndSystem(_config_entry(api_version), entities)
+        create_description(
+            PHOTOVOLTAIC_COMPONENT,
+            PHOTOVOLTAIC_COMPONENT_PREFIX,
+            "",
+            description,
+        ).item
+        for description in capabilities.supported(PHOTOVOLTAIC_NUMBER_TYPES)
     ]
 
 
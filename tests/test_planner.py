@@ -0,0 +1,212 @@
+"""Test reading several components in as few requests as they fit in."""
+
+from pysolarfocus.components.base.enums import RegisterTypes
+import pytest
+
+from custom_components.solarfocus.planner import (
+    MAX_READ_COUNT,
+    ReadPlanner,
+    Span,
+    component_spans,
+    item_registers,
+    plan_reads,
+    plan_writes,
+)
+
+from .conftest import FakeModbusClient, build_config_entry, build_library_api
+
+# Where the four buffers of an entry start their input registers.
+BUFFER_ADDRESSES = [1900, 1920, 1940, 1960]
+
+
+def _buffers() -> list:
+    """Return the four buffers of a real api, at their default addresses."""
+    return build_library_api(build_config_entry(buffer=4)).buffers
+
+
+def _input_reads(client: FakeModbusClient) -> list[tuple[int, int]]:
+    """Return the input register requests the client was asked, in order."""
+    return [
+        (address, count)
+        for register_type, address, count in client.reads
+        if register_type == RegisterTypes.INPUT
+    ]
+
+
+async def _client() -> FakeModbusClient:
+    """Return a connected fake client."""
+    client = FakeModbusClient()
+    await client.async_connect()
+    return client
+
+
+async def test_adjacent_components_are_read_in_one_request() -> None:
+    """Four buffers 20 registers apart are one request, not four."""
+    client = await _client()
+    buffers = _buffers()
+
+    failed = await ReadPlanner().async_read(client, buffers)
+
+    assert not failed
+    assert _input_reads(client) == [
+        (1900, BUFFER_ADDRESSES[-1] - 1900 + buffers[-1].input_count)
+    ]
+
+
+async def test_the_words_end_up_in_the_component_they_belong_to() -> None:
+    """Splitting the answer up again is the other half of joining the requests."""
+    client = await _client()
+    buffers = _buffers()
+    for index, address in enumerate(BUFFER_ADDRESSES):
+        client.registers[(RegisterTypes.INPUT, address)] = 400 + index
+
+    await ReadPlanner().async_read(client, buffers)
+
+    assert [buffer.top_temperature.scaled_value for buffer in buffers] == (
+        pytest.approx([40.0, 40.1, 40.2, 40.3])
+    )
+
+
+def test_no_request_is_longer_than_modbus_allows() -> None:
+    """Ten adjacent spans of 20 registers do not fit in one request of 200."""
+    spans = [
+        Span(RegisterTypes.INPUT, 1000 + 20 * index, 20, object(), 0)
+        for index in range(10)
+    ]
+
+    requests = plan_reads(spans)
+
+    assert all(request.count <= MAX_READ_COUNT for request in requests)
+    assert len(requests) == 2
+    assert [span.address for request in requests for span in request.spans] == [
+        span.address for span in spans
+    ]
+
+
+def test_register_types_are_never_joined() -> None:
+    """An input and a holding register at the same address are two requests."""
+    component = object()
+
+    requests = plan_reads(
+        [
+            Span(RegisterTypes.INPUT, 100, 2, component, 0),
+            Span(RegisterTypes.HOLDING, 102, 2, component, 0),
+        ]
+    )
+
+    assert len(requests) == 2
+
+
+async def test_a_run_the_controller_refuses_is_read_slice_by_slice() -> None:
+    """And is not tried again: it fails for a register in between, every time."""
+    client = await _client()
+    # Between the first two buffers, where nothing is documented.
+    client.unanswered.add(1910)
+    buffers = _buffers()
+    planner = ReadPlanner()
+
+    assert not await planner.async_read(client, buffers)
+
+    client.reads.clear()
+    assert not await planner.async_read(client, buffers)
+
+    assert len(_input_reads(client)) == len(buffers)
+
+
+async def test_a_component_that_does_not_answer_fails_on_its_own() -> None:
+    """The buffers either side of it are read and parsed as usual."""
+    client = await _client()
+    client.unanswered.add(BUFFER_ADDRESSES[1])
+    client.registers[(RegisterTypes.INPUT, BUFFER_ADDRESSES[2])] = 500
+    buffers = _buffers()
+
+    failed = await ReadPlanner().async_read(client, buffers)
+
+    assert failed == {buffers[1]}
+    assert buffers[2].top_temperature.scaled_value == pytest.approx(50.0)
+
+
+async def test_nothing_is_asked_once_the_connection_is_gone() -> None:
+    """Every component not read yet fails, without a request to a closed socket."""
+    client = await _client()
+    entry = build_config_entry(buffer=1, boiler=1)
+    api = build_library_api(entry)
+    original = client.async_read_registers
+
+    async def _drop(*args: object) -> list[int]:
+        words = await original(*args)  # type: ignore[arg-type]
+        client.connected = False
+        return words
+
+    client.async_read_registers = _drop  # type: ignore[method-assign]
+    components = [api.boilers[0], api.buffers[0]]
+
+    failed = await ReadPlanner().async_read(client, components)
+
+    assert len(client.reads) == 1
+    assert failed == set(components)
+
+
+async def test_nothing_but_the_first_request_goes_out_past_the_deadline() -> None:
+    """The components it did not get to are neither failed nor parsed."""
+    client = await _client()
+    api = build_library_api(build_config_entry(heating_circuit=2))
+    circuits = api.heating_circuits
+    client.registers[(RegisterTypes.INPUT, circuits[0].input_address)] = 400
+    unreached: set = set()
+
+    failed = await ReadPlanner().async_read(
+        client, circuits, deadline=0, first=[circuits[1]], unreached=unreached
+    )
+
+    assert not failed
+    assert unreached == set(circuits)
+    # The one request that went out is one the component asked to go first
+    assert len(client.reads) == 1
+    assert client.reads[0][1] in (
+        circuits[1].input_address,
+        circuits[1].holding_address,
+    )
+    assert circuits[0].supply_temperature.scaled_value == 0
+
+
+def test_only_the_registers_asked_for_are_read_of_a_slice() -> None:
+    """From the first of them to the last, never beyond the slice they are in."""
+    buffer = _buffers()[0]
+    registers = item_registers(buffer, ["top_temperature", "bottom_temperature"])
+
+    spans = component_spans(buffer, registers)
+
+    # The two temperatures are the first two registers of the buffer
+    assert [(span.address, span.count) for span in spans] == [(1900, 2)]
+
+
+def test_a_performance_figure_reads_both_registers_it_is_worked_out_of() -> None:
+    """The heat pump's COP is its heat output over its power draw."""
+    heat_pump = build_library_api(build_config_entry(heatpump=True)).heatpump
+
+    registers = item_registers(heat_pump, ["performance_overall"])
+
+    assert registers == {
+        heat_pump.performance_overall.nominator,
+        heat_pump.performance_overall.denominator,
+    }
+
+
+def test_only_adjacent_registers_are_written_in_one_request() -> None:
+    """A write sets everything in its range, so there must be nothing in between."""
+    api = build_library_api(build_config_entry(heating_circuit=1))
+    circuit = api.heating_circuits[0]
+    circuit.cooling.value = 1
+    circuit.mode.value = 3
+    circuit.target_room_temperature.value = -5
+
+    requests = plan_writes(
+        [circuit.target_room_temperature, circuit.mode, circuit.cooling]
+    )
+
+    assert [(request.address, request.words) for request in requests] == [
+        (32602, [1, 3]),
+        # Negative values are written as their two's complement
+        (32605, [65531]),
+    ]
@@ -6,6 +6,8 @@ one too few means a silently missing entity, and both only show up once an entry
 is actually set up.
 """
 
+from unittest.mock import patch
+
 from pysolarfocus import ApiVersions, Systems
 from pysolarfocus.components.circulation import Circulation
 from pysolarfocus.components.differential_module import DifferentialModule
@@ -65,9 +67,15 @@ def _components(entities) -> list:
     The controller is a device too and has an entity of its own - the service
     code, which is computed from the date rather than read from a component, so
     it is there whatever is configured. Every test below counts components.
+
+    Nor are the read statistics counted, which every component device has the
+    same four of whatever the component reads.
     """
     return [
-        entity for entity in entities if entity.entity_description.component_prefix
+        entity
+        for entity in entities
+        if entity.entity_description.component_prefix
+        and not isinstance(entity, sensor.SolarfocusReadStatisticsSensor)
     ]
 
 
@@ -363,7 +371,7 @@ async def test_one_set_of_sensors_per_circulation_group(
         api_version=ApiVersions.V_26_020.value, circulation=count
     )
 
-    keys = _keys(await _setup(hass, sensor, entry))
+    keys = _keys(_components(await _setup(hass, sensor, entry)))
 
     assert [key for key in keys if key.startswith(CIRCULATION_COMPONENT_PREFIX)] == [
         f"{CIRCULATION_COMPONENT_PREFIX}{i + 1}_temperature" for i in range(count)
@@ -379,7 +387,7 @@ async def test_both_control_loops_of_every_differential_module(
         api_version=ApiVersions.V_26_020.value, differential_module=count
     )
 
-    keys = _keys(await _setup(hass, sensor, entry))
+    keys = _keys(_components(await _setup(hass, sensor, entry)))
 
     assert [
         key for key in keys if key.startswith(DIFFERENTIAL_MODULE_COMPONENT_PREFIX)
@@ -460,3 +468,49 @@ async def test_the_new_modules_report_what_the_library_read(
         ).state
         == "on"
     )
+
+
+async def test_every_component_device_has_its_read_statistics(
+    hass: HomeAssistant,
+) -> None:
+    """Four of them per device, off until somebody goes looking for a slow poll."""
+    entry = build_config_entry(heating_circuit=2, boiler=1)
+
+    statistics = [
+        entity
+        for entity in await _setup(hass, sensor, entry)
+        if isinstance(entity, sensor.SolarfocusReadStatisticsSensor)
+    ]
+
+    assert {
+        key.removesuffix("_read_duration")
+        for key in _keys(statistics)
+        if key.endswith("_read_duration")
+    } == {
+        f"{HEATING_CIRCUIT_COMPONENT_PREFIX}1",
+        f"{HEATING_CIRCUIT_COMPONENT_PREFIX}2",
+        f"{BOILER_COMPONENT_PREFIX}1",
+    }
+    assert len(statistics) == 3 * len(sensor.READ_STATISTICS_SENSOR_TYPES)
+    assert not any(
+        entity.entity_description.entity_registry_enabled_default
+        for entity in statistics
+    )
+
+
+async def test_a_component_without_sensors_has_its_read_statistics_too(
+    hass: HomeAssistant,
+) -> None:
+    """It is read all the same, whichever platforms show it."""
+    entry = build_config_entry(heating_circuit=0, boiler=1)
+
+    with patch.object(sensor, "BOILER_SENSOR_TYPES", []):
+        entities = await _setup(hass, sensor, entry)
+
+    assert not [
+        entity
+        for entity in entities
+        if isinstance(entity, sensor.SolarfocusSensor)
+        and entity.entity_description.component_prefix == BOILER_COMPONENT_PREFIX
+    ]
+    assert f"{BOILER_COMPONENT_PREFIX}1_read_duration" in _keys(entities)
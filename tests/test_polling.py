@@ -0,0 +1,144 @@
+"""Measure what keeping an entry up to date schedules on the event loop.
+
+Every entity of an entry shows a value the coordinator reads for all of them at
+once, so anything an entity schedules on its own is overhead: a timer per
+platform that walks every entity of it, and a refresh request per entity that
+the coordinator debounces back into the one refresh it was going to do anyway.
+With every component configured that is a few hundred entities per entry.
+
+The tests below run an entry with every component configured for a stretch of
+simulated time and count both, once with the entities polling on their own the
+way they used to and once as they are now.
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+from unittest.mock import patch
+
+from pysolarfocus import ApiVersions
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.solarfocus.const import DOMAIN
+from custom_components.solarfocus.coordinator import SolarfocusDataUpdateCoordinator
+from custom_components.solarfocus.entity import SolarfocusEntity
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import EntityPlatform, async_get_platforms
+from homeassistant.util import dt as dt_util
+
+from .conftest import FakeModbusClient, build_config_entry
+
+# How long each run is, and the polling interval of the entry.
+DURATION = timedelta(minutes=10)
+SCAN_INTERVAL = 10
+
+# The most of every component the options allow, on the api version that has
+# all of them.
+MAXIMAL_CONFIGURATION = {
+    "api_version": list(ApiVersions)[-1].value,
+    "scan_interval": SCAN_INTERVAL,
+    "heating_circuit": 8,
+    "buffer": 4,
+    "boiler": 4,
+    "fresh_water_module": 4,
+    "circulation": 4,
+    "differential_module": 4,
+    "solar": 4,
+    "heatpump": True,
+    "photovoltaic": True,
+}
+
+
+@dataclass
+class _Load:
+    """What one run scheduled."""
+
+    entities: int
+    polled_entities: int
+    poll_timers: int
+    entity_polls: int
+    refreshes: int
+
+
+async def _run(hass: HomeAssistant) -> _Load:
+    """Set up a maximal entry, let the time pass, and count what happened."""
+    entry = build_config_entry(**MAXIMAL_CONFIGURATION)
+    entry.add_to_hass(hass)
+
+    refresh = SolarfocusDataUpdateCoordinator._async_update_data
+    poll = EntityPlatform._async_handle_interval_callback
+    with (
+        patch.object(
+            SolarfocusDataUpdateCoordinator,
+            "_async_update_data",
+            autospec=True,
+            side_effect=refresh,
+        ) as refreshes,
+        patch.object(
+            EntityPlatform,
+            "_async_handle_interval_callback",
+            autospec=True,
+            side_effect=poll,
+        ) as entity_polls,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        # The refresh the setup itself awaits is the same either way
+        refreshes.reset_mock()
+
+        start = dt_util.utcnow()
+        for step in range(1, int(DURATION.total_seconds()) // SCAN_INTERVAL + 1):
+            async_fire_time_changed(
+                hass, start + timedelta(seconds=step * SCAN_INTERVAL)
+            )
+            await hass.async_block_till_done()
+
+        platforms = async_get_platforms(hass, DOMAIN)
+        entities = [
+            entity for platform in platforms for entity in platform.entities.values()
+        ]
+        load = _Load(
+            entities=len(entities),
+            polled_entities=sum(entity.should_poll for entity in entities),
+            poll_timers=sum(
+                platform._async_polling_timer is not None for platform in platforms
+            ),
+            entity_polls=entity_polls.call_count,
+            refreshes=refreshes.call_count,
+        )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+
+    return load
+
+
+async def test_the_coordinator_is_the_only_thing_that_polls(
+    hass: HomeAssistant, enable_custom_integrations, modbus_client: FakeModbusClient
+) -> None:
+    """One refresh per interval, and no timer of any platform."""
+    load = await _run(hass)
+
+    assert load.entities > 200
+    assert load.polled_entities == 0
+    assert load.poll_timers == 0
+    assert load.entity_polls == 0
+    assert load.refreshes == DURATION.total_seconds() // SCAN_INTERVAL
+
+
+async def test_entities_polling_on_their_own_cost_more(
+    hass: HomeAssistant, enable_custom_integrations, modbus_client: FakeModbusClient
+) -> None:
+    """Against the same entry with every entity polling itself as it used to."""
+    with patch.object(SolarfocusEntity, "_attr_should_poll", True):
+        before = await _run(hass)
+    after = await _run(hass)
+
+    assert before.entities == after.entities
+    assert before.poll_timers > 0
+    # Every platform tick walked all of its entities, and every one of them
+    # asked for a refresh
+    assert before.entity_polls > 0
+    assert before.refreshes > after.refreshes
+    assert after.entity_polls == 0
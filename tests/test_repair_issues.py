@@ -5,6 +5,8 @@ are otherwise invisible: one is a log line written once at migration, the other
 is a component that has gone unavailable for good.
 """
 
+from unittest.mock import patch
+
 from custom_components.solarfocus.const import (
     CONF_BOILER,
     CONF_BUFFER,
@@ -344,6 +346,56 @@ async def test_a_component_coming_back_clears_only_its_own_issue(
     assert _issue(hass, boiler) is not None
 
 
+async def test_a_poll_that_changes_nothing_leaves_the_issues_alone(
+    hass: HomeAssistant, enable_custom_integrations, mock_api, api
+) -> None:
+    """Neither raised again over the top nor deleted for what reads fine.
+
+    Each of those is a write the issue registry saves, on every poll.
+    """
+    api.update_boiler.return_value = False
+    entry = await _setup(hass, heating_circuit=0, buffer=1, boiler=1)
+
+    with (
+        patch.object(ir, "async_create_issue", wraps=ir.async_create_issue) as create,
+        patch.object(ir, "async_delete_issue", wraps=ir.async_delete_issue) as delete,
+    ):
+        await entry.runtime_data.async_refresh()
+        await entry.runtime_data.async_refresh()
+
+    create.assert_not_called()
+    delete.assert_not_called()
+    assert _issue(hass, f"component_unavailable_{entry.entry_id}_{CONF_BOILER}")
+
+
+async def test_a_failing_component_is_not_named_again_on_every_poll(
+    hass: HomeAssistant, enable_custom_integrations, mock_api, api
+) -> None:
+    """Its devices are only looked up again once the device registry changed."""
+    api.update_boiler.return_value = False
+    entry = await _setup(hass, heating_circuit=0, buffer=1, boiler=1)
+    coordinator = entry.runtime_data
+
+    with patch.object(
+        coordinator, "_component_devices", wraps=coordinator._component_devices
+    ) as devices:
+        await coordinator.async_refresh()
+
+        devices.assert_not_called()
+
+        registry = dr.async_get(hass)
+        device = registry.async_get_device({(DOMAIN, f"{entry.entry_id}_bo1")})
+        assert device is not None
+        registry.async_update_device(device.id, name_by_user="Dusche")
+        await hass.async_block_till_done()
+        await coordinator.async_refresh()
+
+    devices.assert_called_once_with(CONF_BOILER)
+    issue = _issue(hass, f"component_unavailable_{entry.entry_id}_{CONF_BOILER}")
+    assert issue is not None
+    assert issue.translation_placeholders["component"] == "Dusche"
+
+
 async def test_an_outage_takes_the_component_issues_down_with_it(
     hass: HomeAssistant, enable_custom_integrations, mock_api, api
 ) -> None:
@@ -0,0 +1,88 @@
+"""Test the turns polls and writes take on the connection to the controller."""
+
+import asyncio
+
+import pytest
+
+from custom_components.solarfocus.scheduler import Priority, TransactionScheduler
+
+
+async def _take_turn(
+    scheduler: TransactionScheduler,
+    priority: Priority,
+    name: str,
+    order: list[str],
+    hold: asyncio.Event | None = None,
+) -> None:
+    """Run one transaction that records its turn, held open until `hold` is set."""
+    async with scheduler.transaction(priority):
+        order.append(name)
+        if hold is not None:
+            await hold.wait()
+
+
+async def test_one_transaction_runs_at_a_time() -> None:
+    """The second waits for the first to end, whatever its priority."""
+    scheduler = TransactionScheduler()
+    order: list[str] = []
+    hold = asyncio.Event()
+
+    poll = asyncio.create_task(
+        _take_turn(scheduler, Priority.READ, "poll", order, hold)
+    )
+    await asyncio.sleep(0)
+    write = asyncio.create_task(_take_turn(scheduler, Priority.WRITE, "write", order))
+    await asyncio.sleep(0)
+
+    assert order == ["poll"]
+
+    hold.set()
+    await asyncio.gather(poll, write)
+
+    assert order == ["poll", "write"]
+
+
+async def test_a_waiting_write_goes_before_a_waiting_poll() -> None:
+    """However long the poll has been waiting."""
+    scheduler = TransactionScheduler()
+    order: list[str] = []
+    hold = asyncio.Event()
+
+    first = asyncio.create_task(
+        _take_turn(scheduler, Priority.WRITE, "first", order, hold)
+    )
+    await asyncio.sleep(0)
+    poll = asyncio.create_task(_take_turn(scheduler, Priority.READ, "poll", order))
+    await asyncio.sleep(0)
+    write = asyncio.create_task(_take_turn(scheduler, Priority.WRITE, "write", order))
+    await asyncio.sleep(0)
+
+    hold.set()
+    await asyncio.gather(first, poll, write)
+
+    assert order == ["first", "write", "poll"]
+
+
+async def test_a_transaction_that_gives_up_waiting_does_not_hold_up_the_rest() -> None:
+    """Its turn goes to whoever waits behind it."""
+    scheduler = TransactionScheduler()
+    order: list[str] = []
+    hold = asyncio.Event()
+
+    first = asyncio.create_task(
+        _take_turn(scheduler, Priority.READ, "first", order, hold)
+    )
+    await asyncio.sleep(0)
+    cancelled = asyncio.create_task(
+        _take_turn(scheduler, Priority.WRITE, "cancelled", order)
+    )
+    poll = asyncio.create_task(_take_turn(scheduler, Priority.READ, "poll", order))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    hold.set()
+    await asyncio.gather(first, poll)
+
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert order == ["first", "poll"]
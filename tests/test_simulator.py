@@ -0,0 +1,364 @@
+"""Run the integration against the simulated controller, over a real socket.
+
+The point of the simulator is that the integration cannot tell it from a
+controller: so the coordinator reads every configured component off it for
+each system and api version, the config flow connects to it through the
+library's own client, and what it does to the connection - making it slow,
+leaving a range unanswered, dropping it - reaches the coordinator the way a
+real controller's would.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator
+import logging
+import time
+
+from pysolarfocus import ApiVersions, Systems
+from pysolarfocus.components.base.enums import RegisterTypes
+import pytest
+
+from custom_components.solarfocus.const import (
+    CONF_BOILER,
+    CONF_BUFFER,
+    CONF_HEATING_CIRCUIT,
+    CONF_PIPELINE_WINDOW,
+    CONF_SOLARFOCUS_SYSTEM,
+    DOMAIN,
+)
+from custom_components.solarfocus.coordinator import SolarfocusDataUpdateCoordinator
+from custom_components.solarfocus.modbus import ModbusClient, ModbusError
+from homeassistant.const import (
+    CONF_API_VERSION,
+    CONF_HOST,
+    CONF_NAME,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .conftest import build_library_api
+from .simulator import ANSWER, BUSY, DROP, IGNORE, MAXIMAL_OPTIONS, ControllerSimulator
+
+# One request per slice the coordinator reads of a boiler: its input registers
+# and its holding registers.
+BOILER_REQUESTS = 2
+
+
+@pytest.fixture(name="simulator")
+async def simulator_fixture(
+    socket_enabled: None
+) -> AsyncGenerator[ControllerSimulator]:
+    """Run a simulated Vampair on the latest api version."""
+    simulator = ControllerSimulator()
+    await simulator.async_start()
+    yield simulator
+    await simulator.async_stop()
+
+
+def _one_of(*configured: str) -> dict[str, int | bool]:
+    """Return options with one of each of these components, and no other."""
+    return {
+        option: type(value)(option in configured)
+        for option, value in MAXIMAL_OPTIONS.items()
+    }
+
+
+def _coordinator(
+    hass: HomeAssistant, simulator: ControllerSimulator, **options
+) -> SolarfocusDataUpdateCoordinator:
+    """Create a coordinator of an entry for the simulator, every component in it."""
+    entry = simulator.config_entry(**options)
+    entry.add_to_hass(hass)
+    return SolarfocusDataUpdateCoordinator(hass, entry, build_library_api(entry))
+
+
+@pytest.mark.parametrize("api_version", list(ApiVersions), ids=lambda v: v.value)
+@pytest.mark.parametrize("system", list(Systems), ids=lambda s: s.name)
+async def test_every_component_reads_off_the_register_map(
+    hass: HomeAssistant,
+    socket_enabled: None,
+    system: Systems,
+    api_version: ApiVersions,
+) -> None:
+    """Of every system and api version, over the one connection."""
+    simulator = ControllerSimulator(system, api_version)
+    await simulator.async_start()
+    coordinator = _coordinator(hass, simulator)
+
+    await coordinator._async_update_data()
+
+    assert coordinator.failed_components == frozenset()
+    assert simulator.requests
+    assert simulator.connections == 1
+
+    await coordinator.async_close()
+    await simulator.async_stop()
+
+
+async def test_a_register_reads_as_the_simulator_holds_it(
+    hass: HomeAssistant, simulator: ControllerSimulator
+) -> None:
+    """Scaled by the library, as a controller's would be."""
+    simulator.registers[(RegisterTypes.INPUT, 500)] = 453
+    coordinator = _coordinator(hass, simulator)
+
+    await coordinator._async_update_data()
+
+    assert coordinator.api.boilers[0].temperature.scaled_value == pytest.approx(45.3)
+    await coordinator.async_close()
+
+
+async def test_a_range_off_the_register_map_is_refused(
+    simulator: ControllerSimulator,
+) -> None:
+    """With an exception response, and the connection stays up."""
+    client = ModbusClient(simulator.host, simulator.port)
+    await client.async_connect()
+
+    with pytest.raises(ModbusError):
+        await client.async_read_registers(RegisterTypes.INPUT, 9000, 1)
+
+    assert client.is_connected
+    await client.async_close()
+
+
+async def test_every_request_takes_the_latency(
+    hass: HomeAssistant, simulator: ControllerSimulator
+) -> None:
+    """Which is what a poll of a slow controller is made of."""
+    simulator.latency = 0.05
+    coordinator = _coordinator(hass, simulator, **_one_of(CONF_BOILER))
+
+    start = time.monotonic()
+    await coordinator._async_update_data()
+
+    assert len(simulator.requests) == BOILER_REQUESTS
+    assert time.monotonic() - start >= BOILER_REQUESTS * simulator.latency
+    await coordinator.async_close()
+
+
+async def test_an_unanswered_range_fails_its_component_alone(
+    hass: HomeAssistant, simulator: ControllerSimulator
+) -> None:
+    """The request times out, and the connection is still good for the rest."""
+    simulator.unanswered.add(32000)
+    coordinator = _coordinator(
+        hass, simulator, **_one_of(CONF_BOILER, CONF_HEATING_CIRCUIT)
+    )
+    coordinator._client.timeout = 0.1
+
+    await coordinator._async_update_data()
+
+    assert coordinator.failed_components == {CONF_BOILER}
+    await coordinator.async_close()
+
+
+async def test_a_dropped_connection_fails_the_poll_and_the_next_reconnects(
+    hass: HomeAssistant, simulator: ControllerSimulator
+) -> None:
+    """Like a controller restarting between two polls."""
+    coordinator = _coordinator(hass, simulator, **_one_of(CONF_BOILER))
+    await coordinator._async_update_data()
+
+    simulator.drop_every = len(simulator.requests) + 1
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+    simulator.drop_every = 0
+    await coordinator._async_update_data()
+
+    assert simulator.connections == 2
+    await coordinator.async_close()
+
+
+async def test_a_write_lands_in_the_holding_registers(
+    hass: HomeAssistant, simulator: ControllerSimulator
+) -> None:
+    """And is read back from there."""
+    coordinator = _coordinator(hass, simulator, **_one_of(CONF_BOILER))
+    await coordinator._async_update_data()
+    boiler = coordinator.api.boilers[0]
+
+    await coordinator.async_write(boiler, {"target_temperature": 55})
+
+    assert simulator.registers[(RegisterTypes.HOLDING, 32000)] == 550
+    assert boiler.target_temperature.scaled_value == pytest.approx(55.0)
+    await coordinator.async_close()
+
+
+async def test_the_config_flow_connects_through_the_library(
+    hass: HomeAssistant, enable_custom_integrations, simulator: ControllerSimulator
+) -> None:
+    """Whose client is not the integration's: pymodbus, in the executor."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": "user"}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_NAME: "Solarfocus",
+            CONF_HOST: simulator.host,
+            CONF_PORT: simulator.port,
+            CONF_SCAN_INTERVAL: 10,
+            CONF_SOLARFOCUS_SYSTEM: simulator.system.value,
+            CONF_API_VERSION: simulator.api_version.value,
+        },
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    # Past the connection check, which nothing else at that port would pass
+    assert result["step_id"] == "component"
+
+
+async def test_the_slow_range_is_the_one_the_statistics_name(
+    hass: HomeAssistant, simulator: ControllerSimulator
+) -> None:
+    """Timed per request, and charged to the component that asked for it."""
+    simulator.latency = 0.05
+    coordinator = _coordinator(hass, simulator, **_one_of(CONF_BOILER))
+
+    await coordinator._async_update_data()
+
+    boiler = coordinator.read_statistics.component(coordinator.api.boilers[0])
+    assert boiler is not None
+    assert boiler.transactions == BOILER_REQUESTS
+    assert boiler.duration >= BOILER_REQUESTS * simulator.latency
+    assert "holding 32000-32003" in coordinator.read_statistics.as_dict({})["ranges"]
+    await coordinator.async_close()
+
+
+async def test_a_refused_register_shows_as_retries_and_an_error(
+    hass: HomeAssistant, simulator: ControllerSimulator
+) -> None:
+    """A joined request fails, and its slices are sent again one by one."""
+    # In the second of two buffers, which are read in one request
+    simulator.refused.add(1920)
+    coordinator = _coordinator(
+        hass, simulator, **_one_of(CONF_BOILER) | {CONF_BUFFER: 2}
+    )
+
+    await coordinator._async_update_data()
+
+    first, second = (
+        coordinator.read_statistics.component(buffer)
+        for buffer in coordinator.api.buffers
+    )
+    assert first is not None and second is not None
+    # The joined request failed for both, and was sent again slice by slice,
+    # which only the second buffer fails on its own as well
+    assert first.retries and second.retries
+    assert first.transactions > first.retries
+    assert first.errors == 1
+    assert second.errors > 1
+    assert coordinator.failed_components == {CONF_BUFFER}
+    await coordinator.async_close()
+
+
+async def test_pipelined_requests_take_about_one_round_trip(
+    hass: HomeAssistant, simulator: ControllerSimulator
+) -> None:
+    """Four on the wire at once, and every component reads the same."""
+    simulator.latency = 0.02
+    simulator.registers[(RegisterTypes.INPUT, 500)] = 453
+    coordinator = _coordinator(hass, simulator, **{CONF_PIPELINE_WINDOW: 4})
+
+    start = time.monotonic()
+    await coordinator._async_update_data()
+
+    assert simulator.most_outstanding == 4
+    assert time.monotonic() - start < len(simulator.requests) * simulator.latency
+    assert coordinator.failed_components == set()
+    assert coordinator.api.boilers[0].temperature.scaled_value == pytest.approx(45.3)
+    await coordinator.async_close()
+
+
+async def test_a_controller_busy_with_overlapping_requests_is_read_one_by_one(
+    hass: HomeAssistant,
+    simulator: ControllerSimulator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """On the same poll, and on every poll after it."""
+    simulator.overlapping = BUSY
+    coordinator = _coordinator(hass, simulator, **{CONF_PIPELINE_WINDOW: 4})
+
+    await coordinator._async_update_data()
+    await coordinator._async_update_data()
+
+    assert coordinator.failed_components == set()
+    assert coordinator.pipeline_window == 1
+    warnings = [
+        record for record in caplog.records if record.levelno == logging.WARNING
+    ]
+    assert len(warnings) == 1
+    assert "one request at a time from now on" in warnings[0].getMessage()
+    await coordinator.async_close()
+
+
+async def test_overlapping_requests_left_unanswered_are_read_one_by_one(
+    hass: HomeAssistant,
+    simulator: ControllerSimulator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """For as long as the connection they went unanswered on is open."""
+    simulator.overlapping = IGNORE
+    coordinator = _coordinator(hass, simulator, **{CONF_PIPELINE_WINDOW: 4})
+    coordinator._client.timeout = 0.1
+
+    await coordinator._async_update_data()
+    await coordinator._async_update_data()
+
+    assert coordinator.failed_components == set()
+    assert coordinator.pipeline_window == 4
+    warnings = [
+        record for record in caplog.records if record.levelno == logging.WARNING
+    ]
+    assert len(warnings) == 1
+    assert "one request at a time until it reconnects" in warnings[0].getMessage()
+    await coordinator.async_close()
+
+
+async def test_a_connection_dropped_while_pipelining_is_pipelined_again(
+    hass: HomeAssistant, simulator: ControllerSimulator
+) -> None:
+    """Once it reconnects: a controller rebooting drops it just the same."""
+    simulator.overlapping = DROP
+    coordinator = _coordinator(
+        hass, simulator, **_one_of(CONF_BOILER) | {CONF_PIPELINE_WINDOW: 2}
+    )
+
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+    simulator.overlapping = ANSWER
+    simulator.most_outstanding = 0
+    await coordinator._async_update_data()
+
+    assert simulator.connections == 2
+    assert simulator.most_outstanding == 2
+    assert coordinator.pipeline_window == 2
+    assert coordinator.failed_components == set()
+    await coordinator.async_close()
+
+
+async def test_two_entries_for_one_controller_share_one_connection(
+    hass: HomeAssistant, simulator: ControllerSimulator
+) -> None:
+    """Their polls take turns on it, and it stays open for the one left."""
+    first = _coordinator(hass, simulator, **_one_of(CONF_BOILER))
+    second = _coordinator(hass, simulator, **_one_of(CONF_HEATING_CIRCUIT))
+
+    await asyncio.gather(first._async_update_data(), second._async_update_data())
+
+    assert simulator.connections == 1
+    # One poll after the other, not the requests of the two interleaved
+    boiler = [address in (500, 32000) for _, address, _ in simulator.requests]
+    assert boiler in (sorted(boiler), sorted(boiler, reverse=True))
+    assert first.failed_components == second.failed_components == set()
+
+    await first.async_close()
+    await second._async_update_data()
+    assert simulator.connections == 1
+
+    await second.async_close()
+    assert not second.is_connected
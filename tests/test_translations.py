@@ -277,6 +277,7 @@ def test_something_raises_a_translated_exception() -> None:
         "cannot_connect",
         "cannot_read",
         "cannot_set_up",
+        "cannot_write",
     }
 
 